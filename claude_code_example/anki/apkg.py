@@ -0,0 +1,199 @@
+"""
+Streaming reader for exported Anki decks (`.apkg`).
+
+An `.apkg` is a zip archive holding a SQLite collection. The collection
+member is copied to a temporary file in fixed size chunks (SQLite cannot
+read from inside a zip) and notes are then pulled through a cursor with
+`fetchmany`, so memory stays flat regardless of the size of the deck.
+
+Notes of a type share its name and field names tuple, and notes with the
+same tags share one tuple of interned tags. Bulk readers can ask for
+`NoteColumns` batches instead of lists of `Note`s.
+"""
+
+import json
+import shutil
+import sqlite3
+import sys
+import tempfile
+import zipfile
+from contextlib import contextmanager
+from pathlib import Path
+from typing import Generator, Iterator, Optional
+
+from claude_code_example.anki.columns import FIELD_SEPARATOR, ColumnsBuilder, Layout, NoteColumns
+from claude_code_example.anki.models import Note
+
+# Newest first. `collection.anki21b` is zstd compressed and is not
+# supported; Anki writes one of these alongside it when exporting with
+# "Support older Anki versions" ticked. Without that, the archive still
+# holds a `collection.anki2`, with one placeholder note asking to update.
+COLLECTION_MEMBERS = ("collection.anki21", "collection.anki2")
+COMPRESSED_MEMBER = "collection.anki21b"
+COPY_CHUNK_SIZE = 1024 * 1024
+DEFAULT_BATCH_SIZE = 500
+# distinct tag strings whose tuples are shared before starting afresh
+MAX_SHARED_TAGS = 10_000
+
+NOTES_QUERY = """
+SELECT n.id, n.mid, n.flds, n.tags,
+       (SELECT c.did FROM cards c WHERE c.nid = n.id ORDER BY c.ord LIMIT 1)
+FROM notes n
+WHERE n.id > ?
+ORDER BY n.id
+"""
+
+
+class ApkgError(Exception):
+    """Raised when an `.apkg` file cannot be read"""
+
+
+@contextmanager
+def open_collection(apkg_path: Path) -> Generator[sqlite3.Connection, None, None]:
+    """
+    Open the SQLite collection inside an `.apkg` file, read only.
+
+    Parameters
+    ----------
+    apkg_path : Path
+        Path to the exported deck.
+
+    Yields
+    ------
+    sqlite3.Connection
+        A connection to a temporary copy of the collection, removed on exit.
+    """
+    try:
+        archive = zipfile.ZipFile(apkg_path)
+    except (OSError, zipfile.BadZipFile) as e:
+        raise ApkgError(f"{apkg_path} is not a valid .apkg file: {e}") from e
+
+    with archive, tempfile.TemporaryDirectory() as tmp_dir:
+        members = set(archive.namelist())
+        member = next((name for name in COLLECTION_MEMBERS if name in members), None)
+        if member == "collection.anki2" and COMPRESSED_MEMBER in members:
+            # only the placeholder
+            member = None
+        if member is None:
+            raise ApkgError(
+                f"{apkg_path} has no legacy collection; export it again with "
+                "'Support older Anki versions' ticked"
+            )
+
+        collection_path = Path(tmp_dir) / member
+        with archive.open(member) as src, collection_path.open("wb") as dst:
+            shutil.copyfileobj(src, dst, COPY_CHUNK_SIZE)
+
+        connection = sqlite3.connect(f"file:{collection_path}?mode=ro", uri=True)
+        try:
+            yield connection
+        finally:
+            connection.close()
+
+
+def _load_note_types(connection: sqlite3.Connection) -> dict[int, tuple[str, tuple[str, ...]]]:
+    """Map note type ids to their name and ordered field names"""
+    (models_json,) = connection.execute("SELECT models FROM col").fetchone()
+    note_types = {}
+    for mid, model in json.loads(models_json).items():
+        fields = sorted(model["flds"], key=lambda field: field["ord"])
+        note_types[int(mid)] = (model["name"], tuple(field["name"] for field in fields))
+    return note_types
+
+
+def _load_decks(connection: sqlite3.Connection) -> dict[int, str]:
+    """Map deck ids to deck names"""
+    (decks_json,) = connection.execute("SELECT decks FROM col").fetchone()
+    return {int(did): deck["name"] for did, deck in json.loads(decks_json).items()}
+
+
+# id, (note type, field names), deck, fields joined with FIELD_SEPARATOR, tags
+NoteRow = tuple[int, Layout, str, str, tuple[str, ...]]
+
+
+def _iter_rows(
+    apkg_path: Path, *, batch_size: int, after_id: Optional[int]
+) -> Iterator[list[NoteRow]]:
+    """The notes of an `.apkg` file as `NoteRow`s, `batch_size` at a time"""
+    if batch_size < 1:
+        raise ValueError("batch_size must be at least 1")
+
+    with open_collection(apkg_path) as connection:
+        try:
+            note_types = _load_note_types(connection)
+            decks = _load_decks(connection)
+            cursor = connection.execute(NOTES_QUERY, (-1 if after_id is None else after_id,))
+        except sqlite3.DatabaseError as e:
+            raise ApkgError(f"{apkg_path} does not contain a readable collection: {e}") from e
+
+        unknown_type: Layout = ("", ())
+        shared_tags: dict[str, tuple[str, ...]] = {}
+        while rows := cursor.fetchmany(batch_size):
+            batch = []
+            for note_id, mid, flds, tags, did in rows:
+                note_tags = shared_tags.get(tags)
+                if note_tags is None:
+                    if len(shared_tags) >= MAX_SHARED_TAGS:
+                        shared_tags.clear()
+                    note_tags = shared_tags[tags] = tuple(map(sys.intern, tags.split()))
+                layout = note_types.get(mid, unknown_type)
+                batch.append((note_id, layout, decks.get(did, ""), flds, note_tags))
+            yield batch
+
+
+def iter_note_batches(
+    apkg_path: Path, *, batch_size: int = DEFAULT_BATCH_SIZE, after_id: Optional[int] = None
+) -> Iterator[list[Note]]:
+    """
+    Stream the notes of an `.apkg` file, `batch_size` notes at a time.
+
+    Parameters
+    ----------
+    apkg_path : Path
+        Path to the exported deck.
+    batch_size : int, optional
+        How many rows to fetch from the cursor in one go, by default 500.
+    after_id : Optional[int], optional
+        Only read notes with a higher id, by default None. The notes table
+        is keyed on id, so resuming after a given note is a single seek.
+
+    Yields
+    ------
+    list[Note]
+        The next batch of notes, in note id order.
+    """
+    for rows in _iter_rows(apkg_path, batch_size=batch_size, after_id=after_id):
+        yield [
+            Note(
+                id=note_id,
+                note_type=note_type,
+                deck=deck,
+                field_names=field_names,
+                fields=tuple(flds.split(FIELD_SEPARATOR)),
+                tags=tags,
+            )
+            for note_id, (note_type, field_names), deck, flds, tags in rows
+        ]
+
+
+def iter_note_columns(
+    apkg_path: Path, *, batch_size: int = DEFAULT_BATCH_SIZE, after_id: Optional[int] = None
+) -> Iterator[NoteColumns]:
+    """
+    Stream the notes of an `.apkg` file as `NoteColumns`, see
+    `iter_note_batches`. Fields are kept as stored, joined in one string,
+    until a note is taken out of its batch.
+    """
+    for rows in _iter_rows(apkg_path, batch_size=batch_size, after_id=after_id):
+        builder = ColumnsBuilder()
+        for row in rows:
+            builder.append(*row)
+        yield builder.build()
+
+
+def iter_notes(
+    apkg_path: Path, *, batch_size: int = DEFAULT_BATCH_SIZE, after_id: Optional[int] = None
+) -> Iterator[Note]:
+    """Stream the notes of an `.apkg` file one at a time, see `iter_note_batches`"""
+    for batch in iter_note_batches(apkg_path, batch_size=batch_size, after_id=after_id):
+        yield from batch
@@ -0,0 +1,152 @@
+"""
+Mechanical Normal -> Cloze rewrite for drill style notes.
+
+A drill note has a prompt with one or more `_____` blanks, a hint and the
+full answer, e.g.
+
+    Prompt1: Er hat _____.
+    Prompt2: Füller; ein- neu- amerikansich-
+    Answer:  Er hat _einen_neuen_amerikanischen_Füller_.
+
+The text around the blanks is lined up against the answer and whatever
+fills each blank becomes a deletion:
+
+    Er hat {{c1::einen neuen amerikanischen Füller::Füller; ein- neu- amerikansich-}}.
+
+Notes are rewritten a whole template group at a time from columns of
+field values, so the per note cost is a handful of string operations.
+"""
+
+import re
+from collections import defaultdict
+from typing import Iterable, Optional, Sequence
+
+from claude_code_example.anki.fingerprint import FingerprintIndex
+from claude_code_example.anki.models import Note
+from claude_code_example.anki.templates import Template, TemplateLibrary
+
+CLOZE_ROLES = ("prompt", "hint", "answer")
+
+_TAG = re.compile(r"<[^>]*>")
+_BLANK = re.compile(r"_{3,}")
+_WHITESPACE = re.compile(r"\s+")
+_UNDERSCORES = re.compile(r"[_\s]+")
+
+
+def clean(value: str) -> str:
+    """Strip markup and collapse whitespace, including non-breaking spaces"""
+    value = _TAG.sub("", value).replace("&nbsp;", " ")
+    return _WHITESPACE.sub(" ", value).strip()
+
+
+def cloze_text(prompt: str, hint: str, answer: str) -> Optional[str]:
+    """
+    The Cloze text for one drill note, or None if the answer does not line
+    up with the prompt.
+
+    Every blank becomes part of the same deletion, `c1`, so a drill stays
+    a single card; the hint goes on the first one.
+    """
+    segments = _BLANK.split(clean(prompt))
+    if len(segments) < 2:
+        return None
+    answer = clean(answer)
+    hint = clean(hint)
+
+    head = segments[0]
+    if not answer.startswith(head):
+        return None
+    parts = [head]
+    position = len(head)
+    last = len(segments) - 1
+    for number, segment in enumerate(segments[1:], start=1):
+        if number == last:
+            end = len(answer) - len(segment)
+            if end <= position or not answer.endswith(segment):
+                return None
+        else:
+            end = answer.find(segment, position + 1) if segment else -1
+            if end < 0:
+                return None
+        filled = _UNDERSCORES.sub(" ", answer[position:end]).strip()
+        if not filled:
+            return None
+        parts.append(
+            f"{{{{c1::{filled}::{hint}}}}}" if number == 1 and hint else f"{{{{c1::{filled}}}}}"
+        )
+        parts.append(segment)
+        position = end + len(segment)
+    return "".join(parts)
+
+
+def transform_columns(
+    prompts: Iterable[str], hints: Iterable[str], answers: Iterable[str]
+) -> list[Optional[str]]:
+    """Rewrite parallel columns of prompts, hints and answers in one pass"""
+    return list(map(cloze_text, prompts, hints, answers))
+
+
+def _positions(template: Template, layout: tuple[str, ...]) -> tuple[int, ...]:
+    """Where the prompt, hint and answer fields are in `layout`, () if any is missing"""
+    try:
+        return tuple(layout.index(template.cloze[role]) for role in CLOZE_ROLES)
+    except (KeyError, ValueError):
+        return ()
+
+
+def transform_group(template: Template, notes: Sequence[Note]) -> list[Optional[str]]:
+    """
+    Rewrite every note matched to `template`, in order.
+
+    Returns one Cloze text per note, None where the note could not be
+    rewritten. Templates without a complete cloze mapping rewrite nothing.
+    """
+    prompts: list[str] = []
+    hints: list[str] = []
+    answers: list[str] = []
+    positions_by_layout: dict[tuple[str, ...], tuple[int, ...]] = {}
+    for note in notes:
+        positions = positions_by_layout.get(note.field_names)
+        if positions is None:
+            positions = positions_by_layout[note.field_names] = _positions(
+                template, note.field_names
+            )
+        fields = note.fields
+        if positions and max(positions) < len(fields):
+            prompt, hint, answer = positions
+            prompts.append(fields[prompt])
+            hints.append(fields[hint])
+            answers.append(fields[answer])
+        else:
+            prompts.append("")
+            hints.append("")
+            answers.append("")
+    return transform_columns(prompts, hints, answers)
+
+
+def rewrite_batch(
+    notes: Sequence[Note], index: FingerprintIndex, templates: TemplateLibrary
+) -> list[Optional[str]]:
+    """
+    Cloze texts for a batch of notes, in order; None for notes that no
+    fingerprint resolves or that cannot be rewritten mechanically.
+
+    Notes are grouped by the template their fingerprint resolves to and
+    each group is rewritten in one `transform_group` pass.
+    """
+    groups: defaultdict[str, list[int]] = defaultdict(list)
+    for position, note in enumerate(notes):
+        name = index.match(note)
+        if name is not None:
+            groups[name].append(position)
+
+    texts: list[Optional[str]] = [None] * len(notes)
+    for name, positions in groups.items():
+        template = templates.get(name)
+        if template is None:
+            continue
+        for position, text in zip(
+            positions, transform_group(template, [notes[position] for position in positions])
+        ):
+            texts[position] = text
+    return texts
@@ -0,0 +1,151 @@
+"""
+Column oriented batches of notes.
+
+A `NoteColumns` keeps a batch as a handful of flat columns rather than one
+object per note: ids in an `array`, every note's fields joined into a
+single string with the offsets of each note in another `array`, and the
+note type, deck and tags as indexes into short lists of the distinct
+values. A batch of 500 notes is then a few objects instead of a few
+thousand, which is what bulk paths hold on to and send to worker
+processes. Notes are only built again when a batch is iterated.
+"""
+
+import sys
+from array import array
+from collections.abc import Sequence
+from dataclasses import dataclass, field
+from itertools import islice
+from typing import Iterable, Iterator, TypeVar, Union, overload
+
+from claude_code_example.anki.models import Note
+
+FIELD_SEPARATOR = "\x1f"
+
+# (note type, field names) of a note
+Layout = tuple[str, tuple[str, ...]]
+V = TypeVar("V")
+
+
+def _index(value: V, positions: dict[V, int], values: list[V]) -> int:
+    """Where `value` is in `values`, appending it the first time it is seen"""
+    position = positions.get(value)
+    if position is None:
+        position = positions[value] = len(values)
+        values.append(value)
+    return position
+
+
+@dataclass(slots=True)
+class NoteColumns(Sequence[Note]):
+    """A batch of notes, column by column; indexing and iterating builds `Note`s"""
+
+    ids: "array[int]" = field(default_factory=lambda: array("q"))
+    # the fields of every note, each note's joined with FIELD_SEPARATOR
+    text: str = ""
+    # note i is text[offsets[i]:offsets[i + 1]]
+    offsets: "array[int]" = field(default_factory=lambda: array("Q", [0]))
+    layouts: list[Layout] = field(default_factory=list)
+    layout_of: "array[int]" = field(default_factory=lambda: array("I"))
+    decks: list[str] = field(default_factory=list)
+    deck_of: "array[int]" = field(default_factory=lambda: array("I"))
+    tag_sets: list[tuple[str, ...]] = field(default_factory=list)
+    tags_of: "array[int]" = field(default_factory=lambda: array("I"))
+
+    def __len__(self) -> int:
+        return len(self.ids)
+
+    @overload
+    def __getitem__(self, position: int) -> Note: ...
+
+    @overload
+    def __getitem__(self, position: slice) -> list[Note]: ...
+
+    def __getitem__(self, position: Union[int, slice]) -> Union[Note, list[Note]]:
+        if isinstance(position, slice):
+            return [self[index] for index in range(*position.indices(len(self)))]
+        if position < 0:
+            position += len(self)
+        note_type, field_names = self.layouts[self.layout_of[position]]
+        flds = self.text[self.offsets[position] : self.offsets[position + 1]]
+        return Note(
+            id=self.ids[position],
+            note_type=note_type,
+            deck=self.decks[self.deck_of[position]],
+            field_names=field_names,
+            fields=tuple(flds.split(FIELD_SEPARATOR)),
+            tags=self.tag_sets[self.tags_of[position]],
+        )
+
+    def __iter__(self) -> Iterator[Note]:
+        text, layouts, decks, tag_sets = self.text, self.layouts, self.decks, self.tag_sets
+        for note_id, start, end, layout, deck, tags in zip(
+            self.ids,
+            self.offsets,
+            islice(self.offsets, 1, None),
+            self.layout_of,
+            self.deck_of,
+            self.tags_of,
+        ):
+            note_type, field_names = layouts[layout]
+            yield Note(
+                id=note_id,
+                note_type=note_type,
+                deck=decks[deck],
+                field_names=field_names,
+                fields=tuple(text[start:end].split(FIELD_SEPARATOR)),
+                tags=tag_sets[tags],
+            )
+
+    @property
+    def nbytes(self) -> int:
+        """Approximate memory held by the batch, shared values counted once"""
+        columns = (self.ids, self.offsets, self.layout_of, self.deck_of, self.tags_of)
+        return (
+            sys.getsizeof(self.text)
+            + sum(sys.getsizeof(column) for column in columns)
+            + sum(sys.getsizeof(deck) for deck in self.decks)
+            + sum(sum(map(sys.getsizeof, tags)) for tags in self.tag_sets)
+        )
+
+    @classmethod
+    def from_notes(cls, notes: Iterable[Note]) -> "NoteColumns":
+        builder = ColumnsBuilder()
+        for note in notes:
+            builder.append(
+                note.id,
+                (note.note_type, note.field_names),
+                note.deck,
+                FIELD_SEPARATOR.join(note.fields),
+                note.tags,
+            )
+        return builder.build()
+
+
+class ColumnsBuilder:
+    """Appends notes to the columns of one `NoteColumns` at a time"""
+
+    def __init__(self) -> None:
+        self.columns = NoteColumns()
+        self._parts: list[str] = []
+        self._end = 0
+        self._layouts: dict[Layout, int] = {}
+        self._decks: dict[str, int] = {}
+        self._tag_sets: dict[tuple[str, ...], int] = {}
+
+    def append(
+        self, note_id: int, layout: Layout, deck: str, flds: str, tags: tuple[str, ...]
+    ) -> None:
+        """Add a note whose fields are already joined with FIELD_SEPARATOR into `flds`"""
+        columns = self.columns
+        columns.ids.append(note_id)
+        self._parts.append(flds)
+        self._end += len(flds)
+        columns.offsets.append(self._end)
+        columns.layout_of.append(_index(layout, self._layouts, columns.layouts))
+        columns.deck_of.append(_index(deck, self._decks, columns.decks))
+        columns.tags_of.append(_index(tags, self._tag_sets, columns.tag_sets))
+
+    def build(self) -> NoteColumns:
+        """The columns of every note appended"""
+        self.columns.text = "".join(self._parts)
+        return self.columns
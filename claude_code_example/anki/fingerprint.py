@@ -0,0 +1,111 @@
+"""
+Deterministic template matching from fingerprints.
+
+A template fingerprint maps field names to regular expressions, e.g.
+`{"Prompt1": "_{3,}", "Prompt2": "^[DEde]- "}` for a sentence with a blank
+and an article hint. The index compiles them once and resolves the notes
+that match exactly one template without asking the LLM; anything that
+matches none or several templates is left for the model.
+"""
+
+import re
+from dataclasses import dataclass
+from typing import Iterable, Optional
+
+from claude_code_example.anki.models import Note
+from claude_code_example.anki.templates import Template
+
+FINGERPRINT_CONFIDENCE = 1.0
+
+# a fingerprint bound to one note layout: (template name, ((field index, pattern), ...))
+BoundFingerprint = tuple[str, tuple[tuple[int, re.Pattern[str]], ...]]
+
+
+@dataclass(frozen=True, slots=True)
+class CompiledFingerprint:
+    """A template fingerprint with its patterns compiled"""
+
+    template: str
+    patterns: tuple[tuple[str, re.Pattern[str]], ...]
+
+    @classmethod
+    def compile(cls, template: Template) -> "CompiledFingerprint":
+        return cls(
+            template=template.name,
+            patterns=tuple(
+                (field, re.compile(pattern)) for field, pattern in template.fingerprint.items()
+            ),
+        )
+
+    def applies_to(self, field_names: tuple[str, ...]) -> bool:
+        return all(field in field_names for field, _ in self.patterns)
+
+
+class FingerprintIndex:
+    """
+    Matches notes against the compiled fingerprints of a template library.
+
+    Candidates are narrowed down by note layout (the tuple of field names,
+    shared by every note of a note type) so that a note is only tested
+    against fingerprints that could apply to it. Adding or replacing a
+    template only compiles that template and updates the layouts it applies
+    to, so the index never has to be rebuilt from scratch.
+    """
+
+    def __init__(self, templates: Iterable[Template] = ()) -> None:
+        self._fingerprints: dict[str, CompiledFingerprint] = {}
+        # field names -> the fingerprints that can apply to notes with those fields
+        self._by_layout: dict[tuple[str, ...], list[BoundFingerprint]] = {}
+        for template in templates:
+            self.add(template)
+
+    def __len__(self) -> int:
+        return len(self._fingerprints)
+
+    def add(self, template: Template) -> None:
+        """Add or replace `template`; templates without a fingerprint are never matched"""
+        self.remove(template.name)
+        if not template.fingerprint:
+            return
+        fingerprint = CompiledFingerprint.compile(template)
+        self._fingerprints[template.name] = fingerprint
+        for layout, candidates in self._by_layout.items():
+            if fingerprint.applies_to(layout):
+                candidates.append(self._bind(fingerprint, layout))
+
+    def remove(self, name: str) -> None:
+        if self._fingerprints.pop(name, None) is None:
+            return
+        for candidates in self._by_layout.values():
+            candidates[:] = [candidate for candidate in candidates if candidate[0] != name]
+
+    @staticmethod
+    def _bind(fingerprint: CompiledFingerprint, layout: tuple[str, ...]) -> BoundFingerprint:
+        return (
+            fingerprint.template,
+            tuple((layout.index(field), pattern) for field, pattern in fingerprint.patterns),
+        )
+
+    def _candidates(self, layout: tuple[str, ...]) -> list[BoundFingerprint]:
+        candidates = self._by_layout.get(layout)
+        if candidates is None:
+            candidates = [
+                self._bind(fingerprint, layout)
+                for fingerprint in self._fingerprints.values()
+                if fingerprint.applies_to(layout)
+            ]
+            self._by_layout[layout] = candidates
+        return candidates
+
+    def match(self, note: Note) -> Optional[str]:
+        """The name of the only template whose fingerprint `note` matches, if there is one"""
+        fields = note.fields
+        found = None
+        for name, patterns in self._candidates(note.field_names):
+            if all(
+                index < len(fields) and pattern.search(fields[index]) for index, pattern in patterns
+            ):
+                if found is not None:
+                    return None
+                found = name
+        return found
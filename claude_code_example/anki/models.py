@@ -0,0 +1,20 @@
+from dataclasses import dataclass
+
+
+@dataclass(frozen=True, slots=True)
+class Note:
+    """A single Anki note as read from a collection"""
+
+    id: int
+    note_type: str
+    deck: str
+    field_names: tuple[str, ...]
+    fields: tuple[str, ...]
+    tags: tuple[str, ...] = ()
+
+    def field(self, name: str) -> str:
+        """Return the value of the field called `name`, or "" if the note has no such field."""
+        try:
+            return self.fields[self.field_names.index(name)]
+        except (ValueError, IndexError):
+            return ""
@@ -0,0 +1,91 @@
+"""
+The template library: the card structures learned so far.
+
+Templates are kept in a JSON file so that they survive between runs and
+can be edited by hand.
+"""
+
+import hashlib
+import json
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Any, Iterator, Mapping, Optional
+
+
+@dataclass(frozen=True, slots=True)
+class Template:
+    """A card structure the converter knows how to recognise"""
+
+    name: str
+    description: str
+    # field name -> regular expression a matching note's field satisfies
+    fingerprint: Mapping[str, str] = field(default_factory=dict)
+    # cloze role ("prompt", "hint", "answer") -> field name, empty if the
+    # template cannot be rewritten to Cloze mechanically
+    cloze: Mapping[str, str] = field(default_factory=dict)
+
+    def to_dict(self) -> dict[str, Any]:
+        return {
+            "name": self.name,
+            "description": self.description,
+            "fingerprint": dict(self.fingerprint),
+            "cloze": dict(self.cloze),
+        }
+
+    @classmethod
+    def from_dict(cls, data: Mapping[str, Any]) -> "Template":
+        return cls(
+            name=data["name"],
+            description=data.get("description", ""),
+            fingerprint=dict(data.get("fingerprint", {})),
+            cloze=dict(data.get("cloze", {})),
+        )
+
+    @property
+    def digest(self) -> str:
+        """A hash of the template definition, changes whenever the template does"""
+        payload = json.dumps(self.to_dict(), sort_keys=True, ensure_ascii=False)
+        return hashlib.sha256(payload.encode("utf-8")).hexdigest()[:16]
+
+
+class TemplateLibrary:
+    """An ordered collection of templates, optionally backed by a JSON file"""
+
+    def __init__(self, templates: Optional[list[Template]] = None) -> None:
+        self._templates: dict[str, Template] = {}
+        for template in templates or []:
+            self.add(template)
+
+    @classmethod
+    def load(cls, path: Path) -> "TemplateLibrary":
+        """Load a library from `path`; a missing file is an empty library"""
+        if not path.exists():
+            return cls()
+        data = json.loads(path.read_text(encoding="utf-8"))
+        return cls([Template.from_dict(item) for item in data.get("templates", [])])
+
+    def save(self, path: Path) -> None:
+        data = {"templates": [template.to_dict() for template in self]}
+        path.write_text(json.dumps(data, indent=2, ensure_ascii=False) + "\n", encoding="utf-8")
+
+    def add(self, template: Template) -> None:
+        """Add a template, replacing any existing template with the same name"""
+        self._templates[template.name] = template
+
+    def get(self, name: str) -> Optional[Template]:
+        return self._templates.get(name)
+
+    @property
+    def version(self) -> str:
+        """A hash of the whole library, changes whenever any template does"""
+        digests = "\n".join(template.digest for template in self)
+        return hashlib.sha256(digests.encode("utf-8")).hexdigest()[:16]
+
+    def __iter__(self) -> Iterator[Template]:
+        return iter(self._templates.values())
+
+    def __len__(self) -> int:
+        return len(self._templates)
+
+    def __contains__(self, name: object) -> bool:
+        return name in self._templates
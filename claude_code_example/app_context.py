@@ -1,11 +1,104 @@
+import logging
+from functools import cached_property
+from typing import TYPE_CHECKING, Optional
+
 from claude_code_example import __app_name__
-from claude_code_example.config.app_config import ClaudeCodeExampleConfig
-from claude_code_example.logging.logging import setup_logger
+from claude_code_example.logging.logging import log_to_parent, setup_logger
+
+if TYPE_CHECKING:
+    from multiprocessing.queues import Queue
+
+    from claude_code_example.cache.result_cache import CacheStats, ResultCache
+    from claude_code_example.config.values import ConfigValues
+    from claude_code_example.logging.spans import SpanRecorder
+    from claude_code_example.metrics.report import RunCounters
 
 
 class AppContext:
-    """Holds all the objects needed by commands"""
+    """
+    Holds all the objects needed by commands
+
+    Everything is built on first access, so creating the context costs
+    nothing for commands that never use it, like `--help`.
+
+    Parameters
+    ----------
+    app_config : Optional[ConfigValues], optional
+        An already loaded config, by default None which loads it with
+        `load_config`, from the environment and `.env` or from the snapshot
+        of the last run that read them.
+    logger : Optional[logging.Logger], optional
+        An already configured logger, by default None which sets one up.
+    """
+
+    def __init__(
+        self,
+        app_config: Optional["ConfigValues"] = None,
+        logger: Optional[logging.Logger] = None,
+    ) -> None:
+        if app_config is not None:
+            self.app_config = app_config
+        if logger is not None:
+            self.logger = logger
+
+    @cached_property
+    def app_config(self) -> "ConfigValues":
+        # pydantic-settings is the slowest import of the CLI
+        from claude_code_example.config.snapshot import load_config
+
+        return load_config()
+
+    @cached_property
+    def logger(self) -> logging.Logger:
+        return setup_logger(
+            log_level=self.app_config.log_level,
+            app_name=__app_name__,
+            json_path=self.app_config.log_json_path,
+        )
+
+    @cached_property
+    def cache_stats(self) -> "CacheStats":
+        """Shared by every cache opened through this context"""
+        from claude_code_example.cache.result_cache import CacheStats
+
+        return CacheStats()
+
+    @cached_property
+    def spans(self) -> "SpanRecorder":
+        """Times the stages of whatever the command does"""
+        from claude_code_example.logging.spans import SpanRecorder
+
+        return SpanRecorder()
+
+    @cached_property
+    def counters(self) -> "RunCounters":
+        """Notes processed and bytes written, for `--profile`"""
+        from claude_code_example.metrics.report import RunCounters
+
+        return RunCounters()
+
+    def open_result_cache(self) -> "ResultCache":
+        """Open the LLM result cache configured in app_config"""
+        from claude_code_example.cache.result_cache import ResultCache
+
+        return ResultCache(
+            self.app_config.cache_path,
+            max_entries=self.app_config.cache_max_entries,
+            stats=self.cache_stats,
+        )
+
+    @classmethod
+    def for_worker(
+        cls, app_config: "ConfigValues", log_queue: "Queue[logging.LogRecord]"
+    ) -> "AppContext":
+        """
+        The context of a worker process, from the parent's config.
 
-    def __init__(self) -> None:
-        self.app_config = ClaudeCodeExampleConfig(app_name=__app_name__)
-        self.logger = setup_logger(log_level=self.app_config.log_level, app_name=__app_name__)
+        Neither `.env` nor the environment is read again, and no handlers
+        are installed: records go to `log_queue`, from `worker_logs` in the
+        parent, which writes them out.
+        """
+        logger = log_to_parent(
+            app_name=app_config.app_name, log_level=app_config.log_level, log_queue=log_queue
+        )
+        return cls(app_config=app_config, logger=logger)
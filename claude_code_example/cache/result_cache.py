@@ -0,0 +1,218 @@
+"""
+On-disk cache of LLM results.
+
+Entries are keyed by a hash of the normalised note fields, the model and
+the prompt, and remember which template they depend on. That way adding
+a template only throws away the answers that could change (notes that
+matched nothing) and editing a template only throws away the answers
+that named it, while every other decision survives across runs.
+"""
+
+import hashlib
+import sqlite3
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Iterable, Optional
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS results (
+    key TEXT PRIMARY KEY,
+    kind TEXT NOT NULL,
+    template TEXT,
+    template_digest TEXT NOT NULL,
+    value TEXT NOT NULL,
+    last_used INTEGER NOT NULL
+);
+CREATE INDEX IF NOT EXISTS ix_results_last_used ON results (last_used);
+CREATE INDEX IF NOT EXISTS ix_results_template ON results (kind, template);
+"""
+# commit pending writes after this many of them
+COMMIT_EVERY = 256
+
+
+@dataclass(slots=True)
+class CacheStats:
+    """Counters for a ResultCache, shared through AppContext"""
+
+    hits: int = 0
+    misses: int = 0
+    evictions: int = 0
+    invalidations: int = 0
+
+    @property
+    def hit_rate(self) -> float:
+        lookups = self.hits + self.misses
+        return self.hits / lookups if lookups else 0.0
+
+
+@dataclass(frozen=True, slots=True)
+class CacheEntry:
+    template: Optional[str]
+    template_digest: str
+    value: str
+
+
+def normalise_fields(field_names: Iterable[str], fields: Iterable[str]) -> str:
+    """Fields as a single string, with whitespace and non-breaking spaces collapsed"""
+    return "\x1f".join(
+        f"{name}={' '.join(value.replace(chr(0xA0), ' ').split())}"
+        for name, value in zip(field_names, fields)
+    )
+
+
+def cache_key(*parts: str) -> str:
+    """A stable hash of `parts`, used as the cache key"""
+    digest = hashlib.sha256()
+    for part in parts:
+        digest.update(part.encode("utf-8"))
+        digest.update(b"\x00")
+    return digest.hexdigest()
+
+
+class ResultCache:
+    """
+    A size capped, least recently used, SQLite backed cache.
+
+    Parameters
+    ----------
+    path : Path
+        The SQLite file; created, along with its directory, if missing.
+    max_entries : int
+        The least recently used entries are evicted beyond this many.
+    stats : Optional[CacheStats], optional
+        Where to count hits and misses, by default a private instance.
+    """
+
+    def __init__(self, path: Path, *, max_entries: int, stats: Optional[CacheStats] = None) -> None:
+        if max_entries < 1:
+            raise ValueError("max_entries must be at least 1")
+        path.parent.mkdir(parents=True, exist_ok=True)
+        self.max_entries = max_entries
+        self.stats = stats if stats is not None else CacheStats()
+        self._connection = sqlite3.connect(path)
+        self._connection.execute("PRAGMA journal_mode=WAL")
+        self._connection.executescript(SCHEMA)
+        (self._clock,) = self._connection.execute(
+            "SELECT COALESCE(MAX(last_used), 0) FROM results"
+        ).fetchone()
+        (self._size,) = self._connection.execute("SELECT COUNT(*) FROM results").fetchone()
+        self._pending_writes = 0
+
+    def __enter__(self) -> "ResultCache":
+        return self
+
+    def __exit__(self, *exc_info: object) -> None:
+        self.close()
+
+    def __len__(self) -> int:
+        return int(self._size)
+
+    def _tick(self) -> int:
+        self._clock += 1
+        return int(self._clock)
+
+    def _written(self) -> None:
+        self._pending_writes += 1
+        if self._pending_writes >= COMMIT_EVERY:
+            self.flush()
+
+    def get(self, key: str) -> Optional[CacheEntry]:
+        """Look up `key`, counting the hit or miss and refreshing its recency"""
+        row = self._connection.execute(
+            "SELECT template, template_digest, value FROM results WHERE key = ?", (key,)
+        ).fetchone()
+        if row is None:
+            self.stats.misses += 1
+            return None
+        self.stats.hits += 1
+        self._connection.execute(
+            "UPDATE results SET last_used = ? WHERE key = ?", (self._tick(), key)
+        )
+        self._written()
+        return CacheEntry(*row)
+
+    def put(
+        self,
+        key: str,
+        *,
+        kind: str,
+        value: str,
+        template: Optional[str],
+        template_digest: str,
+    ) -> None:
+        """Store `value` under `key`, evicting the least recently used entries if full"""
+        exists = self._connection.execute("SELECT 1 FROM results WHERE key = ?", (key,)).fetchone()
+        self._connection.execute(
+            "INSERT OR REPLACE INTO results "
+            "(key, kind, template, template_digest, value, last_used) VALUES (?, ?, ?, ?, ?, ?)",
+            (key, kind, template, template_digest, value, self._tick()),
+        )
+        if exists is None:
+            self._size += 1
+        if self._size > self.max_entries:
+            self._evict(self._size - self.max_entries)
+        self._written()
+
+    def _evict(self, count: int) -> None:
+        evicted = self._connection.execute(
+            "DELETE FROM results WHERE key IN "
+            "(SELECT key FROM results ORDER BY last_used LIMIT ?)",
+            (count,),
+        ).rowcount
+        self._size -= evicted
+        self.stats.evictions += evicted
+
+    def invalidate_template(self, kind: str, template: Optional[str]) -> int:
+        """
+        Drop every `kind` entry that depends on `template`.
+
+        `None` drops the entries that matched no template, which is what
+        has to happen when a new template is added.
+        """
+        deleted = self._connection.execute(
+            "DELETE FROM results WHERE kind = ? AND template IS ?", (kind, template)
+        ).rowcount
+        self._size -= deleted
+        self.stats.invalidations += deleted
+        self._written()
+        return int(deleted)
+
+    def prune(self, kind: str, *, current_digests: dict[str, str], no_match_digest: str) -> int:
+        """
+        Drop the `kind` entries made with a template definition that no longer exists.
+
+        Parameters
+        ----------
+        kind : str
+            Which results to check.
+        current_digests : dict[str, str]
+            Template name -> digest of the current definition.
+        no_match_digest : str
+            What entries that matched no template must have been stored
+            with, usually the template library version.
+
+        Returns
+        -------
+        int
+            How many entries were dropped.
+        """
+        stale = [
+            key
+            for key, template, digest in self._connection.execute(
+                "SELECT key, template, template_digest FROM results WHERE kind = ?", (kind,)
+            )
+            if digest != (no_match_digest if template is None else current_digests.get(template))
+        ]
+        self._connection.executemany("DELETE FROM results WHERE key = ?", ((k,) for k in stale))
+        self._size -= len(stale)
+        self.stats.invalidations += len(stale)
+        self._written()
+        return len(stale)
+
+    def flush(self) -> None:
+        self._connection.commit()
+        self._pending_writes = 0
+
+    def close(self) -> None:
+        self.flush()
+        self._connection.close()
@@ -8,35 +8,71 @@ for more info, run
 ```sh
 claude-code-example --help
 ```
+
+Commands, rich and the app context are only loaded once they are used, so
+`--help`, `--version` and scripted calls start in a few milliseconds.
 """
 
+from pathlib import Path
+from typing import Any, Optional
+
 import click
-from rich.console import Console
 
 from claude_code_example.app_context import AppContext
-from claude_code_example.cli.simple_command import simple_command
-from claude_code_example.cli.subcommand import subcommand
+from claude_code_example.cli.console import get_console
+from claude_code_example.cli.lazy import INVOKED, LazyCommand, LazyGroup
 
 CONTEXT_SETTINGS = dict(help_option_names=["-h", "--help"], default_map={"obj": {}})
 
+COMMANDS = {
+    "subcommand": LazyCommand(
+        "claude_code_example.cli.subcommand:subcommand", "This contains sub-subcommands"
+    ),
+    "simple-command": LazyCommand(
+        "claude_code_example.cli.simple_command:simple_command", "This is a simple command."
+    ),
+    "convert": LazyCommand(
+        "claude_code_example.cli.convert:convert",
+        "Convert Anki decks from Normal to Cloze format",
+    ),
+    "stats": LazyCommand(
+        "claude_code_example.cli.stats:stats", "Show the report of a run made with --profile"
+    ),
+}
 
-console = Console()
+
+def __getattr__(name: str) -> Any:
+    # `from claude_code_example.cli.__main__ import console` keeps working;
+    # commands themselves use `cli.console`
+    if name == "console":
+        return get_console()
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
 
 
 @click.version_option(None, "--version", "-v")
-@click.group(context_settings=CONTEXT_SETTINGS)
+@click.group(cls=LazyGroup, lazy_commands=COMMANDS, context_settings=CONTEXT_SETTINGS)
+@click.option(
+    "--profile",
+    type=click.Path(dir_okay=False, writable=True, path_type=Path),
+    help="Profile the command and save its metrics report here, and its cProfile stats "
+    "next to it with a .prof suffix",
+)
 @click.pass_context
-def cli(ctx: click.Context) -> None:
+def cli(ctx: click.Context, profile: Optional[Path] = None) -> None:
     """
     Main entry point for the CLI.
     """
     # Putting all objects in context so that they don't have to be
-    # recreated for each command
-    ctx.ensure_object(AppContext)
-
+    # recreated for each command; the config and logger are only built
+    # when a command first uses them
+    app_context = ctx.ensure_object(AppContext)
+    if profile is not None:
+        from claude_code_example.metrics.profiling import start_profiling
 
-cli.add_command(subcommand)
-cli.add_command(simple_command)
+        finish = start_profiling(app_context, profile)
+        # by the time the root context closes, every nested group has added
+        # the name of its subcommand
+        ctx.call_on_close(lambda: finish(" ".join(ctx.meta.get(INVOKED, [])) or "cli"))
 
 
 if __name__ == "__main__":
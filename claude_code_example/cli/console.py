@@ -0,0 +1,21 @@
+"""
+The rich console commands print to.
+
+It lives here rather than in `cli.__main__`, which `python -m` runs as
+`__main__`: a command importing it from there would load the entry module
+a second time, with a console of its own.
+"""
+
+from functools import cache
+from typing import TYPE_CHECKING
+
+if TYPE_CHECKING:
+    from rich.console import Console
+
+
+@cache
+def get_console() -> "Console":
+    """The console shared by every command, created on first use"""
+    from rich.console import Console
+
+    return Console()
@@ -0,0 +1,31 @@
+import click
+
+from claude_code_example.cli.lazy import LazyCommand, LazyGroup
+
+COMMANDS = {
+    "read": LazyCommand(
+        "claude_code_example.cli.convert.read:read", "Stream the notes of an exported deck as TSV"
+    ),
+    "classify": LazyCommand(
+        "claude_code_example.cli.convert.classify:classify",
+        "Classify the notes of an exported deck against the template library",
+    ),
+    "cloze": LazyCommand(
+        "claude_code_example.cli.convert.cloze:cloze",
+        "Rewrite the notes that match a known template to Cloze, without the LLM",
+    ),
+    "run": LazyCommand(
+        "claude_code_example.cli.convert.run:run",
+        "Convert a deck to Cloze, resuming where the last run stopped",
+    ),
+}
+
+
+@click.group(cls=LazyGroup, lazy_commands=COMMANDS)
+@click.pass_context
+def convert(
+    ctx: click.Context,
+) -> None:
+    """
+    Convert Anki decks from Normal to Cloze format
+    """
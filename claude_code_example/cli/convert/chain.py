@@ -0,0 +1,91 @@
+"""The classifier chain `convert classify` and `convert run` send notes through."""
+
+from contextlib import asynccontextmanager, nullcontext
+from dataclasses import dataclass
+from typing import AsyncIterator, Optional
+
+from claude_code_example.anki.fingerprint import FingerprintIndex
+from claude_code_example.anki.templates import Template, TemplateLibrary
+from claude_code_example.app_context import AppContext
+from claude_code_example.llm.classifier import (
+    BatchingClassifier,
+    CachedClassifier,
+    Classifier,
+    FingerprintFirst,
+)
+from claude_code_example.llm.dedup import Deduplicator
+from claude_code_example.llm.ollama import OllamaClient
+
+
+@dataclass(frozen=True, slots=True)
+class ClassifierChain:
+    """
+    Fingerprints first, then the result cache, then the model, `batch_size`
+    notes a request; and the deduplicator that groups notes before they
+    are classified, when asked for.
+    """
+
+    fingerprints: FingerprintFirst
+    cached: Optional[CachedClassifier]
+    deduplicator: Optional[Deduplicator]
+    # enough notes in flight to fill a batch for every connection
+    max_in_flight: int
+
+    def template_changed(self, template: Template) -> None:
+        """Drop what the cache and the duplicate groups knew about `template`"""
+        if self.cached is not None:
+            self.cached.template_changed(template)
+        if self.deduplicator is not None:
+            self.deduplicator.template_changed(template)
+
+
+@asynccontextmanager
+async def classifier_chain(
+    app_context: AppContext,
+    templates: TemplateLibrary,
+    index: FingerprintIndex,
+    *,
+    concurrency: int,
+    batch_size: int,
+    use_cache: bool,
+    dedup: bool,
+) -> AsyncIterator[ClassifierChain]:
+    """The chain for `templates`, over `concurrency` connections to the model"""
+    config = app_context.app_config
+    async with OllamaClient(
+        base_url=config.ollama_url,
+        model=config.ollama_model,
+        timeout=config.ollama_timeout,
+        max_connections=concurrency,
+        spans=app_context.spans,
+    ) as client:
+        with app_context.open_result_cache() if use_cache else nullcontext() as cache:
+            classifier = (
+                BatchingClassifier(
+                    llm=client,
+                    templates=templates,
+                    batch_size=batch_size,
+                    max_prompt_chars=config.llm_batch_max_chars,
+                )
+                if batch_size > 1
+                else Classifier(llm=client, templates=templates)
+            )
+            cached = (
+                CachedClassifier(
+                    classifier=classifier,
+                    cache=cache,
+                    model=config.ollama_model,
+                    min_confidence=config.min_confidence,
+                )
+                if cache is not None
+                else None
+            )
+            classify = cached.classify if cached else classifier.classify
+            yield ClassifierChain(
+                fingerprints=FingerprintFirst(index=index, fallback=classify),
+                cached=cached,
+                deduplicator=(
+                    Deduplicator(similarity=config.dedup_similarity, index=index) if dedup else None
+                ),
+                max_in_flight=concurrency * batch_size,
+            )
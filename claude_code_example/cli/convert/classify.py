@@ -0,0 +1,118 @@
+import asyncio
+import time
+from pathlib import Path
+from typing import Optional
+
+import click
+
+from claude_code_example.anki.apkg import iter_notes
+from claude_code_example.anki.fingerprint import FingerprintIndex
+from claude_code_example.anki.templates import TemplateLibrary
+from claude_code_example.app_context import AppContext
+from claude_code_example.cli.convert.chain import classifier_chain
+from claude_code_example.llm.dedup import classify_notes
+
+
+async def _classify(
+    app_context: AppContext,
+    apkg: Path,
+    templates: TemplateLibrary,
+    concurrency: int,
+    batch_size: int,
+    use_cache: bool,
+    dedup: bool,
+) -> tuple[int, int, int]:
+    count = duplicates = 0
+    async with classifier_chain(
+        app_context,
+        templates,
+        FingerprintIndex(templates),
+        concurrency=concurrency,
+        batch_size=batch_size,
+        use_cache=use_cache,
+        dedup=dedup,
+    ) as chain:
+        async for _, result in classify_notes(
+            iter_notes(apkg),
+            chain.fingerprints.classify,
+            max_in_flight=chain.max_in_flight,
+            deduplicator=chain.deduplicator,
+        ):
+            count += 1
+            duplicates += result.duplicate_of is not None
+            click.echo(f"{result.note_id}\t{result.template or ''}\t{result.confidence:.2f}")
+    return count, chain.fingerprints.resolved, duplicates
+
+
+@click.command()
+@click.argument("apkg", type=click.Path(exists=True, dir_okay=False, path_type=Path))
+@click.option(
+    "--templates",
+    type=click.Path(dir_okay=False, path_type=Path),
+    help="Template library, defaults to templates_path from the config",
+)
+@click.option(
+    "--concurrency",
+    type=click.IntRange(min=1),
+    help="Requests sent to the model at once, defaults to llm_concurrency from the config",
+)
+@click.option(
+    "--batch-size",
+    type=click.IntRange(min=1),
+    help="Notes classified in a single request, defaults to llm_batch_size from the config",
+)
+@click.option("--no-cache", is_flag=True, help="Ask the model about every note")
+@click.option(
+    "--no-dedup", is_flag=True, help="Classify duplicate notes separately, not once per group"
+)
+@click.pass_context
+def classify(
+    ctx: click.Context,
+    apkg: Path,
+    templates: Optional[Path] = None,
+    concurrency: Optional[int] = None,
+    batch_size: Optional[int] = None,
+    no_cache: bool = False,
+    no_dedup: bool = False,
+) -> None:
+    """
+    Classify the notes of an exported deck against the template library
+    """
+    try:
+        app_context: AppContext = ctx.obj
+        config = app_context.app_config
+        library = TemplateLibrary.load(templates or config.templates_path)
+        concurrency = concurrency or config.llm_concurrency
+        batch_size = batch_size or config.llm_batch_size
+        app_context.logger.debug(
+            f"Classifying {apkg} against {len(library)} templates, {concurrency} at a time"
+        )
+
+        started = time.perf_counter()
+        count, resolved, duplicates = asyncio.run(
+            _classify(
+                app_context,
+                apkg,
+                library,
+                concurrency,
+                batch_size,
+                use_cache=not no_cache,
+                dedup=not no_dedup,
+            )
+        )
+        elapsed = time.perf_counter() - started
+        app_context.counters.cards += count
+
+        rate = count / elapsed if elapsed else 0.0
+        stats = app_context.cache_stats
+        click.echo(
+            f"classify: {count} notes in {elapsed:.2f}s ({rate:.1f} notes/sec), "
+            f"concurrency {concurrency}, batch size {batch_size}, "
+            f"{resolved} resolved by fingerprint, "
+            f"{duplicates} duplicates ({duplicates / count if count else 0.0:.0%} deduplicated), "
+            f"cache hits {stats.hits} misses {stats.misses}",
+            err=True,
+        )
+    except Exception as e:
+        click.echo(f"CLI Error: {str(e)}")
+        ctx.exit(1)
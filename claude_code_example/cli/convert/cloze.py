@@ -0,0 +1,98 @@
+import time
+from pathlib import Path
+from typing import Optional
+
+import click
+
+from claude_code_example.anki.apkg import DEFAULT_BATCH_SIZE, iter_note_batches, iter_note_columns
+from claude_code_example.anki.cloze import rewrite_batch
+from claude_code_example.anki.fingerprint import FingerprintIndex
+from claude_code_example.anki.templates import TemplateLibrary
+from claude_code_example.anki.tsv import TsvWriter
+from claude_code_example.app_context import AppContext
+from claude_code_example.conversion.parallel import rewrite_parallel
+
+
+@click.command()
+@click.argument("apkg", type=click.Path(exists=True, dir_okay=False, path_type=Path))
+@click.option(
+    "--templates",
+    type=click.Path(dir_okay=False, path_type=Path),
+    help="Template library, defaults to templates_path from the config",
+)
+@click.option(
+    "--output",
+    "-o",
+    type=click.Path(dir_okay=False, writable=True, allow_dash=True),
+    default="-",
+    show_default=True,
+    help="Where to write the Cloze notes as TSV",
+)
+@click.option(
+    "--batch-size",
+    type=click.IntRange(min=1),
+    default=DEFAULT_BATCH_SIZE,
+    show_default=True,
+    help="Number of notes grouped and rewritten at a time",
+)
+@click.option(
+    "--workers",
+    type=click.IntRange(min=1),
+    default=1,
+    show_default=True,
+    help="Processes to rewrite batches in; 1 rewrites in this process",
+)
+@click.pass_context
+def cloze(
+    ctx: click.Context,
+    apkg: Path,
+    templates: Optional[Path] = None,
+    output: str = "-",
+    batch_size: int = DEFAULT_BATCH_SIZE,
+    workers: int = 1,
+) -> None:
+    """
+    Rewrite the notes that match a known template to Cloze, without the LLM
+    """
+    try:
+        app_context: AppContext = ctx.obj
+        library = TemplateLibrary.load(templates or app_context.app_config.templates_path)
+        index = FingerprintIndex(library)
+        app_context.logger.debug(f"Rewriting {apkg} with {len(index)} fingerprinted templates")
+
+        count = converted = 0
+        started = time.perf_counter()
+        rewritten = (
+            rewrite_parallel(
+                # columns are sent to the workers as they are read
+                iter_note_columns(apkg, batch_size=batch_size),
+                app_context.app_config,
+                library,
+                workers=workers,
+            )
+            if workers > 1
+            else (
+                (batch, rewrite_batch(batch, index, library))
+                for batch in iter_note_batches(apkg, batch_size=batch_size)
+            )
+        )
+        with TsvWriter(Path(output)) as writer:
+            for batch, texts in rewritten:
+                count += len(batch)
+                for note, text in zip(batch, texts):
+                    if text is not None:
+                        converted += 1
+                        writer.write((text, "", " ".join(note.tags)))
+        elapsed = time.perf_counter() - started
+        app_context.counters.cards += count
+        app_context.counters.bytes_written += writer.bytes_written
+
+        rate = count / elapsed if elapsed else 0.0
+        click.echo(
+            f"cloze: {converted} of {count} notes rewritten in {elapsed:.2f}s "
+            f"({rate:.0f} notes/sec, {workers} workers), {count - converted} skipped",
+            err=True,
+        )
+    except Exception as e:
+        click.echo(f"CLI Error: {str(e)}")
+        ctx.exit(1)
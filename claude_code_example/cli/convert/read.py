@@ -0,0 +1,59 @@
+import time
+from pathlib import Path
+
+import click
+
+from claude_code_example.anki.apkg import DEFAULT_BATCH_SIZE, iter_note_batches
+from claude_code_example.anki.tsv import format_row
+from claude_code_example.app_context import AppContext
+from claude_code_example.metrics.resources import peak_rss_bytes
+
+
+@click.command()
+@click.argument("apkg", type=click.Path(exists=True, dir_okay=False, path_type=Path))
+@click.option(
+    "--batch-size",
+    type=click.IntRange(min=1),
+    default=DEFAULT_BATCH_SIZE,
+    show_default=True,
+    help="Number of notes fetched from the collection at a time",
+)
+@click.option("--quiet", "-q", is_flag=True, help="Only print the summary")
+@click.pass_context
+def read(
+    ctx: click.Context,
+    apkg: Path,
+    batch_size: int = DEFAULT_BATCH_SIZE,
+    quiet: bool = False,
+) -> None:
+    """
+    Stream the notes of an exported deck as TSV
+    """
+    try:
+        app_context: AppContext = ctx.obj
+        app_context.logger.debug(f"Reading {apkg} in batches of {batch_size}")
+
+        count = 0
+        started = time.perf_counter()
+        for batch in iter_note_batches(apkg, batch_size=batch_size):
+            count += len(batch)
+            if not quiet:
+                click.echo(
+                    "".join(
+                        format_row((str(note.id), note.note_type, note.deck, *note.fields))
+                        for note in batch
+                    ),
+                    nl=False,
+                )
+        elapsed = time.perf_counter() - started
+        app_context.counters.cards += count
+
+        rate = count / elapsed if elapsed else 0.0
+        click.echo(
+            f"read: {count} notes in {elapsed:.2f}s ({rate:.0f} notes/sec), "
+            f"peak RSS {peak_rss_bytes() / 2**20:.1f} MiB",
+            err=True,
+        )
+    except Exception as e:
+        click.echo(f"CLI Error: {str(e)}")
+        ctx.exit(1)
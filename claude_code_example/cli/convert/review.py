@@ -0,0 +1,107 @@
+"""Interactive review of proposals in the terminal."""
+
+import asyncio
+import threading
+from concurrent.futures import Future
+from typing import Callable, Literal, Optional, TypeVar
+
+import click
+from rich.console import Console
+from rich.table import Table
+
+from claude_code_example.anki.models import Note
+from claude_code_example.anki.templates import Template
+from claude_code_example.conversion.prefetch import Prefetcher
+from claude_code_example.conversion.proposer import Proposal
+from claude_code_example.conversion.run import ReviewAnswer, Reviewer
+
+T = TypeVar("T")
+
+CHOICES: dict[str, Literal["accept", "skip", "quit"]] = {
+    "a": "accept",
+    "s": "skip",
+    "q": "quit",
+}
+
+
+def _default_field(note: Note, preferred: str, position: int) -> str:
+    if preferred in note.field_names:
+        return preferred
+    return note.field_names[min(position, len(note.field_names) - 1)]
+
+
+def explain(note: Note) -> Template:
+    """Ask for the structure of `note` and turn the answers into a template"""
+    name = click.prompt("Template name")
+    description = click.prompt("Describe the structure")
+    click.echo("Regular expression each field matches, leave blank for any:")
+    fingerprint = {
+        field: pattern
+        for field in note.field_names
+        if (pattern := click.prompt(f"  {field}", default="", show_default=False))
+    }
+    fields = click.Choice(list(note.field_names))
+    cloze = {
+        role: click.prompt(
+            f"Field holding the {role}", type=fields, default=_default_field(note, preferred, i)
+        )
+        for i, (role, preferred) in enumerate(
+            (("prompt", "Prompt1"), ("hint", "Prompt2"), ("answer", "Answer"))
+        )
+    }
+    return Template(name=name, description=description, fingerprint=fingerprint, cloze=cloze)
+
+
+async def _in_thread(func: Callable[[], T]) -> T:
+    """
+    Run the blocking `func` without blocking the event loop, so that
+    prefetching carries on while the reviewer thinks.
+
+    The thread is a daemon: one still waiting on input must not keep the
+    process alive after Ctrl-C.
+    """
+    done: Future[T] = Future()
+
+    def run() -> None:
+        try:
+            done.set_result(func())
+        except BaseException as e:
+            done.set_exception(e)
+
+    threading.Thread(target=run, daemon=True).start()
+    return await asyncio.wrap_future(done)
+
+
+def make_reviewer(console: Console, prefetcher: Optional[Prefetcher] = None) -> Reviewer:
+    """
+    A reviewer for `run_interactive` that asks on the terminal, showing how
+    many of the next notes `prefetcher` has ready.
+    """
+
+    def ask(proposal: Proposal) -> ReviewAnswer:
+        table = Table(title=f"Note {proposal.note.id}", show_header=False)
+        for name, value in zip(proposal.note.field_names, proposal.note.fields):
+            table.add_row(name, value)
+        console.print(table)
+        if proposal.text is None:
+            console.print("[yellow]No known structure matches this note[/yellow]")
+        else:
+            console.print(
+                f"[bold]{proposal.template}[/bold] ({proposal.confidence:.0%}): {proposal.text}"
+            )
+        if prefetcher is not None and len(prefetcher):
+            console.print(f"[dim]{prefetcher.ready} of {len(prefetcher)} next notes ready[/dim]")
+
+        choice = click.prompt(
+            "[a]ccept, [s]kip, [e]xplain, [q]uit",
+            type=click.Choice(["a", "s", "e", "q"]),
+            default="a" if proposal.text is not None else "e",
+        )
+        if choice == "e":
+            return explain(proposal.note)
+        return CHOICES[choice]
+
+    async def review(proposal: Proposal) -> ReviewAnswer:
+        return await _in_thread(lambda: ask(proposal))
+
+    return review
@@ -0,0 +1,203 @@
+import asyncio
+import time
+from pathlib import Path
+from typing import Optional
+
+import click
+
+from claude_code_example.anki.apkg import iter_notes
+from claude_code_example.anki.fingerprint import FingerprintIndex
+from claude_code_example.anki.templates import Template, TemplateLibrary
+from claude_code_example.anki.tsv import TsvWriter
+from claude_code_example.app_context import AppContext
+from claude_code_example.cli.convert.chain import classifier_chain
+from claude_code_example.cli.convert.review import make_reviewer
+from claude_code_example.conversion.journal import ProgressJournal, deck_progress_dir
+from claude_code_example.conversion.prefetch import Prefetcher
+from claude_code_example.conversion.proposer import Proposer
+from claude_code_example.conversion.run import (
+    SHARD_BY,
+    Output,
+    RunStats,
+    ShardBy,
+    run_interactive,
+    run_silent,
+)
+
+
+async def _run(
+    app_context: AppContext,
+    apkg: Path,
+    templates_path: Path,
+    journal: ProgressJournal,
+    output: Output,
+    *,
+    silent: bool,
+    concurrency: int,
+    batch_size: int,
+    prefetch: int,
+    use_cache: bool,
+    dedup: bool,
+) -> RunStats:
+    config = app_context.app_config
+    library = TemplateLibrary.load(templates_path)
+    index = FingerprintIndex(library)
+    async with classifier_chain(
+        app_context,
+        library,
+        index,
+        concurrency=concurrency,
+        batch_size=batch_size,
+        use_cache=use_cache,
+        dedup=dedup,
+    ) as chain:
+        proposer = Proposer(
+            templates=library,
+            index=index,
+            classify=chain.fingerprints.classify,
+            spans=app_context.spans,
+        )
+
+        def save_library(template: Template) -> None:
+            library.save(templates_path)
+            app_context.logger.info(f"Learned template {template.name}")
+
+        proposer.on_template_changed.append(save_library)
+        proposer.on_template_changed.append(chain.template_changed)
+
+        notes = iter_notes(apkg, after_id=journal.last_note_id)
+        if silent:
+            return await run_silent(
+                notes,
+                proposer,
+                journal,
+                concurrency=chain.max_in_flight,
+                min_confidence=config.min_confidence,
+                output=output,
+                deduplicator=chain.deduplicator,
+            )
+        from claude_code_example.cli.console import get_console
+
+        prefetcher = Prefetcher(proposer, depth=prefetch, deduplicator=chain.deduplicator)
+        stats = await run_interactive(
+            notes,
+            proposer,
+            journal,
+            make_reviewer(get_console(), prefetcher),
+            output,
+            prefetcher=prefetcher,
+        )
+        app_context.logger.debug(
+            f"Proposed {prefetcher.repeated} prefetched notes again after templates changed"
+        )
+        return stats
+
+
+@click.command()
+@click.argument("apkg", type=click.Path(exists=True, dir_okay=False, path_type=Path))
+@click.option(
+    "--templates",
+    type=click.Path(dir_okay=False, path_type=Path),
+    help="Template library, defaults to templates_path from the config",
+)
+@click.option(
+    "--output",
+    "-o",
+    type=click.Path(dir_okay=False, writable=True, path_type=Path),
+    help="Where to write the converted notes as TSV, defaults to the progress directory",
+)
+@click.option(
+    "--shard-by",
+    type=click.Choice(SHARD_BY),
+    default="none",
+    show_default=True,
+    help="Write one TSV file per deck or per template, named after the output",
+)
+@click.option("--silent", is_flag=True, help="Convert confident matches without asking")
+@click.option(
+    "--concurrency",
+    type=click.IntRange(min=1),
+    help="Requests sent to the model at once in silent mode, defaults to llm_concurrency",
+)
+@click.option(
+    "--batch-size",
+    type=click.IntRange(min=1),
+    help="Notes classified in a single request in silent mode, defaults to llm_batch_size",
+)
+@click.option(
+    "--prefetch",
+    type=click.IntRange(min=0),
+    help="Notes proposed ahead of the one on screen in interactive mode, "
+    "defaults to review_prefetch",
+)
+@click.option("--no-cache", is_flag=True, help="Ask the model about every note")
+@click.option(
+    "--no-dedup", is_flag=True, help="Classify duplicate notes separately, not once per group"
+)
+@click.pass_context
+def run(
+    ctx: click.Context,
+    apkg: Path,
+    templates: Optional[Path] = None,
+    output: Optional[Path] = None,
+    shard_by: ShardBy = "none",
+    silent: bool = False,
+    concurrency: Optional[int] = None,
+    batch_size: Optional[int] = None,
+    prefetch: Optional[int] = None,
+    no_cache: bool = False,
+    no_dedup: bool = False,
+) -> None:
+    """
+    Convert a deck to Cloze, resuming where the last run stopped
+    """
+    try:
+        app_context: AppContext = ctx.obj
+        config = app_context.app_config
+        progress = deck_progress_dir(config.progress_dir, apkg)
+        prefetch = config.review_prefetch if prefetch is None else prefetch
+        output = output or progress / "cloze.tsv"
+
+        with TsvWriter(output) as writer, ProgressJournal(
+            progress,
+            fsync_every=config.journal_fsync_every,
+            compact_every=config.journal_compact_every,
+        ) as journal:
+            journal.attach(writer)
+            if journal.last_note_id is not None:
+                app_context.logger.info(f"Resuming {apkg} after note {journal.last_note_id}")
+
+            started = time.perf_counter()
+            stats = asyncio.run(
+                _run(
+                    app_context,
+                    apkg,
+                    templates or config.templates_path,
+                    journal,
+                    Output(writer, shard_by),
+                    silent=silent,
+                    # interactively, a connection for the note on screen and
+                    # one for each note prefetched
+                    concurrency=(concurrency or config.llm_concurrency) if silent else prefetch + 1,
+                    batch_size=(batch_size or config.llm_batch_size) if silent else 1,
+                    prefetch=prefetch,
+                    use_cache=not no_cache,
+                    dedup=not no_dedup,
+                )
+            )
+            elapsed = time.perf_counter() - started
+
+        app_context.counters.cards += stats.seen
+        app_context.counters.bytes_written += writer.bytes_written
+        app_context.spans.log_summary(app_context.logger)
+        click.echo(
+            f"run: {stats.seen} notes in {elapsed:.2f}s, {stats.converted} converted, "
+            f"{stats.skipped} skipped, {stats.duplicates} duplicates "
+            f"({stats.dedup_ratio:.0%} deduplicated)"
+            f"{', stopped early' if stats.stopped else ''}; "
+            f"{writer.rows} notes written to {output}",
+            err=True,
+        )
+    except Exception as e:
+        click.echo(f"CLI Error: {str(e)}")
+        ctx.exit(1)
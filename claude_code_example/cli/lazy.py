@@ -0,0 +1,87 @@
+"""
+Lazily loaded click commands.
+
+A `LazyGroup` knows its subcommands by name, import path and short help,
+and only imports a subcommand's module when that subcommand is run or asked
+for its own help. Listing the commands in `--help` uses the registered
+short help, so it imports nothing at all.
+"""
+
+import importlib
+from dataclasses import dataclass
+from typing import Any, Mapping, Optional
+
+import click
+
+# `Context.meta` key of the names of the commands being run, outermost first
+INVOKED = "claude_code_example.invoked"
+
+
+@dataclass(frozen=True, slots=True)
+class LazyCommand:
+    """
+    Where to find a command, and what `--help` says about it.
+
+    Parameters
+    ----------
+    import_path : str
+        `package.module:attribute` of the click command.
+    short_help : str
+        The command's one line help; kept in sync with its docstring by
+        the tests.
+    """
+
+    import_path: str
+    short_help: str
+
+    def load(self) -> click.Command:
+        module_name, attribute = self.import_path.split(":")
+        command = getattr(importlib.import_module(module_name), attribute)
+        if not isinstance(command, click.Command):
+            raise TypeError(f"{self.import_path} is not a click command")
+        return command
+
+
+class LazyGroup(click.Group):
+    """A click group whose subcommands are imported on first use"""
+
+    def __init__(
+        self, *args: Any, lazy_commands: Optional[Mapping[str, LazyCommand]] = None, **kwargs: Any
+    ) -> None:
+        super().__init__(*args, **kwargs)
+        self.lazy_commands = dict(lazy_commands or {})
+
+    def list_commands(self, ctx: click.Context) -> list[str]:
+        return sorted({*super().list_commands(ctx), *self.lazy_commands})
+
+    def get_command(self, ctx: click.Context, cmd_name: str) -> Optional[click.Command]:
+        lazy = self.lazy_commands.get(cmd_name)
+        if cmd_name not in self.commands and lazy is not None:
+            self.add_command(lazy.load(), cmd_name)
+        return super().get_command(ctx, cmd_name)
+
+    def resolve_command(
+        self, ctx: click.Context, args: list[str]
+    ) -> tuple[Optional[str], Optional[click.Command], list[str]]:
+        name, command, rest = super().resolve_command(ctx, args)
+        # `meta` is shared by every context, so nested groups add to one list
+        if name is not None:
+            ctx.meta.setdefault(INVOKED, []).append(name)
+        return name, command, rest
+
+    def format_commands(self, ctx: click.Context, formatter: click.HelpFormatter) -> None:
+        """Like `click.Group.format_commands`, without loading lazy commands"""
+        names = self.list_commands(ctx)
+        if not names:
+            return
+        limit = formatter.width - 6 - max(len(name) for name in names)
+        rows = []
+        for name in names:
+            # a bare stand in, so click shortens the help the same way it would
+            command = self.commands.get(name) or click.Command(
+                name, short_help=self.lazy_commands[name].short_help
+            )
+            if not command.hidden:
+                rows.append((name, command.get_short_help_str(limit)))
+        with formatter.section("Commands"):
+            formatter.write_dl(rows)
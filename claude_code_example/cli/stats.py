@@ -0,0 +1,93 @@
+import pstats
+from pathlib import Path
+
+import click
+from rich.table import Table
+
+from claude_code_example.cli.console import get_console
+from claude_code_example.metrics.profiling import profile_path
+from claude_code_example.metrics.report import MetricsReport
+
+
+def _summary(report: MetricsReport) -> Table:
+    table = Table(title=f"{report.command}: {report.elapsed:.2f}s", show_header=False)
+    table.add_column(style="bold")
+    table.add_column(justify="right")
+    table.add_row("cards", f"{report.cards} ({report.cards_per_sec:.1f}/sec)")
+    table.add_row("bytes written", f"{report.bytes_written:,}")
+    table.add_row(
+        "cache hit rate",
+        f"{report.cache_hit_rate:.0%} ({report.cache_hits} hits, {report.cache_misses} misses)",
+    )
+    latency = report.llm_latency_ms
+    table.add_row(
+        "LLM latency",
+        f"{report.llm_requests} requests, "
+        + ", ".join(f"{name} {latency.get(name, 0.0):.0f}ms" for name in ("p50", "p95", "p99")),
+    )
+    table.add_row("peak RSS", f"{report.peak_rss_bytes / 2**20:.1f} MiB")
+    return table
+
+
+def _stages(report: MetricsReport) -> Table:
+    table = Table(title="Stages")
+    table.add_column("stage")
+    for name in ("count", "total ms", "mean ms", "share"):
+        table.add_column(name, justify="right")
+    for stage, times in sorted(report.stages.items(), key=lambda item: -item[1]["total_ms"]):
+        share = times["total_ms"] / 1000 / report.elapsed if report.elapsed else 0.0
+        table.add_row(
+            stage,
+            str(int(times["count"])),
+            f"{times['total_ms']:.1f}",
+            f"{times['mean_ms']:.3f}",
+            f"{share:.0%}",
+        )
+    return table
+
+
+def _functions(path: Path, top: int) -> Table:
+    stats = pstats.Stats(str(path))
+    table = Table(title=f"Top {top} functions by cumulative time")
+    for name in ("function", "calls", "own s", "cumulative s"):
+        table.add_column(name, justify="left" if name == "function" else "right")
+    rows = sorted(
+        stats.stats.items(),  # type: ignore[attr-defined]
+        key=lambda item: -item[1][3],
+    )
+    for (filename, line, function), (_, calls, own, cumulative, _) in rows[:top]:
+        table.add_row(
+            f"{function} ({Path(filename).name}:{line})",
+            str(calls),
+            f"{own:.3f}",
+            f"{cumulative:.3f}",
+        )
+    return table
+
+
+@click.command()
+@click.argument("report", type=click.Path(exists=True, dir_okay=False, path_type=Path))
+@click.option(
+    "--top",
+    type=click.IntRange(min=0),
+    default=15,
+    show_default=True,
+    help="Functions to list from the cProfile stats, 0 for none",
+)
+@click.pass_context
+def stats(ctx: click.Context, report: Path, top: int = 15) -> None:
+    """
+    Show the report of a run made with --profile
+    """
+    try:
+        console = get_console()
+        metrics = MetricsReport.load(report)
+        console.print(_summary(metrics))
+        if metrics.stages:
+            console.print(_stages(metrics))
+        prof = profile_path(report)
+        if top and prof.exists():
+            console.print(_functions(prof, top))
+    except Exception as e:
+        click.echo(f"CLI Error: {str(e)}")
+        ctx.exit(1)
@@ -1,9 +1,16 @@
 import click
 
-from claude_code_example.cli.subcommand.subsubcommand import subsubcommand
+from claude_code_example.cli.lazy import LazyCommand, LazyGroup
 
+COMMANDS = {
+    "subsub": LazyCommand(
+        "claude_code_example.cli.subcommand.subsubcommand:subsubcommand",
+        "Hey dawg I heard you like commands inside commands",
+    ),
+}
 
-@click.group()
+
+@click.group(cls=LazyGroup, lazy_commands=COMMANDS)
 @click.pass_context
 def subcommand(
     ctx: click.Context,
@@ -11,6 +18,3 @@ def subcommand(
     """
     This contains sub-subcommands
     """
-
-
-subcommand.add_command(subsubcommand, name="subsub")
@@ -1,18 +1,14 @@
-from typing import Literal
-
 from pydantic_settings import BaseSettings, SettingsConfigDict
 
-from claude_code_example import __app_name__
+from claude_code_example.config.values import ENV_FILE, ConfigValues
 
 
-class ClaudeCodeExampleConfig(BaseSettings):
-    app_name: str = __app_name__
-    log_level: Literal["DEBUG", "INFO", "WARNING", "ERROR", "CRITICAL"] = "INFO"
-    # Add more ...
+class ClaudeCodeExampleConfig(ConfigValues, BaseSettings):
+    """`ConfigValues`, read from `.env` and the environment"""
 
     model_config = SettingsConfigDict(
         env_file_encoding="utf-8",
-        env_file=".env",
+        env_file=ENV_FILE,
         # if a setting is set to blah= in env, it will be ignored and
         # the default value will be used
         env_ignore_empty=True,
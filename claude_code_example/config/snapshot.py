@@ -0,0 +1,120 @@
+"""
+Loads the config once, and only validates it again when its inputs change.
+
+The config depends on `.env` and on the environment variables named after
+its settings. Together with the settings themselves, those make up a
+stamp. A config loaded in this process is reused for as long as the
+stamp holds. The validated values are also saved as a JSON snapshot with
+their stamp, so that the next CLI invocation builds its config straight
+from the snapshot: it neither reads `.env` and the environment again nor
+imports pydantic-settings, which reading them takes.
+"""
+
+import hashlib
+import json
+import os
+from pathlib import Path
+from typing import Any, Mapping, Optional
+
+from claude_code_example import __app_name__
+from claude_code_example.config.values import ENV_FILE, ConfigValues
+
+SNAPSHOT_PATH = Path(".cache/config.json")
+
+_loaded: dict[str, ConfigValues] = {}
+
+
+def _schema() -> list[str]:
+    """Every setting with its type and default, so changing the model changes the stamp"""
+    return [
+        f"{name}: {field.annotation} = {field.default!r}"
+        for name, field in ConfigValues.model_fields.items()
+    ]
+
+
+def config_stamp(
+    env_file: Optional[Path] = None, environ: Optional[Mapping[str, str]] = None
+) -> str:
+    """A hash of everything the config is loaded from"""
+    env_file = env_file or ENV_FILE
+    environ = os.environ if environ is None else environ
+    names = set(ConfigValues.model_fields)
+    # settings are matched to environment variables case insensitively
+    settings = sorted(
+        (key.lower(), value) for key, value in environ.items() if key.lower() in names
+    )
+    try:
+        stat = env_file.stat()
+        env_file_version = [stat.st_mtime_ns, stat.st_size]
+    except OSError:
+        env_file_version = []
+    payload = {
+        "schema": _schema(),
+        "env_file": [str(env_file.resolve()), *env_file_version],
+        "environ": settings,
+    }
+    return hashlib.sha256(json.dumps(payload).encode("utf-8")).hexdigest()[:16]
+
+
+def _from_sources() -> ConfigValues:
+    """Read and validate `.env` and the environment, the slow way"""
+    from claude_code_example.config.app_config import ClaudeCodeExampleConfig
+
+    settings = ClaudeCodeExampleConfig(app_name=__app_name__)
+    return ConfigValues.model_construct(**dict(settings))
+
+
+def _read_snapshot(path: Path, stamp: str) -> Optional[dict[str, Any]]:
+    try:
+        snapshot = json.loads(path.read_text(encoding="utf-8"))
+    except (OSError, ValueError):
+        return None
+    if not isinstance(snapshot, dict) or snapshot.get("stamp") != stamp:
+        return None
+    values = snapshot.get("values")
+    return values if isinstance(values, dict) else None
+
+
+def _write_snapshot(path: Path, stamp: str, config: ConfigValues) -> None:
+    """Save the snapshot, or don't if the directory is not writable"""
+    snapshot = {"stamp": stamp, "values": config.model_dump(mode="json")}
+    try:
+        path.parent.mkdir(parents=True, exist_ok=True)
+        partial = path.with_name(f"{path.name}.{os.getpid()}")
+        partial.write_text(json.dumps(snapshot, indent=2) + "\n", encoding="utf-8")
+        partial.replace(path)
+    except OSError:
+        pass
+
+
+def load_config(snapshot_path: Optional[Path] = SNAPSHOT_PATH) -> ConfigValues:
+    """
+    The config, from memory, from the snapshot at `snapshot_path` or, when
+    neither is current, from `.env` and the environment.
+
+    Parameters
+    ----------
+    snapshot_path : Optional[Path], optional
+        Where the snapshot is kept, by default `.cache/config.json`; None
+        to neither read nor write one.
+
+    Returns
+    -------
+    ConfigValues
+        A copy of the config, which the caller is free to change.
+    """
+    stamp = config_stamp()
+    config = _loaded.get(stamp)
+    if config is None:
+        values = _read_snapshot(snapshot_path, stamp) if snapshot_path else None
+        if values is not None:
+            # a plain model: validating only turns the JSON values back
+            # into paths and the like
+            config = ConfigValues.model_validate(values)
+        else:
+            config = _from_sources()
+            if snapshot_path:
+                _write_snapshot(snapshot_path, stamp, config)
+        _loaded.clear()
+        _loaded[stamp] = config
+    return config.model_copy()
@@ -0,0 +1,52 @@
+from pathlib import Path
+from typing import Literal, Optional
+
+from pydantic import BaseModel, ConfigDict, Field
+
+from claude_code_example import __app_name__
+
+# where `ClaudeCodeExampleConfig` reads settings from, besides the environment
+ENV_FILE = Path(".env")
+
+
+class ConfigValues(BaseModel):
+    """
+    The settings and their validation. Reading them from `.env` and the
+    environment is left to `ClaudeCodeExampleConfig`, so that a config
+    rebuilt from a snapshot needs neither those sources nor pydantic-settings.
+    """
+
+    app_name: str = __app_name__
+    log_level: Literal["DEBUG", "INFO", "WARNING", "ERROR", "CRITICAL"] = "INFO"
+    # also write every log record to this file as a JSON line
+    log_json_path: Optional[Path] = None
+    templates_path: Path = Path("templates.json")
+    ollama_url: str = "http://localhost:11434"
+    ollama_model: str = "mistral"
+    ollama_timeout: float = Field(default=120.0, gt=0)
+    # how many classification requests are sent to the model at once
+    llm_concurrency: int = Field(default=4, ge=1)
+    # notes classified in a single request, 1 sends one request per note
+    llm_batch_size: int = Field(default=1, ge=1)
+    # fewer notes are packed into a request whose prompt would be longer
+    llm_batch_max_chars: int = Field(default=6_000, ge=1)
+    cache_path: Path = Path(".cache/results.sqlite")
+    cache_max_entries: int = Field(default=100_000, ge=1)
+    # where each deck's progress journal is kept, one directory per deck
+    progress_dir: Path = Path(".progress")
+    journal_fsync_every: int = Field(default=64, ge=1)
+    journal_compact_every: int = Field(default=5_000, ge=1)
+    # silent mode only converts proposals at least this confident
+    min_confidence: float = Field(default=0.8, ge=0, le=1)
+    # notes at least this similar to an earlier one share its classification
+    dedup_similarity: float = Field(default=0.8, ge=0, le=1)
+    # notes proposed ahead of the one being reviewed in interactive mode
+    review_prefetch: int = Field(default=3, ge=0)
+    # Add more ...
+
+    model_config = ConfigDict(
+        # settings that are not in the model will be ignored
+        extra="ignore",
+        # if settings are re-defined the new ones will be validated
+        validate_assignment=True,
+    )
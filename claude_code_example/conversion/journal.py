@@ -0,0 +1,248 @@
+"""
+Crash-safe record of the decisions made during a conversion run.
+
+Decisions are appended to `journal.jsonl` and fsynced in batches. After
+every fsync a small `checkpoint.json` is replaced atomically with the id
+of the last committed note and the journal length at that point, so a
+resumed run reads one tiny file, drops whatever was written after the
+last commit, and carries on from the next note id. Every so often the
+journal is compacted into a new snapshot, which the checkpoint then
+switches to in the same atomic replace that empties the journal, so it
+never grows without bound and no decision is ever counted twice.
+
+Output files written alongside the journal can be attached to it: they
+are synced on every commit and their sizes stored in the checkpoint, so
+a resumed run truncates them back to exactly the committed decisions.
+"""
+
+import hashlib
+import json
+import os
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Callable, Iterator, Literal, Mapping, Optional, Protocol
+
+Action = Literal["accept", "skip", "transform"]
+
+JOURNAL = "journal.jsonl"
+CHECKPOINT = "checkpoint.json"
+SNAPSHOT_PATTERN = "snapshot-*.jsonl"
+
+
+def deck_progress_dir(root: Path, apkg: Path) -> Path:
+    """
+    The directory under `root` for the journal of `apkg`: named after the
+    deck and keyed on its resolved path, so that decks with the same name
+    in different directories never resume from each other's journal.
+    """
+    key = hashlib.blake2b(str(apkg.resolve()).encode("utf-8"), digest_size=4).hexdigest()
+    return root / f"{apkg.stem}-{key}"
+
+
+@dataclass(frozen=True, slots=True)
+class Decision:
+    """What was done with one note, and the output row if it was converted"""
+
+    note_id: int
+    action: Action
+    template: Optional[str] = None
+    row: tuple[str, ...] = ()
+
+    def to_json(self) -> str:
+        return json.dumps(
+            [self.note_id, self.action, self.template, list(self.row)], ensure_ascii=False
+        )
+
+    @classmethod
+    def from_json(cls, line: str) -> "Decision":
+        note_id, action, template, row = json.loads(line)
+        return cls(note_id=note_id, action=action, template=template, row=tuple(row))
+
+
+@dataclass(frozen=True, slots=True)
+class Checkpoint:
+    last_note_id: Optional[int] = None
+    journal_offset: int = 0
+    # decisions committed since the last compaction
+    journal_decisions: int = 0
+    snapshot_generation: int = 0
+    # size of each attached output file at the last commit
+    outputs: Mapping[str, int] = field(default_factory=dict)
+
+    @property
+    def snapshot(self) -> Optional[str]:
+        if not self.snapshot_generation:
+            return None
+        return SNAPSHOT_PATTERN.replace("*", str(self.snapshot_generation))
+
+
+class DurableOutput(Protocol):
+    def restore(self, offsets: Mapping[str, int]) -> None:
+        """Drop whatever was written after `offsets`"""
+
+    def sync(self) -> dict[str, int]:
+        """Make everything written so far durable and return the file sizes"""
+
+
+def _fsync_directory(directory: Path) -> None:
+    fd = os.open(directory, os.O_RDONLY)
+    try:
+        os.fsync(fd)
+    finally:
+        os.close(fd)
+
+
+def _replace_atomically(path: Path, content: str) -> None:
+    tmp_path = path.with_suffix(path.suffix + ".tmp")
+    with tmp_path.open("w", encoding="utf-8") as tmp:
+        tmp.write(content)
+        tmp.flush()
+        os.fsync(tmp.fileno())
+    os.replace(tmp_path, path)
+    _fsync_directory(path.parent)
+
+
+class ProgressJournal:
+    """
+    Append-only, fsync-batched journal of per note decisions.
+
+    Parameters
+    ----------
+    directory : Path
+        Where the journal, checkpoint and snapshot live; created if missing.
+    fsync_every : int
+        Decisions buffered before they are fsynced and checkpointed.
+    compact_every : int
+        Committed decisions after which the journal is folded into the
+        snapshot.
+    """
+
+    def __init__(self, directory: Path, *, fsync_every: int, compact_every: int) -> None:
+        if fsync_every < 1 or compact_every < 1:
+            raise ValueError("fsync_every and compact_every must be at least 1")
+        directory.mkdir(parents=True, exist_ok=True)
+        self.directory = directory
+        self.fsync_every = fsync_every
+        self.compact_every = compact_every
+        # called after every commit, once the decisions are durable
+        self.on_commit: list[Callable[[], None]] = []
+        self._output: Optional[DurableOutput] = None
+
+        self._checkpoint = self._read_checkpoint()
+        self._pending = 0
+        self._pending_last_id: Optional[int] = None
+        self._file = (directory / JOURNAL).open("a+b")
+        # anything after the checkpoint was never committed
+        self._file.truncate(self._checkpoint.journal_offset)
+        self._file.seek(self._checkpoint.journal_offset)
+
+    def __enter__(self) -> "ProgressJournal":
+        return self
+
+    def __exit__(self, *exc_info: object) -> None:
+        self.close()
+
+    def attach(self, output: DurableOutput) -> None:
+        """Commit `output` together with the decisions, rolling it back to the checkpoint"""
+        output.restore(self._checkpoint.outputs)
+        self._output = output
+
+    @property
+    def last_note_id(self) -> Optional[int]:
+        """The last committed note id, resume from the note after it"""
+        return self._checkpoint.last_note_id
+
+    def _read_checkpoint(self) -> Checkpoint:
+        path = self.directory / CHECKPOINT
+        if not path.exists():
+            return Checkpoint()
+        return Checkpoint(**json.loads(path.read_text(encoding="utf-8")))
+
+    def _write_checkpoint(self, checkpoint: Checkpoint) -> None:
+        _replace_atomically(
+            self.directory / CHECKPOINT,
+            json.dumps(
+                {
+                    "last_note_id": checkpoint.last_note_id,
+                    "journal_offset": checkpoint.journal_offset,
+                    "journal_decisions": checkpoint.journal_decisions,
+                    "snapshot_generation": checkpoint.snapshot_generation,
+                    "outputs": checkpoint.outputs,
+                }
+            ),
+        )
+        self._checkpoint = checkpoint
+
+    def record(self, decision: Decision) -> None:
+        """Append a decision; it is durable once the next commit happens"""
+        self._file.write(decision.to_json().encode("utf-8") + b"\n")
+        self._pending += 1
+        self._pending_last_id = decision.note_id
+        if self._pending >= self.fsync_every:
+            self.commit()
+
+    def commit(self) -> None:
+        """Make every recorded decision durable and move the resume point past them"""
+        if not self._pending:
+            return
+        self._file.flush()
+        os.fsync(self._file.fileno())
+        for hook in self.on_commit:
+            hook()
+        outputs = self._output.sync() if self._output is not None else self._checkpoint.outputs
+        self._write_checkpoint(
+            Checkpoint(
+                last_note_id=self._pending_last_id,
+                journal_offset=self._file.tell(),
+                journal_decisions=self._checkpoint.journal_decisions + self._pending,
+                snapshot_generation=self._checkpoint.snapshot_generation,
+                outputs=outputs,
+            )
+        )
+        self._pending = 0
+        if self._checkpoint.journal_decisions >= self.compact_every:
+            self.compact()
+
+    def compact(self) -> None:
+        """Fold the journal into a new snapshot, keeping the latest decision per note"""
+        self.commit()
+        decisions = {decision.note_id: decision for decision in self.decisions()}
+        checkpoint = Checkpoint(
+            last_note_id=self._checkpoint.last_note_id,
+            snapshot_generation=self._checkpoint.snapshot_generation + 1,
+            outputs=self._checkpoint.outputs,
+        )
+        _replace_atomically(
+            self.directory / str(checkpoint.snapshot),
+            "".join(f"{decisions[note_id].to_json()}\n" for note_id in sorted(decisions)),
+        )
+        # the new snapshot only counts once the checkpoint points at it
+        self._write_checkpoint(checkpoint)
+        self._file.truncate(0)
+        self._file.seek(0)
+        for path in self.directory.glob(SNAPSHOT_PATTERN):
+            if path.name != checkpoint.snapshot:
+                path.unlink()
+
+    def _lines(self, name: Optional[str], limit: Optional[int] = None) -> Iterator[str]:
+        if name is None:
+            return
+        path = self.directory / name
+        with path.open("rb") as source:
+            read = 0
+            for line in source:
+                read += len(line)
+                if limit is not None and read > limit:
+                    return
+                yield line.decode("utf-8")
+
+    def decisions(self) -> Iterator[Decision]:
+        """Every committed decision, snapshot first, in the order they were made"""
+        for line in self._lines(self._checkpoint.snapshot):
+            yield Decision.from_json(line)
+        for line in self._lines(JOURNAL, limit=self._checkpoint.journal_offset):
+            yield Decision.from_json(line)
+
+    def close(self) -> None:
+        self.commit()
+        self._file.close()
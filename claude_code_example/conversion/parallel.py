@@ -0,0 +1,168 @@
+"""
+Fingerprint matching and Cloze rewriting across CPU cores.
+
+Batches of notes are handed to a `ProcessPoolExecutor` a bounded number
+at a time and their results are yielded back in the order the batches
+came in, so the output is the same as a serial run. Each worker builds
+its own context, template library and fingerprint index once, from the
+config and templates the parent already loaded, and logs through the
+parent's sinks.
+
+Batches read with `iter_note_columns` cross the process boundary as they
+are: an array of ids, one string holding every field and arrays of
+offsets into it, which pickle about ten times faster than tuples of
+fields and spare the parent building `Note`s at all. Of other batches,
+only the field names and values of each note are sent: plain tuples,
+which pickle several times faster than `Note` instances, and the field
+names tuple shared by a note type is pickled once per batch.
+"""
+
+import logging
+from collections import deque
+from concurrent.futures import Executor, Future, ProcessPoolExecutor
+from multiprocessing.queues import Queue
+from typing import Any, Callable, Iterable, Iterator, Optional, Sequence, TypeVar, Union
+
+from claude_code_example.anki.cloze import rewrite_batch
+from claude_code_example.anki.columns import NoteColumns
+from claude_code_example.anki.fingerprint import FingerprintIndex
+from claude_code_example.anki.models import Note
+from claude_code_example.anki.templates import Template, TemplateLibrary
+from claude_code_example.app_context import AppContext
+from claude_code_example.config.values import ConfigValues
+from claude_code_example.logging.logging import worker_logs
+
+A = TypeVar("A")
+T = TypeVar("T")
+R = TypeVar("R")
+
+# batches queued per worker, enough to keep every worker busy
+IN_FLIGHT_PER_WORKER = 2
+
+
+class _Worker:
+    """What a worker process keeps between batches"""
+
+    def __init__(
+        self,
+        app_config: ConfigValues,
+        templates: Sequence[dict[str, Any]],
+        log_queue: "Queue[logging.LogRecord]",
+    ) -> None:
+        self.context = AppContext.for_worker(app_config, log_queue)
+        self.templates = TemplateLibrary([Template.from_dict(data) for data in templates])
+        self.index = FingerprintIndex(self.templates)
+
+
+_worker: Optional[_Worker] = None
+
+
+def _init_worker(
+    app_config: ConfigValues,
+    templates: Sequence[dict[str, Any]],
+    log_queue: "Queue[logging.LogRecord]",
+) -> None:
+    global _worker
+    _worker = _Worker(app_config, templates, log_queue)
+    _worker.context.logger.debug(f"Worker ready with {len(_worker.index)} fingerprints")
+
+
+# what a worker gets of a batch: its columns, or (field names, fields) of each note
+NoteFields = tuple[tuple[str, ...], tuple[str, ...]]
+WorkerBatch = Union[NoteColumns, list[NoteFields]]
+
+
+def _rewrite(batch: WorkerBatch) -> list[Optional[str]]:
+    assert _worker is not None, "worker used before _init_worker"
+    notes = (
+        list(batch)
+        if isinstance(batch, NoteColumns)
+        else [
+            Note(id=0, note_type="", deck="", field_names=field_names, fields=fields)
+            for field_names, fields in batch
+        ]
+    )
+    return rewrite_batch(notes, _worker.index, _worker.templates)
+
+
+def _prepare(batch: Sequence[Note]) -> WorkerBatch:
+    if isinstance(batch, NoteColumns):
+        return batch
+    return [(note.field_names, note.fields) for note in batch]
+
+
+def ordered_submit(
+    executor: Executor,
+    func: Callable[[A], R],
+    items: Iterable[T],
+    *,
+    max_in_flight: int,
+    prepare: Callable[[T], A],
+) -> Iterator[tuple[T, R]]:
+    """
+    `executor.map` that reads `items` lazily, keeping at most
+    `max_in_flight` of them submitted at a time, and yields each item with
+    its result, in order. `func` is called with `prepare(item)`, which is
+    all that is sent to the worker.
+    """
+    if max_in_flight < 1:
+        raise ValueError("max_in_flight must be at least 1")
+
+    pending: deque[tuple[T, Future[R]]] = deque()
+    try:
+        for item in items:
+            pending.append((item, executor.submit(func, prepare(item))))
+            if len(pending) >= max_in_flight:
+                done, future = pending.popleft()
+                yield done, future.result()
+        while pending:
+            done, future = pending.popleft()
+            yield done, future.result()
+    finally:
+        for _, future in pending:
+            future.cancel()
+
+
+def rewrite_parallel(
+    batches: Iterable[Sequence[Note]],
+    app_config: ConfigValues,
+    templates: TemplateLibrary,
+    *,
+    workers: int,
+) -> Iterator[tuple[Sequence[Note], list[Optional[str]]]]:
+    """
+    `rewrite_batch` over every batch, spread over `workers` processes.
+
+    Parameters
+    ----------
+    batches : Iterable[Sequence[Note]]
+        The note stream, already split into batches, best read with
+        `iter_note_columns`.
+    app_config : ConfigValues
+        The parent's config, handed to each worker as is.
+    templates : TemplateLibrary
+        The templates to match and rewrite with.
+    workers : int
+        Number of worker processes.
+
+    Yields
+    ------
+    tuple[Sequence[Note], list[Optional[str]]]
+        Each batch with its Cloze texts, in the order the batches came in.
+    """
+    if workers < 1:
+        raise ValueError("workers must be at least 1")
+
+    # the pool shuts down, its workers sending their last records, before worker_logs stops
+    with worker_logs(app_config.app_name) as log_queue, ProcessPoolExecutor(
+        max_workers=workers,
+        initializer=_init_worker,
+        initargs=(app_config, [template.to_dict() for template in templates], log_queue),
+    ) as executor:
+        yield from ordered_submit(
+            executor,
+            _rewrite,
+            batches,
+            max_in_flight=workers * IN_FLIGHT_PER_WORKER,
+            prepare=_prepare,
+        )
@@ -0,0 +1,137 @@
+"""
+Proposes the notes after the one being reviewed while the reviewer thinks.
+
+Without it, the model sits idle while a proposal is on screen, and the
+reviewer waits on the model once they have answered. A `Prefetcher` keeps
+up to `depth` notes ahead of the current one being proposed by background
+tasks, so the next proposal is usually ready the moment it is needed.
+Duplicates queue without a task and do not count towards `depth`: they
+are proposed from the first note of their group once it is yielded.
+"""
+
+import asyncio
+from collections import deque
+from dataclasses import dataclass
+from typing import AsyncGenerator, Iterable, Optional
+
+from claude_code_example.anki.models import Note
+from claude_code_example.anki.templates import Template
+from claude_code_example.conversion.proposer import Proposal, Proposer
+from claude_code_example.llm.classifier import Classification
+from claude_code_example.llm.dedup import Deduplicator
+
+
+@dataclass(slots=True)
+class _Queued:
+    note: Note
+    # the proposal being worked out, or None for a duplicate of `representative`
+    task: "Optional[asyncio.Task[Proposal]]" = None
+    representative: Optional[int] = None
+
+
+class Prefetcher:
+    """
+    Proposes notes for `run_interactive`, `depth` of them ahead.
+
+    Teaching a template makes some queued proposals stale: those that
+    matched nothing, or matched the template that was replaced, and those
+    the new fingerprint now claims. Those are proposed again; proposals
+    still in flight are started over, as they may have been worked out
+    against the old templates. Queued duplicates are proposed on their
+    own, as the groups are started afresh.
+    """
+
+    def __init__(
+        self, proposer: Proposer, depth: int, deduplicator: Optional[Deduplicator] = None
+    ) -> None:
+        if depth < 0:
+            raise ValueError("depth must be at least 0")
+        self.proposer = proposer
+        self.depth = depth
+        self.deduplicator = deduplicator
+        self.repeated = 0
+        self._queue: deque[_Queued] = deque()
+
+    def __len__(self) -> int:
+        """Notes queued after the current one"""
+        return len(self._queue)
+
+    @property
+    def ready(self) -> int:
+        """Queued notes whose proposal is already worked out, or needs no work"""
+        return sum(queued.task is None or queued.task.done() for queued in self._queue)
+
+    def _proposing(self) -> int:
+        return sum(queued.task is not None for queued in self._queue)
+
+    def _propose(self, note: Note) -> "asyncio.Task[Proposal]":
+        return asyncio.ensure_future(self.proposer.propose(note))
+
+    def _queue_note(self, note: Note) -> None:
+        if self.deduplicator is not None:
+            representative = self.deduplicator.representative(note)
+            if representative is not None:
+                self._queue.append(_Queued(note, representative=representative))
+                return
+        self._queue.append(_Queued(note, self._propose(note)))
+
+    def _stale(self, note: Note, task: "asyncio.Task[Proposal]", template: Template) -> bool:
+        if not task.done() or task.cancelled() or task.exception() is not None:
+            return True
+        matched = task.result().template
+        return matched in (None, template.name) or self.proposer.index.match(note) == template.name
+
+    def template_changed(self, template: Template) -> None:
+        """Propose again every queued note `template` could change"""
+        for queued in self._queue:
+            if queued.task is None or self._stale(queued.note, queued.task, template):
+                if queued.task is not None:
+                    queued.task.cancel()
+                    self.repeated += 1
+                queued.task = self._propose(queued.note)
+                queued.representative = None
+
+    async def _proposal(self, queued: _Queued) -> Proposal:
+        if queued.task is None:
+            assert self.deduplicator is not None and queued.representative is not None
+            classification = self.deduplicator.copy(queued.note, queued.representative)
+            return self.proposer.proposal(queued.note, classification)
+        proposal = await queued.task
+        if self.deduplicator is not None:
+            self.deduplicator.record(
+                Classification(proposal.note.id, proposal.template, proposal.confidence)
+            )
+        return proposal
+
+    async def proposals(self, notes: Iterable[Note]) -> AsyncGenerator[Proposal, None]:
+        """
+        The proposal for each of `notes`, in order; the next `depth` notes
+        are proposed while the caller works on the one yielded.
+
+        Close the generator, e.g. with `contextlib.aclosing`, to cancel
+        whatever is still queued when stopping early.
+        """
+        iterator = iter(notes)
+        self.proposer.on_template_changed.append(self.template_changed)
+        try:
+            while True:
+                # the note to yield next, and `depth` more being proposed behind it
+                while self._proposing() <= self.depth:
+                    note = next(iterator, None)
+                    if note is None:
+                        break
+                    self._queue_note(note)
+                if not self._queue:
+                    return
+                yield await self._proposal(self._queue.popleft())
+        finally:
+            self.proposer.on_template_changed.remove(self.template_changed)
+            for queued in self._queue:
+                task = queued.task
+                if task is None:
+                    continue
+                if task.done() and not task.cancelled():
+                    # retrieved, so that it is not reported as never retrieved
+                    task.exception()
+                task.cancel()
+            self._queue.clear()
@@ -0,0 +1,75 @@
+from dataclasses import dataclass
+from typing import Awaitable, Callable, Optional
+
+from claude_code_example.anki.cloze import transform_group
+from claude_code_example.anki.fingerprint import FingerprintIndex
+from claude_code_example.anki.models import Note
+from claude_code_example.anki.templates import Template, TemplateLibrary
+from claude_code_example.llm.classifier import Classification
+from claude_code_example.logging.spans import SpanRecorder
+
+
+@dataclass(frozen=True, slots=True)
+class Proposal:
+    """How the converter would rewrite a note: the template it matched and the Cloze text"""
+
+    note: Note
+    template: Optional[str]
+    confidence: float
+    text: Optional[str]
+    duplicate_of: Optional[int] = None
+
+
+class Proposer:
+    """
+    Classifies notes and rewrites them to Cloze.
+
+    `classify` is typically `FingerprintFirst.classify`, sharing `index`, so
+    that templates taught with `add_template` are picked up straight away.
+    Time spent classifying and rewriting is recorded in `spans`.
+    """
+
+    def __init__(
+        self,
+        *,
+        templates: TemplateLibrary,
+        index: FingerprintIndex,
+        classify: Callable[[Note], Awaitable[Classification]],
+        spans: Optional[SpanRecorder] = None,
+    ) -> None:
+        self.templates = templates
+        self.index = index
+        self.classify = classify
+        self.spans = spans or SpanRecorder()
+        # called with every template added or replaced, e.g. to invalidate caches
+        self.on_template_changed: list[Callable[[Template], None]] = []
+
+    def rewrite(self, note: Note, template_name: Optional[str]) -> Optional[str]:
+        template = self.templates.get(template_name) if template_name else None
+        return transform_group(template, [note])[0] if template else None
+
+    async def classify_note(self, note: Note) -> Classification:
+        with self.spans.span("classify"):
+            return await self.classify(note)
+
+    def proposal(self, note: Note, classification: Classification) -> Proposal:
+        """The proposal for `note`, classified already"""
+        with self.spans.span("transform"):
+            text = self.rewrite(note, classification.template)
+        return Proposal(
+            note=note,
+            template=classification.template,
+            confidence=classification.confidence,
+            text=text,
+            duplicate_of=classification.duplicate_of,
+        )
+
+    async def propose(self, note: Note) -> Proposal:
+        return self.proposal(note, await self.classify_note(note))
+
+    def add_template(self, template: Template) -> None:
+        """Teach a new template, or replace one, for every note proposed from now on"""
+        self.templates.add(template)
+        self.index.add(template)
+        for hook in self.on_template_changed:
+            hook(template)
@@ -0,0 +1,174 @@
+"""
+The conversion loop: propose a Cloze rewrite for each note, decide what
+to do with it, and record the decision in the progress journal, writing
+converted notes to the TSV output as it goes.
+"""
+
+from contextlib import aclosing
+from dataclasses import dataclass
+from typing import Awaitable, Callable, Iterable, Iterator, Literal, Optional, Union
+
+from claude_code_example.anki.models import Note
+from claude_code_example.anki.templates import Template
+from claude_code_example.anki.tsv import TsvWriter
+from claude_code_example.conversion.journal import Action, Decision, ProgressJournal
+from claude_code_example.conversion.prefetch import Prefetcher
+from claude_code_example.conversion.proposer import Proposal, Proposer
+from claude_code_example.llm.dedup import Deduplicator, classify_notes
+from claude_code_example.logging.spans import SpanRecorder
+
+# what the reviewer can answer: accept or skip the proposal, teach a
+# template that should be used instead, or stop for now
+ReviewAnswer = Union[Literal["accept", "skip", "quit"], Template]
+Reviewer = Callable[[Proposal], Awaitable[ReviewAnswer]]
+# which output file a converted note goes to
+ShardBy = Literal["none", "deck", "template"]
+SHARD_BY: tuple[ShardBy, ...] = ("none", "deck", "template")
+
+
+@dataclass(slots=True)
+class RunStats:
+    seen: int = 0
+    converted: int = 0
+    skipped: int = 0
+    # notes that shared the classification of an earlier duplicate
+    duplicates: int = 0
+    stopped: bool = False
+
+    @property
+    def dedup_ratio(self) -> float:
+        return self.duplicates / self.seen if self.seen else 0.0
+
+
+class Output:
+    """Where converted notes go: the TSV writer and the shard each note belongs to"""
+
+    def __init__(self, writer: Optional[TsvWriter] = None, shard_by: ShardBy = "none") -> None:
+        self.writer = writer
+        self.shard_by = shard_by
+
+    def shard(self, proposal: Proposal) -> str:
+        if self.shard_by == "deck":
+            return proposal.note.deck
+        if self.shard_by == "template":
+            return proposal.template or ""
+        return ""
+
+    def convert(self, journal: ProgressJournal, action: Action, proposal: Proposal) -> None:
+        """Write the converted note, then record it; the journal commit makes both durable"""
+        row = (proposal.text or "", "", " ".join(proposal.note.tags))
+        if self.writer is not None:
+            self.writer.write(row, self.shard(proposal))
+        journal.record(Decision(proposal.note.id, action, proposal.template, row))
+
+
+def _timed_reads(notes: Iterable[Note], spans: SpanRecorder) -> Iterator[Note]:
+    """`notes`, timing how long each one takes to arrive as the `read` stage"""
+    iterator = iter(notes)
+    while True:
+        with spans.span("read"):
+            note = next(iterator, None)
+        if note is None:
+            return
+        yield note
+
+
+async def run_silent(
+    notes: Iterable[Note],
+    proposer: Proposer,
+    journal: ProgressJournal,
+    *,
+    concurrency: int,
+    min_confidence: float,
+    output: Optional[Output] = None,
+    deduplicator: Optional[Deduplicator] = None,
+) -> RunStats:
+    """
+    Convert every note proposed with at least `min_confidence`, skip the rest.
+
+    Notes are classified `concurrency` at a time but rewritten and recorded
+    in deck order, so the journal's resume point never skips over a note.
+    With a `deduplicator`, duplicates share the classification of the
+    first note of their group instead of taking a place among those.
+    """
+    output = output or Output()
+    spans = proposer.spans
+    stats = RunStats()
+    async for note, classification in classify_notes(
+        _timed_reads(notes, spans),
+        proposer.classify_note,
+        max_in_flight=concurrency,
+        deduplicator=deduplicator,
+    ):
+        proposal = proposer.proposal(note, classification)
+        stats.seen += 1
+        stats.duplicates += proposal.duplicate_of is not None
+        with spans.span("write"):
+            if proposal.text is not None and proposal.confidence >= min_confidence:
+                stats.converted += 1
+                output.convert(journal, "transform", proposal)
+            else:
+                stats.skipped += 1
+                journal.record(Decision(proposal.note.id, "skip", proposal.template))
+    with spans.span("write"):
+        journal.commit()
+    return stats
+
+
+async def run_interactive(
+    notes: Iterable[Note],
+    proposer: Proposer,
+    journal: ProgressJournal,
+    review: Reviewer,
+    output: Optional[Output] = None,
+    prefetcher: Optional[Prefetcher] = None,
+) -> RunStats:
+    """
+    Show each proposal to `review` and record its answer.
+
+    Teaching a template adds it to the proposer and proposes the same note
+    again; quitting commits what has been decided so far. A duplicate of a
+    note already answered, proposed with the same template, gets the same
+    answer without being shown. With a `prefetcher`, the notes after the
+    one under review are proposed in the meantime.
+    """
+    output = output or Output()
+    spans = proposer.spans
+    stats = RunStats()
+    if prefetcher is None:
+        prefetcher = Prefetcher(proposer, depth=0)
+    # note id -> (template, answer) of every note answered that duplicates can copy
+    answered: dict[int, tuple[Optional[str], ReviewAnswer]] = {}
+    async with aclosing(prefetcher.proposals(_timed_reads(notes, spans))) as proposals:
+        async for proposal in proposals:
+            note = proposal.note
+            earlier = (
+                answered.get(proposal.duplicate_of) if proposal.duplicate_of is not None else None
+            )
+            if earlier is not None and earlier[0] == proposal.template:
+                answer = earlier[1]
+            else:
+                while True:
+                    answer = await review(proposal)
+                    if not isinstance(answer, Template):
+                        break
+                    proposer.add_template(answer)
+                    proposal = await proposer.propose(note)
+                if proposal.duplicate_of is None and answer != "quit":
+                    answered[note.id] = (proposal.template, answer)
+
+            if answer == "quit":
+                stats.stopped = True
+                break
+            stats.seen += 1
+            stats.duplicates += proposal.duplicate_of is not None
+            with spans.span("write"):
+                if answer == "accept" and proposal.text is not None:
+                    stats.converted += 1
+                    output.convert(journal, "accept", proposal)
+                else:
+                    stats.skipped += 1
+                    journal.record(Decision(note.id, "skip", proposal.template))
+    with spans.span("write"):
+        journal.commit()
+    return stats
@@ -0,0 +1,343 @@
+"""Classifies notes against the template library with an LLM."""
+
+import asyncio
+import json
+from dataclasses import dataclass
+from typing import Any, Awaitable, Callable, Optional, Protocol, Sequence
+
+from claude_code_example.anki.fingerprint import FINGERPRINT_CONFIDENCE, FingerprintIndex
+from claude_code_example.anki.models import Note
+from claude_code_example.anki.templates import Template, TemplateLibrary
+from claude_code_example.cache.result_cache import ResultCache, cache_key, normalise_fields
+
+PROMPT = """You are sorting German language flash cards into known card structures.
+
+Known structures:
+{templates}
+
+Card:
+{fields}
+
+Which structure does the card match? Answer with JSON only, in the form
+{{"template": "<structure name, or null if none match>", "confidence": <0.0 to 1.0>}}"""
+BATCH_PROMPT = """You are sorting German language flash cards into known card structures.
+
+Known structures:
+{templates}
+
+Cards:
+{cards}
+
+Which structure does each card match? Answer with JSON only, one entry per card, in the form
+{{"cards": [
+  {{"card": <card number>, "template": "<structure name, or null if none match>",
+   "confidence": <0.0 to 1.0>}}
+]}}"""
+CACHE_KIND = "classify"
+PROMPT_VERSION = cache_key(PROMPT)[:16]
+
+
+class TextGenerator(Protocol):
+    async def generate(self, prompt: str) -> str: ...
+
+
+@dataclass(frozen=True, slots=True)
+class Classification:
+    """Which template, if any, a note matched"""
+
+    note_id: int
+    template: Optional[str]
+    confidence: float
+    # the note this classification was copied from, when a duplicate
+    duplicate_of: Optional[int] = None
+
+
+def _listed(templates: TemplateLibrary) -> str:
+    listed = "\n".join(f"- {template.name}: {template.description}" for template in templates)
+    return listed or "(none yet)"
+
+
+def _fields(note: Note) -> str:
+    return "\n".join(f"{name}: {value}" for name, value in zip(note.field_names, note.fields))
+
+
+def build_prompt(note: Note, templates: TemplateLibrary) -> str:
+    return PROMPT.format(templates=_listed(templates), fields=_fields(note))
+
+
+def _card(number: int, note: Note) -> str:
+    return f"[{number}]\n{_fields(note)}"
+
+
+def build_batch_prompt(notes: Sequence[Note], templates: TemplateLibrary) -> str:
+    cards = "\n\n".join(_card(number, note) for number, note in enumerate(notes, start=1))
+    return BATCH_PROMPT.format(templates=_listed(templates), cards=cards)
+
+
+def _classification(note: Note, data: Any, templates: TemplateLibrary) -> Classification:
+    """Raises ValueError, TypeError or AttributeError if `data` is malformed"""
+    template = data.get("template")
+    confidence = min(max(float(data.get("confidence", 0.0)), 0.0), 1.0)
+    if template not in templates:
+        return Classification(note_id=note.id, template=None, confidence=0.0)
+    return Classification(note_id=note.id, template=template, confidence=confidence)
+
+
+def parse_answer(note: Note, answer: str, templates: TemplateLibrary) -> Classification:
+    """
+    Turn the model's answer into a Classification.
+
+    Anything malformed, or naming a template that does not exist, counts
+    as no match.
+    """
+    try:
+        return _classification(note, json.loads(answer), templates)
+    except (ValueError, TypeError, AttributeError):
+        return Classification(note_id=note.id, template=None, confidence=0.0)
+
+
+def parse_batch_answer(
+    notes: Sequence[Note], answer: str, templates: TemplateLibrary
+) -> list[Optional[Classification]]:
+    """
+    Turn the model's answer to a batch prompt into one Classification per
+    note, in order.
+
+    Cards the answer leaves out or garbles are None, and should be asked
+    about one at a time; a card naming a template that does not exist
+    counts as no match, as it does in `parse_answer`.
+    """
+    results: list[Optional[Classification]] = [None] * len(notes)
+    try:
+        entries = json.loads(answer)["cards"]
+        if not isinstance(entries, list):
+            return results
+    except (ValueError, TypeError, KeyError):
+        return results
+
+    for position, entry in enumerate(entries):
+        try:
+            number = int(entry.get("card", position + 1))
+            if 1 <= number <= len(notes) and results[number - 1] is None:
+                results[number - 1] = _classification(notes[number - 1], entry, templates)
+        except (ValueError, TypeError, AttributeError):
+            continue
+    return results
+
+
+class Classifier:
+    """Asks the model which template each note matches"""
+
+    def __init__(self, *, llm: TextGenerator, templates: TemplateLibrary) -> None:
+        self.llm = llm
+        self.templates = templates
+
+    async def classify(self, note: Note) -> Classification:
+        answer = await self.llm.generate(build_prompt(note, self.templates))
+        return parse_answer(note, answer, self.templates)
+
+
+class BatchingClassifier(Classifier):
+    """
+    Asks the model about up to `batch_size` notes in a single request.
+
+    Notes handed to `classify` at about the same time, e.g. by
+    `ordered_map` with a window of at least `batch_size`, are packed into
+    one prompt; a batch goes out as soon as it is full, or `linger`
+    seconds after its first note arrived. Fewer notes are packed when the
+    prompt would grow past `max_prompt_chars`. Cards the answer leaves out
+    or garbles are asked about one at a time.
+    """
+
+    def __init__(
+        self,
+        *,
+        llm: TextGenerator,
+        templates: TemplateLibrary,
+        batch_size: int,
+        max_prompt_chars: int,
+        linger: float = 0.05,
+    ) -> None:
+        if batch_size < 1:
+            raise ValueError("batch_size must be at least 1")
+        super().__init__(llm=llm, templates=templates)
+        self.batch_size = batch_size
+        self.max_prompt_chars = max_prompt_chars
+        self.linger = linger
+        self.batches = 0
+        self.fallbacks = 0
+        self._waiting: list[tuple[Note, asyncio.Future[Classification]]] = []
+        self._timer: Optional[asyncio.TimerHandle] = None
+        # batches being sent, referenced so they are not garbage collected
+        self._sending: set[asyncio.Task[None]] = set()
+
+    async def classify(self, note: Note) -> Classification:
+        loop = asyncio.get_running_loop()
+        future: asyncio.Future[Classification] = loop.create_future()
+        self._waiting.append((note, future))
+        if len(self._waiting) >= self.batch_size:
+            self._flush(full_only=True)
+        if self._waiting and self._timer is None:
+            self._timer = loop.call_later(self.linger, self._flush)
+        return await future
+
+    def _flush(self, full_only: bool = False) -> None:
+        """Send the waiting notes in batches, keeping a last partial one back if `full_only`"""
+        if self._timer is not None:
+            self._timer.cancel()
+            self._timer = None
+        while self._waiting and (not full_only or len(self._waiting) >= self.batch_size):
+            task = asyncio.ensure_future(self._send(self._take()))
+            self._sending.add(task)
+            task.add_done_callback(self._sending.discard)
+
+    def _take(self) -> list[tuple[Note, asyncio.Future[Classification]]]:
+        """The next batch: as many waiting notes as fit, and always at least one"""
+        size = len(build_batch_prompt([], self.templates))
+        count = 0
+        for number, (note, _) in enumerate(self._waiting[: self.batch_size], start=1):
+            # cards are separated by a blank line
+            size += len(_card(number, note)) + (2 if number > 1 else 0)
+            if count and size > self.max_prompt_chars:
+                break
+            count += 1
+        batch, self._waiting = self._waiting[:count], self._waiting[count:]
+        return batch
+
+    async def _send(self, batch: list[tuple[Note, asyncio.Future[Classification]]]) -> None:
+        batch = [(note, future) for note, future in batch if not future.done()]
+        if not batch:
+            return
+        notes = [note for note, _ in batch]
+        self.batches += 1
+        try:
+            answer = await self.llm.generate(build_batch_prompt(notes, self.templates))
+        except Exception as e:
+            for _, future in batch:
+                if not future.done():
+                    future.set_exception(e)
+            return
+
+        retries = []
+        for (note, future), result in zip(batch, parse_batch_answer(notes, answer, self.templates)):
+            if result is None:
+                retries.append(self._retry(note, future))
+            elif not future.done():
+                future.set_result(result)
+        self.fallbacks += len(retries)
+        await asyncio.gather(*retries)
+
+    async def _retry(self, note: Note, future: asyncio.Future[Classification]) -> None:
+        try:
+            result = await super().classify(note)
+        except Exception as e:
+            if not future.done():
+                future.set_exception(e)
+        else:
+            if not future.done():
+                future.set_result(result)
+
+
+class CachedClassifier:
+    """
+    Answers from the result cache when it can and asks `classifier` otherwise.
+
+    Only decided answers are cached: a template matched with at least
+    `min_confidence`, or no template at all. A weaker match is left
+    undecided and asked again next time, as a template added since may fit
+    the note better. Entries made against template definitions that have
+    since changed are pruned on construction, so whatever is left in the
+    cache is current.
+    """
+
+    def __init__(
+        self,
+        *,
+        classifier: Classifier,
+        cache: ResultCache,
+        model: str,
+        min_confidence: float = 0.0,
+    ) -> None:
+        self.classifier = classifier
+        self.cache = cache
+        self.model = model
+        self.min_confidence = min_confidence
+        templates = classifier.templates
+        cache.prune(
+            CACHE_KIND,
+            current_digests={template.name: template.digest for template in templates},
+            no_match_digest=templates.version,
+        )
+
+    @property
+    def templates(self) -> TemplateLibrary:
+        return self.classifier.templates
+
+    def key(self, note: Note) -> str:
+        return cache_key(
+            CACHE_KIND,
+            normalise_fields(note.field_names, note.fields),
+            self.model,
+            PROMPT_VERSION,
+        )
+
+    def template_changed(self, template: Template) -> None:
+        """
+        Forget the answers `template` could change: those that named it, and
+        those that matched nothing at all.
+        """
+        self.cache.invalidate_template(CACHE_KIND, template.name)
+        self.cache.invalidate_template(CACHE_KIND, None)
+
+    async def classify(self, note: Note) -> Classification:
+        key = self.key(note)
+        entry = self.cache.get(key)
+        if entry is not None:
+            return Classification(
+                note_id=note.id, template=entry.template, confidence=float(entry.value)
+            )
+
+        result = await self.classifier.classify(note)
+        if result.template is not None and result.confidence < self.min_confidence:
+            return result
+        template = self.templates.get(result.template) if result.template else None
+        self.cache.put(
+            key,
+            kind=CACHE_KIND,
+            value=repr(result.confidence),
+            template=result.template,
+            template_digest=template.digest if template else self.templates.version,
+        )
+        return result
+
+
+class FingerprintFirst:
+    """
+    Resolves notes from the fingerprint index and only hands the ambiguous
+    ones to `fallback`, typically `CachedClassifier.classify`.
+    """
+
+    def __init__(
+        self,
+        *,
+        index: FingerprintIndex,
+        fallback: Callable[[Note], Awaitable[Classification]],
+    ) -> None:
+        self.index = index
+        self.fallback = fallback
+        self.resolved = 0
+        self.deferred = 0
+
+    def resolve(self, note: Note) -> Optional[Classification]:
+        template = self.index.match(note)
+        if template is None:
+            return None
+        return Classification(note_id=note.id, template=template, confidence=FINGERPRINT_CONFIDENCE)
+
+    async def classify(self, note: Note) -> Classification:
+        result = self.resolve(note)
+        if result is not None:
+            self.resolved += 1
+            return result
+        self.deferred += 1
+        return await self.fallback(note)
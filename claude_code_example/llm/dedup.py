@@ -0,0 +1,252 @@
+"""
+Collapses duplicate notes before they are classified.
+
+Shared decks are full of notes that differ only in markup: `<u>` tags,
+runs of whitespace, non-breaking spaces. Fields are normalised by
+dropping tags, unescaping entities and collapsing whitespace, and notes
+whose normalised fields are the same are exact duplicates. Other notes
+are compared by the MinHash signature of their character shingles, banded
+into an LSH index, so near duplicates are found without comparing every
+pair of notes.
+
+Notes are grouped as they are read, before the classification window:
+only the first note of each group is classified and takes a place in the
+window, and every other note in the group gets that classification,
+marked with the note it was copied from, as it comes out.
+"""
+
+import hashlib
+import html
+import random
+import re
+from array import array
+from typing import AsyncIterator, Awaitable, Callable, Iterable, Iterator, Optional, Sequence
+
+from claude_code_example.anki.fingerprint import FingerprintIndex
+from claude_code_example.anki.models import Note
+from claude_code_example.anki.templates import Template
+from claude_code_example.llm.classifier import Classification
+from claude_code_example.llm.pipeline import ordered_map
+
+SHINGLE_SIZE = 5
+NUM_HASHES = 32
+BANDS = 8
+ROWS = NUM_HASHES // BANDS
+DEFAULT_SIMILARITY = 0.8
+
+# each MinHash function is the shingle hash XORed with one of these
+_MASKS = [random.Random(0x5EED + seed).getrandbits(64) for seed in range(NUM_HASHES)]
+# line breaks and blocks separate words, other tags sit inside them
+_BREAK = re.compile(r"<\s*(?:br|/?div|/?p|/?li)\b[^>]*>", re.IGNORECASE)
+_TAG = re.compile(r"<[^>]*>")
+
+
+def normalise(value: str) -> str:
+    """`value` as the reader sees it: no tags or entities, whitespace collapsed"""
+    return " ".join(html.unescape(_TAG.sub("", _BREAK.sub(" ", value))).split())
+
+
+def _text(note: Note) -> str:
+    return "\x1f".join(
+        f"{name}={normalise(value)}" for name, value in zip(note.field_names, note.fields)
+    )
+
+
+def exact_key(note: Note) -> bytes:
+    """The same for notes whose fields only differ in markup and whitespace"""
+    return hashlib.blake2b(_text(note).encode("utf-8"), digest_size=16).digest()
+
+
+def _hash(shingle: str) -> int:
+    # not hash(), which is salted per process
+    return int.from_bytes(hashlib.blake2b(shingle.encode("utf-8"), digest_size=8).digest())
+
+
+def signature(note: Note) -> "array[int]":
+    """The MinHash signature of the note's normalised character shingles"""
+    text = _text(note)
+    shingles = {text[start : start + SHINGLE_SIZE] for start in range(len(text) - SHINGLE_SIZE + 1)}
+    hashes = [_hash(shingle) for shingle in shingles or {text}]
+    return array("Q", [min(map(mask.__xor__, hashes)) for mask in _MASKS])
+
+
+def similarity(first: Sequence[int], second: Sequence[int]) -> float:
+    """The Jaccard similarity of two notes, estimated from their signatures"""
+    return sum(a == b for a, b in zip(first, second)) / NUM_HASHES
+
+
+class MinHashIndex:
+    """
+    Finds an earlier note whose signature is at least `threshold` similar.
+
+    Each signature is split into bands, and only notes sharing a whole band
+    are compared.
+    """
+
+    def __init__(self, threshold: float = DEFAULT_SIMILARITY) -> None:
+        self.threshold = threshold
+        self._signatures: dict[int, array[int]] = {}
+        self._bands: dict[tuple[int, ...], list[int]] = {}
+
+    def __len__(self) -> int:
+        return len(self._signatures)
+
+    @staticmethod
+    def _band_keys(note_signature: Sequence[int]) -> list[tuple[int, ...]]:
+        return [(band, *note_signature[band * ROWS : (band + 1) * ROWS]) for band in range(BANDS)]
+
+    def add(self, note_id: int, note_signature: "array[int]") -> None:
+        self._signatures[note_id] = note_signature
+        for key in self._band_keys(note_signature):
+            self._bands.setdefault(key, []).append(note_id)
+
+    def query(self, note_signature: Sequence[int]) -> Optional[int]:
+        """The most similar note above the threshold, if any"""
+        best, best_similarity = None, self.threshold
+        seen: set[int] = set()
+        for key in self._band_keys(note_signature):
+            for candidate in self._bands.get(key, ()):
+                if candidate in seen:
+                    continue
+                seen.add(candidate)
+                estimate = similarity(note_signature, self._signatures[candidate])
+                if estimate >= best_similarity:
+                    best, best_similarity = candidate, estimate
+        return best
+
+
+class Deduplicator:
+    """
+    Puts each note in a group of duplicates, before it is classified.
+
+    Notes `index` resolves are left alone, so only notes that would reach
+    the model are grouped. The classification `record`ed for the first note
+    of a group is what `copy` gives the rest.
+    """
+
+    def __init__(
+        self,
+        *,
+        similarity: float = DEFAULT_SIMILARITY,
+        index: Optional[FingerprintIndex] = None,
+    ) -> None:
+        self.similarity = similarity
+        self.index = index
+        self.seen = 0
+        self.exact = 0
+        self.near = 0
+        self._reset()
+
+    def _reset(self) -> None:
+        # exact key -> the note classified for it
+        self._groups: dict[bytes, int] = {}
+        self._index = MinHashIndex(self.similarity)
+        # the first note of each group -> its classification, once recorded
+        self._classifications: dict[int, Optional[Classification]] = {}
+
+    @property
+    def duplicates(self) -> int:
+        return self.exact + self.near
+
+    @property
+    def ratio(self) -> float:
+        """The share of notes that were not classified themselves"""
+        return self.duplicates / self.seen if self.seen else 0.0
+
+    def template_changed(self, template: Template) -> None:
+        """Forget every group: their classifications may no longer hold"""
+        self._reset()
+
+    def representative(self, note: Note) -> Optional[int]:
+        """The earlier note `note` duplicates, or None if it is to be classified itself"""
+        if self.index is not None and self.index.match(note) is not None:
+            return None
+        self.seen += 1
+        key = exact_key(note)
+        representative = self._groups.get(key)
+        if representative is not None:
+            self.exact += 1
+            return representative
+        note_signature = signature(note)
+        representative = self._index.query(note_signature)
+        if representative is None:
+            self._groups[key] = note.id
+            self._index.add(note.id, note_signature)
+            self._classifications[note.id] = None
+            return None
+        self.near += 1
+        # later exact duplicates of this note join the same group directly
+        self._groups[key] = representative
+        return representative
+
+    def record(self, classification: Classification) -> None:
+        """Keep the classification of the first note of a group for its duplicates"""
+        if classification.note_id in self._classifications:
+            self._classifications[classification.note_id] = classification
+
+    def copy(self, note: Note, representative: int) -> Classification:
+        """The classification recorded for `representative`, given to `note`"""
+        result = self._classifications[representative]
+        if result is None:
+            raise ValueError(f"note {representative} has not been classified yet")
+        return Classification(
+            note_id=note.id,
+            template=result.template,
+            confidence=result.confidence,
+            duplicate_of=representative,
+        )
+
+
+async def classify_notes(
+    notes: Iterable[Note],
+    classify: Callable[[Note], Awaitable[Classification]],
+    *,
+    max_in_flight: int,
+    deduplicator: Optional[Deduplicator] = None,
+) -> AsyncIterator[tuple[Note, Classification]]:
+    """
+    Each of `notes` with its classification, in order, classifying up to
+    `max_in_flight` at a time with `ordered_map`.
+
+    With a `deduplicator`, duplicates never take a place in the window:
+    they wait outside it, behind the note classified before them, and get
+    their copy once that note's classification is out.
+    """
+    if deduplicator is None:
+
+        async def classify_one(note: Note) -> tuple[Note, Classification]:
+            return note, await classify(note)
+
+        async for result in ordered_map(notes, classify_one, max_in_flight=max_in_flight):
+            yield result
+        return
+
+    def groups() -> Iterator[tuple[Note, list[tuple[Note, int]]]]:
+        # each note to classify, with the duplicates that follow it in the
+        # deck, of it or of any note before it; the first note of the deck
+        # is never a duplicate, so there is always one to follow
+        first: Optional[Note] = None
+        duplicates: list[tuple[Note, int]] = []
+        for note in notes:
+            representative = deduplicator.representative(note)
+            if representative is not None:
+                duplicates.append((note, representative))
+                continue
+            if first is not None:
+                yield first, duplicates
+            first, duplicates = note, []
+        if first is not None:
+            yield first, duplicates
+
+    async def classify_group(
+        group: tuple[Note, list[tuple[Note, int]]],
+    ) -> tuple[Note, list[tuple[Note, int]], Classification]:
+        return group[0], group[1], await classify(group[0])
+
+    async for note, duplicates, classification in ordered_map(
+        groups(), classify_group, max_in_flight=max_in_flight
+    ):
+        deduplicator.record(classification)
+        yield note, classification
+        for duplicate, representative in duplicates:
+            yield duplicate, deduplicator.copy(duplicate, representative)
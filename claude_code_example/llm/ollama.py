@@ -0,0 +1,78 @@
+from types import TracebackType
+from typing import Optional
+
+import httpx
+
+from claude_code_example.logging.spans import SpanRecorder
+
+
+class LLMError(Exception):
+    """Raised when the model endpoint cannot be reached or returns garbage"""
+
+
+class OllamaClient:
+    """
+    Minimal async client for the Ollama `/api/generate` endpoint.
+
+    Use as an async context manager so the underlying connection pool is
+    closed when done:
+
+    ```python
+    async with OllamaClient(base_url="http://localhost:11434", model="mistral") as client:
+        answer = await client.generate("Say hi as JSON")
+    ```
+
+    When `spans` is given, every request is timed as its `llm` stage.
+    """
+
+    def __init__(
+        self,
+        *,
+        base_url: str,
+        model: str,
+        timeout: float = 120.0,
+        max_connections: int = 10,
+        spans: Optional[SpanRecorder] = None,
+    ) -> None:
+        self.model = model
+        self.spans = spans or SpanRecorder()
+        self._client = httpx.AsyncClient(
+            base_url=base_url,
+            timeout=timeout,
+            limits=httpx.Limits(
+                max_connections=max_connections, max_keepalive_connections=max_connections
+            ),
+        )
+
+    async def __aenter__(self) -> "OllamaClient":
+        return self
+
+    async def __aexit__(
+        self,
+        exc_type: Optional[type[BaseException]],
+        exc: Optional[BaseException],
+        traceback: Optional[TracebackType],
+    ) -> None:
+        await self.aclose()
+
+    async def aclose(self) -> None:
+        await self._client.aclose()
+
+    async def generate(self, prompt: str) -> str:
+        """Send `prompt` to the model and return its (JSON formatted) answer"""
+        try:
+            with self.spans.span("llm"):
+                response = await self._client.post(
+                    "/api/generate",
+                    json={
+                        "model": self.model,
+                        "prompt": prompt,
+                        "stream": False,
+                        "format": "json",
+                        "options": {"temperature": 0},
+                    },
+                )
+            response.raise_for_status()
+            return str(response.json()["response"])
+        except (httpx.HTTPError, ValueError, KeyError) as e:
+            raise LLMError(f"Request to {self.model} failed: {e}") from e
@@ -0,0 +1,50 @@
+import asyncio
+from collections import deque
+from typing import AsyncIterator, Awaitable, Callable, Iterable, TypeVar
+
+T = TypeVar("T")
+R = TypeVar("R")
+
+
+async def ordered_map(
+    items: Iterable[T],
+    func: Callable[[T], Awaitable[R]],
+    *,
+    max_in_flight: int,
+) -> AsyncIterator[R]:
+    """
+    Run `func` over `items` concurrently, yielding results in input order.
+
+    At most `max_in_flight` calls are pending at any time, and the next
+    item is only pulled from `items` once there is room in the window, so
+    a slow consumer or a slow model holds back the reader instead of the
+    whole deck piling up in memory.
+
+    Parameters
+    ----------
+    items : Iterable[T]
+        The inputs, typically a note stream from `iter_notes`.
+    func : Callable[[T], Awaitable[R]]
+        The coroutine function to run on each input.
+    max_in_flight : int
+        The size of the window of concurrent calls.
+
+    Yields
+    ------
+    R
+        The result of `func` for each input, in the same order as `items`.
+    """
+    if max_in_flight < 1:
+        raise ValueError("max_in_flight must be at least 1")
+
+    pending: deque[asyncio.Task[R]] = deque()
+    try:
+        for item in items:
+            pending.append(asyncio.ensure_future(func(item)))
+            if len(pending) >= max_in_flight:
+                yield await pending.popleft()
+        while pending:
+            yield await pending.popleft()
+    finally:
+        for task in pending:
+            task.cancel()
@@ -1,10 +1,128 @@
+"""
+Non-blocking application logging.
+
+The application logger has a single `QueueHandler`: logging a record only
+puts it on a queue, and a `QueueListener` thread formats and writes it to
+stderr and, optionally, to a JSON lines file. Stdout is left to the data
+commands write there, such as TSV. Setting the logger up again with the
+same sinks reuses the handler and listener already in place, so repeated
+`AppContext`s never duplicate log lines.
+
+Worker processes set up no sinks of their own: `worker_logs` gives them a
+process-safe queue, `log_to_parent` sends their records to it, and the
+parent hands each one on to its app logger, whose listener writes it
+alongside its own.
+"""
+
+import atexit
+import json
 import logging
+import multiprocessing
+import os
+import queue
 import sys
-from typing import Optional
+from contextlib import contextmanager
+from logging.handlers import QueueHandler, QueueListener
+from multiprocessing.queues import Queue
+from pathlib import Path
+from typing import Iterator, Optional
+
+TEXT_FORMAT = "%(asctime)s [%(levelname)8.8s] %(message)s"
+# attributes every LogRecord has; anything else was passed in `extra`
+_RECORD_ATTRIBUTES = set(vars(logging.makeLogRecord({}))) | {"message", "asctime"}
+
+
+class _StderrHandler(logging.StreamHandler):  # type: ignore[type-arg]
+    """Writes to whatever `sys.stderr` is at the time, e.g. when redirected in tests"""
+
+    def emit(self, record: logging.LogRecord) -> None:
+        self.stream = sys.stderr
+        super().emit(record)
+
+
+class JsonFormatter(logging.Formatter):
+    """One JSON object per record, with any `extra` fields alongside the message"""
+
+    def format(self, record: logging.LogRecord) -> str:
+        entry = {
+            "time": record.created,
+            "level": record.levelname,
+            "logger": record.name,
+            "message": record.getMessage(),
+        }
+        entry.update(
+            (key, value) for key, value in vars(record).items() if key not in _RECORD_ATTRIBUTES
+        )
+        if record.exc_info:
+            entry["exception"] = self.formatException(record.exc_info)
+        return json.dumps(entry, ensure_ascii=False, default=str)
+
+
+class _AppQueueHandler(QueueHandler):
+    """The queue handler `setup_logger` installs, and the sinks it was set up with"""
+
+    def __init__(self, json_path: Optional[Path]) -> None:
+        super().__init__(queue.Queue())
+        self.json_path = json_path
+        # a forked worker inherits the handler but not the listener's thread
+        self.pid = os.getpid()
+        handlers: list[logging.Handler] = [_StderrHandler()]
+        handlers[0].setFormatter(logging.Formatter(TEXT_FORMAT))
+        if json_path is not None:
+            json_path.parent.mkdir(parents=True, exist_ok=True)
+            json_handler = logging.FileHandler(json_path, encoding="utf-8")
+            json_handler.setFormatter(JsonFormatter())
+            handlers.append(json_handler)
+        self.listener = QueueListener(self.queue, *handlers, respect_handler_level=True)
+        self.listener.start()
+        self.listening = True
+
+    def prepare(self, record: logging.LogRecord) -> logging.LogRecord:
+        # keep the record as is; the listener's handlers do all the formatting
+        return record
+
+    def flush(self) -> None:
+        """Wait until every queued record has been written"""
+        self.queue.join()  # type: ignore[attr-defined]
+        for handler in self.listener.handlers:
+            handler.flush()
+
+    def close(self) -> None:
+        # called both by `_stop_listeners` and by logging's own shutdown
+        if self.listening:
+            self.listening = False
+            self.listener.stop()
+            for handler in self.listener.handlers:
+                handler.close()
+        super().close()
+
+
+def _app_handler(logger: logging.Logger) -> Optional[_AppQueueHandler]:
+    return next((h for h in logger.handlers if isinstance(h, _AppQueueHandler)), None)
+
+
+def flush_logs(logger: logging.Logger) -> None:
+    """Block until everything `logger` has been asked to log is written"""
+    handler = _app_handler(logger)
+    if handler is not None:
+        handler.flush()
+
+
+@atexit.register
+def _stop_listeners() -> None:
+    for logger in list(logging.Logger.manager.loggerDict.values()):
+        if isinstance(logger, logging.Logger):
+            handler = _app_handler(logger)
+            if handler is not None and handler.pid == os.getpid():
+                handler.close()
 
 
 def setup_logger(
-    *, app_name: str, log_level: str, bind_to: Optional[logging.Logger] = None
+    *,
+    app_name: str,
+    log_level: str,
+    bind_to: Optional[logging.Logger] = None,
+    json_path: Optional[Path] = None,
 ) -> logging.Logger:
     """
     Set up a logger with the specified application name and log level.
@@ -24,6 +142,9 @@ def setup_logger(
 
         setup_logger(app_name="my_app", log_level="info", bind_to=fastapi_logger)
         ```
+    json_path : Optional[Path], optional
+        Also write every record as a JSON line to this file, by default
+        None.
 
     Returns
     -------
@@ -34,13 +155,61 @@ def setup_logger(
     normalised_log_level = getattr(logging, log_level.upper()) or logging.INFO
     logger.setLevel(normalised_log_level)
 
-    console_handler = logging.StreamHandler(sys.stdout)
-    formatter = logging.Formatter("%(asctime)s [%(levelname)8.8s] %(message)s")
-    console_handler.setFormatter(formatter)
-    logger.addHandler(console_handler)
+    handler = _app_handler(logger)
+    if handler is None or handler.json_path != json_path:
+        if handler is not None:
+            logger.removeHandler(handler)
+            handler.close()
+        logger.addHandler(_AppQueueHandler(json_path))
 
     if bind_to:
         bind_to.handlers = logger.handlers
         bind_to.setLevel(log_level)
 
     return logger
+
+
+class _ToLogger(logging.Handler):
+    """Hands records on to `logger`, as if they had been logged with it"""
+
+    def __init__(self, logger: logging.Logger) -> None:
+        super().__init__()
+        self.logger = logger
+
+    def emit(self, record: logging.LogRecord) -> None:
+        self.logger.handle(record)
+
+
+@contextmanager
+def worker_logs(app_name: str) -> "Iterator[Queue[logging.LogRecord]]":
+    """
+    A queue for worker processes to log to with `log_to_parent`.
+
+    Until the block exits, a thread hands what the workers put on it to the
+    app logger, so their records are written by the same listener and to
+    the same sinks as the parent's. Exit it once the workers have exited.
+    """
+    log_queue: "Queue[logging.LogRecord]" = multiprocessing.Queue()
+    forwarder = QueueListener(log_queue, _ToLogger(logging.getLogger(app_name)))
+    forwarder.start()
+    try:
+        yield log_queue
+    finally:
+        forwarder.stop()
+        log_queue.close()
+
+
+def log_to_parent(
+    *, app_name: str, log_level: str, log_queue: "Queue[logging.LogRecord]"
+) -> logging.Logger:
+    """
+    The app logger of a worker process, putting every record on `log_queue`.
+
+    A forked worker inherits the parent's handlers but not the thread
+    writing them out. They are dropped, not closed, as their sinks belong
+    to the parent.
+    """
+    logger = logging.getLogger(app_name)
+    logger.setLevel(getattr(logging, log_level.upper()))
+    logger.handlers = [QueueHandler(log_queue)]
+    return logger
@@ -0,0 +1,97 @@
+"""
+Timing spans for the stages of a conversion.
+
+Wrap a stage in `recorder.span("classify")`, as a context manager or a
+decorator, to add its wall time to that stage's total. Recording is a
+couple of `perf_counter` calls and a list append; nothing is logged per
+span, so timing a hot loop does not slow it down. `log_summary` logs one
+line per stage at the end of a run.
+"""
+
+import logging
+import time
+from contextlib import ContextDecorator
+from dataclasses import dataclass, field
+from typing import Any
+
+# the stages of a conversion, in the order they happen
+STAGES = ("read", "classify", "transform", "write")
+
+
+@dataclass(slots=True)
+class StageTimes:
+    """Every duration recorded for a stage, in seconds"""
+
+    durations: list[float] = field(default_factory=list)
+
+    @property
+    def count(self) -> int:
+        return len(self.durations)
+
+    @property
+    def total(self) -> float:
+        return sum(self.durations)
+
+    @property
+    def mean(self) -> float:
+        return self.total / self.count if self.durations else 0.0
+
+
+class Span(ContextDecorator):
+    """Times one stage, see `SpanRecorder.span`"""
+
+    def __init__(self, recorder: "SpanRecorder", stage: str) -> None:
+        self.recorder = recorder
+        self.stage = stage
+        self._started = 0.0
+
+    def _recreate_cm(self) -> "Span":
+        # every decorated call gets its own span, so overlapping calls time correctly
+        return Span(self.recorder, self.stage)
+
+    def __enter__(self) -> "Span":
+        self._started = time.perf_counter()
+        return self
+
+    def __exit__(self, *exc_info: object) -> None:
+        self.recorder.add(self.stage, time.perf_counter() - self._started)
+
+
+class SpanRecorder:
+    """Collects the time spent in each stage of a run"""
+
+    def __init__(self) -> None:
+        self.stages: dict[str, StageTimes] = {}
+
+    def span(self, stage: str) -> Span:
+        """
+        Time `stage`, as a context manager or as a decorator of plain
+        functions; in async code, use `with` around the `await`.
+        """
+        return Span(self, stage)
+
+    def add(self, stage: str, seconds: float) -> None:
+        times = self.stages.get(stage)
+        if times is None:
+            times = self.stages[stage] = StageTimes()
+        times.durations.append(seconds)
+
+    def log_summary(self, logger: logging.Logger, level: int = logging.INFO) -> None:
+        """Log the count, total and mean time of every stage, with `extra` for JSON logs"""
+        ordered = sorted(
+            self.stages.items(),
+            key=lambda item: STAGES.index(item[0]) if item[0] in STAGES else len(STAGES),
+        )
+        for stage, times in ordered:
+            extra: dict[str, Any] = {
+                "span": stage,
+                "count": times.count,
+                "total_ms": round(times.total * 1000, 3),
+                "mean_ms": round(times.mean * 1000, 3),
+            }
+            logger.log(
+                level,
+                f"{stage}: {times.count} in {extra['total_ms']:.1f}ms "
+                f"({extra['mean_ms']:.3f}ms each)",
+                extra=extra,
+            )
@@ -0,0 +1,47 @@
+"""
+The `--profile` option of the CLI.
+
+The whole command runs under `cProfile`; when it is done, the profile is
+dumped next to the metrics report as `<report>.prof`, readable by `stats`,
+`pstats` or snakeviz. Worker processes started with `--workers` are not
+profiled, only the parent that feeds them.
+"""
+
+import cProfile
+import time
+from pathlib import Path
+from typing import Callable
+
+from claude_code_example.app_context import AppContext
+from claude_code_example.metrics.report import MetricsReport
+
+
+def profile_path(report_path: Path) -> Path:
+    """Where the cProfile stats of the report at `report_path` are kept"""
+    return report_path.with_name(f"{report_path.name}.prof")
+
+
+def start_profiling(app_context: AppContext, report_path: Path) -> Callable[[str], None]:
+    """
+    Start profiling; call the function returned with the command that ran,
+    e.g. "convert cloze", when it is done to save the profile and the
+    metrics report.
+    """
+    profiler = cProfile.Profile()
+    started = time.perf_counter()
+    profiler.enable()
+
+    def finish(command: str) -> None:
+        profiler.disable()
+        elapsed = time.perf_counter() - started
+        report = MetricsReport.collect(
+            command=command,
+            elapsed=elapsed,
+            counters=app_context.counters,
+            cache_stats=app_context.cache_stats,
+            spans=app_context.spans,
+        )
+        report.save(report_path)
+        profiler.dump_stats(profile_path(report_path))
+
+    return finish
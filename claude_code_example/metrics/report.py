@@ -0,0 +1,118 @@
+"""
+What a profiled command did, and how fast.
+
+`RunCounters` is filled in by commands as they go: notes processed and
+bytes written. At the end of a `--profile` run, `MetricsReport.collect`
+puts those together with the context's cache counters and timing spans,
+and the report is saved as JSON for `stats` to render.
+"""
+
+import json
+import math
+from dataclasses import asdict, dataclass, field
+from pathlib import Path
+from typing import Any, Sequence
+
+from claude_code_example.cache.result_cache import CacheStats
+from claude_code_example.logging.spans import SpanRecorder
+from claude_code_example.metrics.resources import peak_rss_bytes
+
+# the span recorded around every request to the model
+LLM_STAGE = "llm"
+PERCENTILES = (50, 95, 99)
+
+
+@dataclass(slots=True)
+class RunCounters:
+    """Counted by commands, shared through AppContext"""
+
+    cards: int = 0
+    bytes_written: int = 0
+
+
+def percentile(values: Sequence[float], q: float) -> float:
+    """The `q`th percentile of `values`, nearest rank; 0.0 when there are none"""
+    if not values:
+        return 0.0
+    ordered = sorted(values)
+    rank = max(math.ceil(q / 100 * len(ordered)), 1)
+    return ordered[rank - 1]
+
+
+@dataclass(slots=True)
+class MetricsReport:
+    command: str
+    elapsed: float
+    cards: int = 0
+    bytes_written: int = 0
+    cache_hits: int = 0
+    cache_misses: int = 0
+    peak_rss_bytes: int = 0
+    # "p50", "p95" and "p99" of the model's latency, in milliseconds
+    llm_latency_ms: dict[str, float] = field(default_factory=dict)
+    llm_requests: int = 0
+    # count, total_ms and mean_ms of every timed stage
+    stages: dict[str, dict[str, float]] = field(default_factory=dict)
+
+    @property
+    def cards_per_sec(self) -> float:
+        return self.cards / self.elapsed if self.elapsed else 0.0
+
+    @property
+    def cache_hit_rate(self) -> float:
+        lookups = self.cache_hits + self.cache_misses
+        return self.cache_hits / lookups if lookups else 0.0
+
+    @classmethod
+    def collect(
+        cls,
+        *,
+        command: str,
+        elapsed: float,
+        counters: RunCounters,
+        cache_stats: CacheStats,
+        spans: SpanRecorder,
+    ) -> "MetricsReport":
+        llm = spans.stages.get(LLM_STAGE)
+        latencies = llm.durations if llm is not None else []
+        return cls(
+            command=command,
+            elapsed=elapsed,
+            cards=counters.cards,
+            bytes_written=counters.bytes_written,
+            cache_hits=cache_stats.hits,
+            cache_misses=cache_stats.misses,
+            peak_rss_bytes=peak_rss_bytes(),
+            llm_latency_ms={
+                f"p{q}": round(percentile(latencies, q) * 1000, 3) for q in PERCENTILES
+            },
+            llm_requests=len(latencies),
+            stages={
+                stage: {
+                    "count": times.count,
+                    "total_ms": round(times.total * 1000, 3),
+                    "mean_ms": round(times.mean * 1000, 3),
+                }
+                for stage, times in spans.stages.items()
+            },
+        )
+
+    def to_dict(self) -> dict[str, Any]:
+        return {
+            **asdict(self),
+            "cards_per_sec": self.cards_per_sec,
+            "cache_hit_rate": self.cache_hit_rate,
+        }
+
+    @classmethod
+    def from_dict(cls, data: dict[str, Any]) -> "MetricsReport":
+        fields = set(cls.__dataclass_fields__)
+        return cls(**{key: value for key, value in data.items() if key in fields})
+
+    def save(self, path: Path) -> None:
+        path.parent.mkdir(parents=True, exist_ok=True)
+        path.write_text(json.dumps(self.to_dict(), indent=2) + "\n", encoding="utf-8")
+
+    @classmethod
+    def load(cls, path: Path) -> "MetricsReport":
+        return cls.from_dict(json.loads(path.read_text(encoding="utf-8")))
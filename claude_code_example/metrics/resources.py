@@ -0,0 +1,12 @@
+import resource
+import sys
+
+
+def peak_rss_bytes() -> int:
+    """
+    Return the peak resident set size of the current process in bytes.
+
+    `ru_maxrss` is reported in kilobytes on Linux and in bytes on macOS.
+    """
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    return peak if sys.platform == "darwin" else peak * 1024
@@ -0,0 +1,101 @@
+import zipfile
+from pathlib import Path
+
+import pytest
+
+from claude_code_example.anki.apkg import (
+    ApkgError,
+    iter_note_batches,
+    iter_note_columns,
+    iter_notes,
+)
+from tests.fakes.apkg import FSI_DECK_NAME, FSI_NOTES, build_apkg
+
+
+def test_iter_notes(fsi_apkg: Path) -> None:
+    """Notes are read in id order with their type, deck, fields and tags"""
+    notes = list(iter_notes(fsi_apkg))
+
+    assert [note.fields for note in notes] == FSI_NOTES
+    assert notes[0].id < notes[1].id < notes[2].id
+    assert notes[0].note_type == "FSI German Drills"
+    assert notes[0].deck == FSI_DECK_NAME
+    assert notes[0].tags == ("fsi",)
+    assert notes[1].field("Prompt2") == "D- Flughafen"
+    assert notes[1].field("Missing") == ""
+
+
+def test_iter_note_batches(tmp_path: Path) -> None:
+    """Notes come out in batches of at most batch_size"""
+    apkg = build_apkg(tmp_path / "deck.apkg", [("a", "b", "c")] * 7)
+
+    sizes = [len(batch) for batch in iter_note_batches(apkg, batch_size=3)]
+
+    assert sizes == [3, 3, 1]
+
+
+def test_iter_note_columns(fsi_apkg: Path) -> None:
+    """Column batches hold the same notes, sharing tag tuples"""
+    (columns,) = iter_note_columns(fsi_apkg)
+
+    assert list(columns) == list(iter_notes(fsi_apkg))
+    assert columns.tag_sets == [("fsi",)]
+    assert columns[0].tags is columns[2].tags
+
+
+def test_iter_note_batches_invalid_batch_size(fsi_apkg: Path) -> None:
+    """A batch size below one is rejected"""
+    with pytest.raises(ValueError):
+        next(iter_note_batches(fsi_apkg, batch_size=0))
+
+
+def test_reads_anki21_member(tmp_path: Path) -> None:
+    """collection.anki21 is read when present"""
+    apkg = build_apkg(tmp_path / "deck.apkg", [("a", "b", "c")], member="collection.anki21")
+
+    assert [note.fields for note in iter_notes(apkg)] == [("a", "b", "c")]
+
+
+def test_not_a_zip(tmp_path: Path) -> None:
+    """Files that are not zip archives raise ApkgError"""
+    path = tmp_path / "broken.apkg"
+    path.write_text("not a zip")
+
+    with pytest.raises(ApkgError, match="not a valid .apkg"):
+        list(iter_notes(path))
+
+
+def test_no_legacy_collection(tmp_path: Path) -> None:
+    """Archives without a legacy collection raise ApkgError"""
+    path = tmp_path / "new.apkg"
+    with zipfile.ZipFile(path, "w") as archive:
+        archive.writestr("collection.anki21b", b"zstd")
+
+    with pytest.raises(ApkgError, match="Support older Anki versions"):
+        list(iter_notes(path))
+
+
+def test_placeholder_collection(tmp_path: Path) -> None:
+    """The placeholder collection.anki2 next to collection.anki21b is not read"""
+    path = build_apkg(tmp_path / "new.apkg", [("Please update to the latest Anki version", "", "")])
+    with zipfile.ZipFile(path, "a") as archive:
+        archive.writestr("collection.anki21b", b"zstd")
+
+    with pytest.raises(ApkgError, match="Support older Anki versions"):
+        list(iter_notes(path))
+
+
+def test_unreadable_collection(tmp_path: Path) -> None:
+    """A collection member that is not SQLite raises ApkgError"""
+    path = tmp_path / "garbage.apkg"
+    with zipfile.ZipFile(path, "w") as archive:
+        archive.writestr("collection.anki2", b"garbage" * 100)
+
+    with pytest.raises(ApkgError, match="readable collection"):
+        list(iter_notes(path))
+
+
+def test_iter_notes_after_id(fsi_apkg: Path) -> None:
+    """Reading resumes after the given note id"""
+    assert [note.id for note in iter_notes(fsi_apkg, after_id=1)] == [2, 3]
+    assert list(iter_notes(fsi_apkg, after_id=3)) == []
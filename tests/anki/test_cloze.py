@@ -0,0 +1,104 @@
+from typing import Optional
+
+import pytest
+
+from claude_code_example.anki.cloze import (
+    clean,
+    cloze_text,
+    rewrite_batch,
+    transform_columns,
+    transform_group,
+)
+from claude_code_example.anki.fingerprint import FingerprintIndex
+from claude_code_example.anki.models import Note
+from claude_code_example.anki.templates import Template, TemplateLibrary
+from tests.fakes.deck import FSI_TEMPLATES, fsi_notes
+
+
+def test_clean() -> None:
+    """Markup and extra whitespace are removed"""
+    assert clean(" <u>Der&nbsp;Flughafen</u>\xa0 ist <b>dort</b>. ") == "Der Flughafen ist dort."
+
+
+@pytest.mark.parametrize(
+    "prompt, hint, answer, expected",
+    [
+        (
+            "Er hat _____.",
+            "Füller; ein- neu- amerikansich-",
+            "Er hat _einen_neuen_amerikanischen_Füller_.",
+            "Er hat {{c1::einen neuen amerikanischen Füller::Füller; ein- neu- amerikansich-}}.",
+        ),
+        (
+            "<u>_____</u> <u>ist</u> dort.",
+            "D- Flughafen",
+            "<u>Der Flughafen</u> <u>ist</u> dort.",
+            "{{c1::Der Flughafen::D- Flughafen}} ist dort.",
+        ),
+        ("Wo ist _____", "", "Wo ist der Bahnhof", "Wo ist {{c1::der Bahnhof}}"),
+        (
+            "_____ hat _____ gekauft.",
+            "er; ein Hund",
+            "Er hat einen Hund gekauft.",
+            "{{c1::Er::er; ein Hund}} hat {{c1::einen Hund}} gekauft.",
+        ),
+        ("Er hat einen Hund.", "", "Er hat einen Hund.", None),
+        ("Er hat _____.", "", "Sie hat einen Hund.", None),
+        ("Er hat _____.", "", "Er hat einen Hund!", None),
+        ("Er hat _____.", "", "Er hat.", None),
+        ("_____ und _____.", "", "Er hat.", None),
+        ("Er hat _____.", "", "Er hat ___.", None),
+    ],
+)
+def test_cloze_text(prompt: str, hint: str, answer: str, expected: Optional[str]) -> None:
+    """Blanks are filled from the answer, anything that does not line up is rejected"""
+    assert cloze_text(prompt, hint, answer) == expected
+
+
+def test_transform_columns() -> None:
+    """Columns are rewritten in order"""
+    assert transform_columns(["A _____", "B"], ["", ""], ["A x", "B"]) == ["A {{c1::x}}", None]
+
+
+def test_transform_group() -> None:
+    """Fields are picked by the template's cloze mapping, whatever the note layout"""
+    template = Template(name="t", description="", cloze={"prompt": "Q", "hint": "H", "answer": "A"})
+    notes = [
+        Note(1, "", "", ("Q", "H", "A"), ("Er hat _____.", "", "Er hat Zeit.")),
+        Note(2, "", "", ("A", "Q", "H"), ("Er ist da.", "Er ist _____.", "")),
+        Note(3, "", "", ("Front", "Back"), ("Er hat _____.", "Er hat Zeit.")),
+        Note(4, "", "", ("Q", "H", "A"), ("Er hat _____.",)),
+    ]
+
+    assert transform_group(template, notes) == [
+        "Er hat {{c1::Zeit}}.",
+        "Er ist {{c1::da}}.",
+        None,
+        None,
+    ]
+
+
+def test_transform_group_without_mapping() -> None:
+    """Templates without a cloze mapping rewrite nothing"""
+    notes = fsi_notes(3, ambiguous_ratio=0)
+
+    assert transform_group(Template(name="t", description=""), notes) == [None] * 3
+
+
+def test_rewrite_batch() -> None:
+    """Fingerprinted notes are rewritten, the rest are left as None"""
+    library = TemplateLibrary(
+        [*FSI_TEMPLATES, Template(name="orphan", description="", fingerprint={"Prompt1": "^$"})]
+    )
+    index = FingerprintIndex(library)
+    notes = fsi_notes(100, ambiguous_ratio=0.2)
+    library = TemplateLibrary(FSI_TEMPLATES)
+
+    texts = rewrite_batch(notes, index, library)
+
+    assert len(texts) == 100
+    for note, text in zip(notes, texts):
+        if note.fields[1]:
+            assert text is not None and "{{c1::" in text
+        else:
+            assert text is None
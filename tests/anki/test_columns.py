@@ -0,0 +1,44 @@
+import pickle
+
+from claude_code_example.anki.columns import NoteColumns
+from claude_code_example.anki.models import Note
+from tests.fakes.deck import fsi_notes
+
+OTHER = Note(
+    id=99,
+    note_type="Basic",
+    deck="Other",
+    field_names=("Front", "Back"),
+    fields=("", "Haus"),
+    tags=("a", "b"),
+)
+
+
+def test_round_trip() -> None:
+    """Notes come back out of their columns as they went in"""
+    notes = [*fsi_notes(5), OTHER]
+
+    columns = NoteColumns.from_notes(notes)
+
+    assert len(columns) == 6
+    assert list(columns) == notes
+    assert columns[5] == OTHER
+    assert columns[-1] == OTHER
+    assert columns[1:3] == notes[1:3]
+    assert len(columns.layouts) == 2
+    assert len(columns.decks) == 2
+
+
+def test_pickle() -> None:
+    """Columns survive the trip to a worker process"""
+    columns = NoteColumns.from_notes(fsi_notes(10))
+
+    assert list(pickle.loads(pickle.dumps(columns))) == list(columns)
+
+
+def test_nbytes() -> None:
+    """Shared values are only counted once"""
+    small = NoteColumns.from_notes(fsi_notes(10))
+    large = NoteColumns.from_notes(fsi_notes(1000))
+
+    assert 0 < small.nbytes < large.nbytes < 1000 * 200
@@ -0,0 +1,63 @@
+from claude_code_example.anki.fingerprint import FingerprintIndex
+from claude_code_example.anki.models import Note
+from claude_code_example.anki.templates import Template
+from tests.fakes.deck import FSI_TEMPLATES, fsi_notes
+
+FIELDS = ("Prompt1", "Prompt2", "Answer")
+
+
+def _note(*fields: str, field_names: tuple[str, ...] = FIELDS) -> Note:
+    return Note(id=1, note_type="", deck="", field_names=field_names, fields=fields)
+
+
+def test_match() -> None:
+    """Notes matching exactly one fingerprint are resolved"""
+    index = FingerprintIndex(FSI_TEMPLATES)
+
+    assert len(index) == 2
+    assert index.match(_note("<u>_____</u> ist dort.", "D- Flughafen", "")) == "article-hint"
+    assert index.match(_note("Er hat _____.", "Füller; ein-", "")) == "blank-with-hint"
+    assert index.match(_note("The airport is there.", "", "")) is None
+
+
+def test_ambiguous_match() -> None:
+    """Notes matching several fingerprints are left for the LLM"""
+    index = FingerprintIndex(FSI_TEMPLATES)
+
+    assert index.match(_note("Er hat _____.", "D- Füller; ein-", "")) is None
+
+
+def test_layouts() -> None:
+    """Fingerprints only apply to notes that have all their fields"""
+    index = FingerprintIndex(FSI_TEMPLATES)
+
+    assert index.match(_note("_____", field_names=("Prompt1",))) is None
+    assert index.match(_note("_____", field_names=("Prompt1", "Prompt2"))) is None
+
+
+def test_incremental_add_and_replace() -> None:
+    """Adding or replacing a template updates layouts that were already seen"""
+    index = FingerprintIndex([Template(name="unfingerprinted", description="")])
+    note = _note("Wo ist der Bahnhof?", "", "")
+    assert len(index) == 0
+    assert index.match(note) is None
+
+    index.add(Template(name="question", description="", fingerprint={"Prompt1": r"\?$"}))
+    assert index.match(note) == "question"
+
+    index.add(Template(name="question", description="", fingerprint={"Prompt1": r"^Wer"}))
+    assert index.match(note) is None
+
+    index.remove("question")
+    index.remove("question")
+    assert len(index) == 0
+
+
+def test_synthetic_deck() -> None:
+    """Every synthetic FSI note, apart from the translations, is resolved"""
+    index = FingerprintIndex(FSI_TEMPLATES)
+    notes = fsi_notes(200, ambiguous_ratio=0.2)
+
+    resolved = [note for note in notes if index.match(note) is not None]
+
+    assert len(resolved) == sum(1 for note in notes if note.fields[1])
@@ -0,0 +1,40 @@
+from pathlib import Path
+
+from claude_code_example.anki.templates import Template, TemplateLibrary
+
+BLANK = Template(
+    name="blank-with-hint",
+    description="Sentence with a _____ blank, hint in Prompt2",
+    fingerprint={"Prompt1": "_{3,}"},
+)
+
+
+def test_load_missing_file(tmp_path: Path) -> None:
+    """A missing library file is an empty library"""
+    assert len(TemplateLibrary.load(tmp_path / "templates.json")) == 0
+
+
+def test_save_and_load(tmp_path: Path) -> None:
+    """Templates survive a round trip through the JSON file"""
+    path = tmp_path / "templates.json"
+    TemplateLibrary([BLANK]).save(path)
+
+    library = TemplateLibrary.load(path)
+
+    assert list(library) == [BLANK]
+    assert "blank-with-hint" in library
+    assert library.get("blank-with-hint") == BLANK
+    assert library.get("other") is None
+
+
+def test_version_changes_with_templates() -> None:
+    """The library version changes when a template is added or edited"""
+    library = TemplateLibrary([BLANK])
+    version = library.version
+
+    library.add(Template(name="blank-with-hint", description="edited"))
+    edited = library.version
+    library.add(Template(name="other", description=""))
+
+    assert len({version, edited, library.version}) == 3
+    assert TemplateLibrary([BLANK]).version == version
@@ -0,0 +1,55 @@
+from pathlib import Path
+
+from claude_code_example.anki.tsv import HEADER, TsvWriter, escape_field, format_row, shard_path
+
+
+def test_escape_field() -> None:
+    """Line breaks, tabs and quotes are escaped as HTML, exactly once"""
+    value = 'Er sagt: "Hallo"\r\nWie\tgeht\'s?\n'
+    escaped = escape_field(value)
+
+    assert escaped == "Er sagt: &quot;Hallo&quot;<br>Wie&#9;geht's?<br>"
+    assert escape_field(escaped) == escaped
+    assert format_row(["a\tb", "", "fsi"]) == "a&#9;b\t\tfsi\n"
+
+
+def test_shard_path() -> None:
+    """Shard files sit next to the output, named after the shard"""
+    path = Path("out/cloze.tsv")
+
+    assert shard_path(path, "") == path
+    assert shard_path(path, "German::Lesson 1") == Path("out/cloze.German_Lesson_1.tsv")
+    assert shard_path(path, "???") == Path("out/cloze.default.tsv")
+
+
+def test_writer_buffers_and_shards(tmp_path: Path) -> None:
+    """Rows are written in chunks, one file per shard, each with Anki's header"""
+    path = tmp_path / "cloze.tsv"
+    with TsvWriter(path, chunk_size=64) as writer:
+        writer.write(["one", ""])
+        assert not path.exists()
+        writer.write(["two", ""], "a")
+        writer.write(["three" * 20, ""], "b")
+        assert path.exists()
+        writer.write(["four", ""])
+
+    assert path.read_text(encoding="utf-8") == HEADER + "one\t\nfour\t\n"
+    assert (tmp_path / "cloze.a.tsv").read_text(encoding="utf-8") == HEADER + "two\t\n"
+    assert writer.rows == 4
+
+
+def test_writer_restore(tmp_path: Path) -> None:
+    """Synced offsets roll files back, files created since start over"""
+    path = tmp_path / "cloze.tsv"
+    with TsvWriter(path) as writer:
+        writer.write(["kept", ""])
+        offsets = writer.sync()
+        writer.write(["dropped", ""])
+        writer.write(["dropped", ""], "late")
+
+    with TsvWriter(path, offsets=offsets) as writer:
+        writer.write(["new", ""])
+        writer.write(["new", ""], "late")
+
+    assert path.read_text(encoding="utf-8") == HEADER + "kept\t\nnew\t\n"
+    assert (tmp_path / "cloze.late.tsv").read_text(encoding="utf-8") == HEADER + "new\t\n"
@@ -0,0 +1 @@
+"""Performance benchmarks, run with pytest-benchmark."""
@@ -0,0 +1,22 @@
+from pathlib import Path
+
+import pytest
+from pytest_benchmark.fixture import BenchmarkFixture
+
+from claude_code_example.anki.apkg import iter_notes
+from tests.fakes.deck import FSI_DECK_SIZE, fsi_deck
+
+
+@pytest.fixture(scope="module")
+def deck(tmp_path_factory: pytest.TempPathFactory) -> Path:
+    return fsi_deck(tmp_path_factory.mktemp("read") / "deck.apkg")
+
+
+@pytest.mark.benchmark(group="read")
+def test_read_deck(benchmark: BenchmarkFixture, deck: Path) -> None:
+    """Streaming every note of an FSI sized deck, unzipping included"""
+    count = benchmark(lambda: sum(1 for _ in iter_notes(deck)))
+
+    assert count == FSI_DECK_SIZE
+    if benchmark.stats is not None:
+        benchmark.extra_info["cards_per_sec"] = FSI_DECK_SIZE / benchmark.stats.stats.mean
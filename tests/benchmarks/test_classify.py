@@ -0,0 +1,71 @@
+import asyncio
+
+import pytest
+from pytest_benchmark.fixture import BenchmarkFixture
+
+from claude_code_example.anki.models import Note
+from claude_code_example.anki.templates import Template, TemplateLibrary
+from claude_code_example.llm.classifier import BatchingClassifier, Classifier
+from claude_code_example.llm.dedup import Deduplicator, classify_notes
+from claude_code_example.llm.ollama import OllamaClient
+from tests.fakes.deck import fsi_notes
+from tests.fakes.ollama import FakeOllama, matching
+
+NOTES = 400
+CONCURRENCY = 4
+MAX_PROMPT_CHARS = 6_000
+# stands in for model time, so that fewer requests show up as less time
+LATENCY = 0.005
+# each round goes over HTTP to another thread, so one slow round is not rare
+ROUNDS = 10
+TEMPLATES = TemplateLibrary(
+    [Template(name="translation", description="An English sentence to translate")]
+)
+
+
+@pytest.fixture(scope="module")
+def notes() -> list[Note]:
+    # no fingerprint would match these: every note goes to the model
+    return fsi_notes(NOTES, ambiguous_ratio=1)
+
+
+async def _classify(url: str, notes: list[Note], batch_size: int, dedup: bool) -> int:
+    async with OllamaClient(base_url=url, model="fake", max_connections=CONCURRENCY) as client:
+        classifier = (
+            BatchingClassifier(
+                llm=client,
+                templates=TEMPLATES,
+                batch_size=batch_size,
+                max_prompt_chars=MAX_PROMPT_CHARS,
+            )
+            if batch_size > 1
+            else Classifier(llm=client, templates=TEMPLATES)
+        )
+        results = classify_notes(
+            notes,
+            classifier.classify,
+            max_in_flight=CONCURRENCY * batch_size,
+            deduplicator=Deduplicator() if dedup else None,
+        )
+        return sum([result.template is not None async for _, result in results])
+
+
+@pytest.mark.benchmark(group="classify")
+@pytest.mark.parametrize("dedup", [False, True], ids=["all", "dedup"])
+@pytest.mark.parametrize("batch_size", [1, 8])
+def test_classify(
+    benchmark: BenchmarkFixture, notes: list[Note], batch_size: int, dedup: bool
+) -> None:
+    """400 notes classified by a fake model over HTTP, 5ms a request"""
+    with FakeOllama(latency=LATENCY, responder=matching("translation")) as fake:
+        matched = benchmark.pedantic(  # type: ignore[no-untyped-call]
+            lambda: asyncio.run(_classify(fake.url, notes, batch_size, dedup)),
+            rounds=ROUNDS,
+            iterations=1,
+            warmup_rounds=1,
+        )
+
+    assert matched == NOTES
+    benchmark.extra_info["requests_per_round"] = fake.requests / (ROUNDS + 1)
+    if benchmark.stats is not None:
+        benchmark.extra_info["cards_per_sec"] = NOTES / benchmark.stats.stats.mean
@@ -0,0 +1,21 @@
+from pytest_benchmark.fixture import BenchmarkFixture
+
+from claude_code_example.anki.cloze import rewrite_batch
+from claude_code_example.anki.fingerprint import FingerprintIndex
+from claude_code_example.anki.templates import TemplateLibrary
+from tests.fakes.deck import FSI_TEMPLATES, fsi_notes
+
+NOTES = 10_000
+
+
+def test_rewrite_batch(benchmark: BenchmarkFixture) -> None:
+    """Fingerprint grouping plus Cloze rewrite over synthetic FSI notes"""
+    library = TemplateLibrary(FSI_TEMPLATES)
+    index = FingerprintIndex(library)
+    notes = fsi_notes(NOTES)
+
+    texts = benchmark(rewrite_batch, notes, index, library)
+
+    assert sum(text is not None for text in texts) > NOTES * 0.85
+    if benchmark.stats is not None:
+        benchmark.extra_info["cards_per_sec"] = NOTES / benchmark.stats.stats.mean
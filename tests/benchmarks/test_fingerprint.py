@@ -0,0 +1,20 @@
+from pytest_benchmark.fixture import BenchmarkFixture
+
+from claude_code_example.anki.fingerprint import FingerprintIndex
+from tests.fakes.deck import FSI_DECK_SIZE, FSI_TEMPLATES, fsi_notes
+
+
+def test_fingerprint_match(benchmark: BenchmarkFixture) -> None:
+    """How much of an FSI sized deck the fingerprints resolve, and how fast"""
+    index = FingerprintIndex(FSI_TEMPLATES)
+    notes = fsi_notes(FSI_DECK_SIZE)
+
+    def match_deck() -> int:
+        return sum(1 for note in notes if index.match(note) is not None)
+
+    resolved = benchmark(match_deck)
+
+    benchmark.extra_info["resolved_fraction"] = resolved / FSI_DECK_SIZE
+    if benchmark.stats is not None:
+        benchmark.extra_info["cards_per_sec"] = FSI_DECK_SIZE / benchmark.stats.stats.mean
+    assert resolved / FSI_DECK_SIZE > 0.85
@@ -0,0 +1,61 @@
+import tracemalloc
+from pathlib import Path
+from typing import Any, Callable
+
+import pytest
+from pytest_benchmark.fixture import BenchmarkFixture
+
+from claude_code_example.anki.apkg import iter_note_columns, iter_notes
+from tests.fakes.apkg import build_apkg
+from tests.fakes.deck import fsi_fields
+
+NOTES = 100_000
+# what loading a whole deck may cost per note, in bytes
+MAX_BYTES_PER_NOTE = 512
+MAX_BYTES_PER_COLUMN_NOTE = 160
+
+
+@pytest.fixture(scope="module")
+def deck(tmp_path_factory: pytest.TempPathFactory) -> Path:
+    return build_apkg(tmp_path_factory.mktemp("memory") / "deck.apkg", fsi_fields(NOTES))
+
+
+def _bytes_per_note(load: Callable[[], Any]) -> float:
+    """Memory still held by what `load` returns, per note"""
+    tracemalloc.start()
+    try:
+        loaded = load()
+        held, _ = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+    del loaded
+    return held / NOTES
+
+
+@pytest.mark.benchmark(group="load-deck")
+def test_load_notes(benchmark: BenchmarkFixture, deck: Path) -> None:
+    """A 100k note deck loaded as `Note`s"""
+    bytes_per_note = _bytes_per_note(lambda: list(iter_notes(deck)))
+
+    notes = benchmark.pedantic(  # type: ignore[no-untyped-call]
+        lambda: list(iter_notes(deck)), rounds=3, iterations=1
+    )
+
+    assert len(notes) == NOTES
+    assert bytes_per_note < MAX_BYTES_PER_NOTE
+    benchmark.extra_info["bytes_per_note"] = bytes_per_note
+
+
+@pytest.mark.benchmark(group="load-deck")
+def test_load_note_columns(benchmark: BenchmarkFixture, deck: Path) -> None:
+    """The same deck loaded as `NoteColumns` batches"""
+    bytes_per_note = _bytes_per_note(lambda: list(iter_note_columns(deck)))
+
+    batches = benchmark.pedantic(  # type: ignore[no-untyped-call]
+        lambda: list(iter_note_columns(deck)), rounds=3, iterations=1
+    )
+
+    assert sum(map(len, batches)) == NOTES
+    assert sum(batch.nbytes for batch in batches) / NOTES < MAX_BYTES_PER_COLUMN_NOTE
+    assert bytes_per_note < MAX_BYTES_PER_COLUMN_NOTE
+    benchmark.extra_info["bytes_per_note"] = bytes_per_note
@@ -0,0 +1,48 @@
+import os
+
+import pytest
+from pytest_benchmark.fixture import BenchmarkFixture
+
+from claude_code_example.anki.models import Note
+from claude_code_example.anki.templates import TemplateLibrary
+from claude_code_example.config.app_config import ClaudeCodeExampleConfig
+from claude_code_example.conversion.parallel import rewrite_parallel
+from tests.fakes.deck import FSI_TEMPLATES, fsi_notes
+
+NOTES = 20_000
+BATCH_SIZE = 500
+
+
+@pytest.fixture(scope="module")
+def batches() -> list[list[Note]]:
+    notes = fsi_notes(NOTES)
+    return [notes[start : start + BATCH_SIZE] for start in range(0, NOTES, BATCH_SIZE)]
+
+
+def _convert(batches: list[list[Note]], library: TemplateLibrary, workers: int) -> int:
+    config = ClaudeCodeExampleConfig()
+    return sum(
+        text is not None
+        for _, texts in rewrite_parallel(batches, config, library, workers=workers)
+        for text in texts
+    )
+
+
+@pytest.mark.benchmark(group="parallel-rewrite")
+@pytest.mark.parametrize("workers", [1, 2, 4, 8])
+def test_rewrite_parallel(
+    benchmark: BenchmarkFixture, batches: list[list[Note]], workers: int
+) -> None:
+    """Fingerprint plus Cloze rewrite of 20k notes, pool start up included"""
+    if workers > (os.cpu_count() or 1):
+        # the workers would only take turns on the same CPUs
+        pytest.skip(f"{workers} workers on {os.cpu_count()} CPUs")
+    library = TemplateLibrary(FSI_TEMPLATES)
+
+    converted = benchmark.pedantic(  # type: ignore[no-untyped-call]
+        _convert, args=(batches, library, workers), rounds=3, iterations=1
+    )
+
+    assert converted > NOTES * 0.85
+    if benchmark.stats is not None:
+        benchmark.extra_info["cards_per_sec"] = NOTES / benchmark.stats.stats.mean
@@ -0,0 +1,88 @@
+import asyncio
+from itertools import count
+from pathlib import Path
+from typing import Any
+
+import pytest
+from pytest_benchmark.fixture import BenchmarkFixture
+
+from claude_code_example.anki.apkg import iter_notes
+from claude_code_example.anki.fingerprint import FingerprintIndex
+from claude_code_example.anki.templates import TemplateLibrary
+from claude_code_example.anki.tsv import TsvWriter
+from claude_code_example.conversion.journal import ProgressJournal
+from claude_code_example.conversion.proposer import Proposer
+from claude_code_example.conversion.run import Output, RunStats, run_silent
+from claude_code_example.llm.classifier import Classifier, FingerprintFirst
+from claude_code_example.llm.dedup import Deduplicator
+from claude_code_example.llm.ollama import OllamaClient
+from claude_code_example.logging.spans import STAGES, SpanRecorder
+from tests.fakes.deck import FSI_DECK_SIZE, FSI_TEMPLATES, fsi_deck
+from tests.fakes.ollama import FakeOllama
+
+CONCURRENCY = 4
+LATENCY = 0.002
+# each round fsyncs the journal and goes over HTTP, so one slow round is not rare
+ROUNDS = 10
+
+
+@pytest.fixture(scope="module")
+def deck(tmp_path_factory: pytest.TempPathFactory) -> Path:
+    return fsi_deck(tmp_path_factory.mktemp("run") / "deck.apkg")
+
+
+async def _run(deck: Path, progress: Path, url: str, spans: SpanRecorder) -> RunStats:
+    """What `convert run --silent` does, without the CLI around it"""
+    library = TemplateLibrary(FSI_TEMPLATES)
+    index = FingerprintIndex(library)
+    async with OllamaClient(
+        base_url=url, model="fake", max_connections=CONCURRENCY, spans=spans
+    ) as client:
+        fingerprints = FingerprintFirst(
+            index=index, fallback=Classifier(llm=client, templates=library).classify
+        )
+        proposer = Proposer(
+            templates=library, index=index, classify=fingerprints.classify, spans=spans
+        )
+        with TsvWriter(progress / "cloze.tsv") as writer, ProgressJournal(
+            progress, fsync_every=64, compact_every=5_000
+        ) as journal:
+            journal.attach(writer)
+            return await run_silent(
+                iter_notes(deck),
+                proposer,
+                journal,
+                concurrency=CONCURRENCY,
+                min_confidence=0.8,
+                output=Output(writer),
+                deduplicator=Deduplicator(index=index),
+            )
+
+
+@pytest.mark.benchmark(group="run")
+def test_run_silent(benchmark: BenchmarkFixture, deck: Path, tmp_path: Path) -> None:
+    """A silent run over an FSI sized deck: read, classify, transform and write"""
+    rounds = count()
+    spans = SpanRecorder()
+
+    def setup() -> tuple[tuple[Any, ...], dict[str, Any]]:
+        # a fresh progress directory, or the run would resume past the end
+        return (deck, tmp_path / f"round{next(rounds)}", fake.url, spans), {}
+
+    with FakeOllama(latency=LATENCY) as fake:
+        stats = benchmark.pedantic(  # type: ignore[no-untyped-call]
+            lambda *args: asyncio.run(_run(*args)),
+            setup=setup,
+            rounds=ROUNDS,
+            iterations=1,
+            warmup_rounds=1,
+        )
+
+    assert stats.seen == FSI_DECK_SIZE
+    assert stats.converted > FSI_DECK_SIZE * 0.85
+    assert set(STAGES) <= set(spans.stages)
+    for stage in (*STAGES, "llm"):
+        benchmark.extra_info[f"{stage}_ms"] = spans.stages[stage].total * 1000 / (ROUNDS + 1)
+    benchmark.extra_info["dedup_ratio"] = stats.dedup_ratio
+    if benchmark.stats is not None:
+        benchmark.extra_info["cards_per_sec"] = FSI_DECK_SIZE / benchmark.stats.stats.mean
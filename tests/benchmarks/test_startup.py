@@ -0,0 +1,78 @@
+import os
+import subprocess
+import sys
+
+import pytest
+from pytest_benchmark.fixture import BenchmarkFixture
+
+ENTRY_POINT = "claude_code_example.cli.__main__"
+# generous: click alone is ~30ms, eager imports of rich and pydantic were ~330ms
+IMPORT_BUDGET_MS = 150
+# loaded by commands as they run, never just to start the CLI
+HEAVY_MODULES = {"rich", "pydantic", "pydantic_settings", "httpx", "sqlite3"}
+
+LOADED_BY_HELP = f"""
+import sys
+from {ENTRY_POINT} import cli
+try:
+    cli(sys.argv[1:])
+except SystemExit:
+    pass
+print(" ".join(sorted(sys.modules)))
+"""
+# pytest-cov starts coverage in subprocesses too, which imports sqlite3 and slows start up
+ENV = {key: value for key, value in os.environ.items() if not key.startswith("COV_CORE_")}
+
+
+def _import_time_ms() -> float:
+    """Cumulative import time of the entry point, from `python -X importtime`"""
+    result = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", f"import {ENTRY_POINT}"],
+        capture_output=True,
+        text=True,
+        check=True,
+        env=ENV,
+    )
+    for line in result.stderr.splitlines():
+        _, cumulative, name = line.split("|")
+        if name.strip() == ENTRY_POINT:
+            return int(cumulative) / 1000
+    raise AssertionError(f"{ENTRY_POINT} not in -X importtime output")
+
+
+@pytest.mark.parametrize("args", [["--help"], ["convert", "--help"], ["subcommand", "--help"]])
+def test_startup_imports(args: list[str]) -> None:
+    """Listing commands loads none of the heavy dependencies"""
+    result = subprocess.run(
+        [sys.executable, "-c", LOADED_BY_HELP, *args],
+        capture_output=True,
+        text=True,
+        check=True,
+        env=ENV,
+    )
+    modules = {name.split(".")[0] for name in result.stdout.splitlines()[-1].split()}
+    assert not modules & HEAVY_MODULES
+
+
+def test_startup_import_budget() -> None:
+    """Importing the CLI stays within budget; best of three, to ride out noise"""
+    import_ms = min(_import_time_ms() for _ in range(3))
+    assert import_ms < IMPORT_BUDGET_MS, f"{ENTRY_POINT} took {import_ms:.0f}ms to import"
+
+
+@pytest.mark.benchmark(group="startup")
+def test_startup_help(benchmark: BenchmarkFixture) -> None:
+    """Wall time of `claude-code-example --help` in a fresh interpreter"""
+    command = [sys.executable, "-m", "claude_code_example.cli", "--help"]
+
+    result = benchmark.pedantic(  # type: ignore[no-untyped-call]
+        subprocess.run,
+        args=(command,),
+        kwargs={"capture_output": True, "env": ENV},
+        rounds=5,
+        iterations=1,
+    )
+
+    assert result.returncode == 0
+    if benchmark.stats is not None:
+        benchmark.extra_info["import_ms"] = _import_time_ms()
@@ -0,0 +1,58 @@
+import csv
+from pathlib import Path
+
+import pytest
+from pytest_benchmark.fixture import BenchmarkFixture
+
+from claude_code_example.anki.tsv import TsvWriter
+from tests.fakes.deck import fsi_fields
+
+ROWS = 100_000
+
+
+@pytest.fixture(scope="module")
+def rows() -> list[tuple[str, str, str]]:
+    # multi-line fields, so both writers have something to escape or quote
+    return [(f"{prompt}<br>\n{answer}", hint, "fsi") for prompt, hint, answer in fsi_fields(ROWS)]
+
+
+def _tsv_writer(path: Path, rows: list[tuple[str, str, str]]) -> None:
+    with TsvWriter(path) as writer:
+        for row in rows:
+            writer.write(row)
+
+
+def _csv_writer(path: Path, rows: list[tuple[str, str, str]]) -> None:
+    """The naive version: one csv.writer call per row, flushed per row"""
+    with path.open("w", encoding="utf-8", newline="") as out:
+        writer = csv.writer(out, delimiter="\t")
+        for row in rows:
+            writer.writerow(row)
+            out.flush()
+
+
+@pytest.mark.benchmark(group="tsv-write")
+def test_tsv_writer(
+    benchmark: BenchmarkFixture, rows: list[tuple[str, str, str]], tmp_path: Path
+) -> None:
+    """Buffered, escaped writes of 100k rows"""
+    path = tmp_path / "cloze.tsv"
+
+    benchmark(_tsv_writer, path, rows)
+
+    assert path.read_text(encoding="utf-8").count("\n") == ROWS + 3
+    if benchmark.stats is not None:
+        benchmark.extra_info["rows_per_sec"] = ROWS / benchmark.stats.stats.mean
+
+
+@pytest.mark.benchmark(group="tsv-write")
+def test_csv_writer_baseline(
+    benchmark: BenchmarkFixture, rows: list[tuple[str, str, str]], tmp_path: Path
+) -> None:
+    """Per row csv.writer writes of the same 100k rows, for comparison"""
+    path = tmp_path / "cloze.csv"
+
+    benchmark(_csv_writer, path, rows)
+
+    if benchmark.stats is not None:
+        benchmark.extra_info["rows_per_sec"] = ROWS / benchmark.stats.stats.mean
@@ -0,0 +1,109 @@
+from pathlib import Path
+from typing import Optional
+
+import pytest
+
+from claude_code_example.cache.result_cache import (
+    CacheStats,
+    ResultCache,
+    cache_key,
+    normalise_fields,
+)
+
+
+def _put(
+    cache: ResultCache, key: str, template: Optional[str] = "blank", digest: str = "d1"
+) -> None:
+    cache.put(key, kind="classify", value="0.9", template=template, template_digest=digest)
+
+
+def test_normalise_fields() -> None:
+    """Whitespace and non-breaking spaces do not change the normalised fields"""
+    assert normalise_fields(["A", "B"], [" Er  hat\xa0_____. ", "x"]) == normalise_fields(
+        ["A", "B"], ["Er hat _____.", "x"]
+    )
+    assert normalise_fields(["A"], ["x"]) != normalise_fields(["B"], ["x"])
+
+
+def test_cache_key() -> None:
+    """Keys are stable and do not collide when parts are split differently"""
+    assert cache_key("a", "b") == cache_key("a", "b")
+    assert cache_key("ab", "c") != cache_key("a", "bc")
+
+
+def test_get_and_put(tmp_path: Path) -> None:
+    """Stored values come back and lookups are counted"""
+    stats = CacheStats()
+    with ResultCache(tmp_path / "cache.sqlite", max_entries=10, stats=stats) as cache:
+        assert cache.get("k") is None
+        _put(cache, "k")
+        _put(cache, "k")
+        entry = cache.get("k")
+
+        assert entry is not None
+        assert (entry.template, entry.template_digest, entry.value) == ("blank", "d1", "0.9")
+        assert len(cache) == 1
+    assert (stats.hits, stats.misses, stats.hit_rate) == (1, 1, 0.5)
+
+
+def test_persists_between_runs(tmp_path: Path) -> None:
+    """Entries are still there after the cache is reopened"""
+    with ResultCache(tmp_path / "cache.sqlite", max_entries=10) as cache:
+        _put(cache, "k")
+
+    with ResultCache(tmp_path / "cache.sqlite", max_entries=10) as cache:
+        assert len(cache) == 1
+        assert cache.get("k") is not None
+
+
+def test_lru_eviction(tmp_path: Path) -> None:
+    """The least recently used entries go first once the cap is reached"""
+    with ResultCache(tmp_path / "cache.sqlite", max_entries=2) as cache:
+        _put(cache, "a")
+        _put(cache, "b")
+        cache.get("a")
+        _put(cache, "c")
+
+        assert len(cache) == 2
+        assert cache.stats.evictions == 1
+        assert cache.get("b") is None
+        assert cache.get("a") is not None
+        assert cache.get("c") is not None
+
+
+def test_invalidate_template(tmp_path: Path) -> None:
+    """Only entries depending on the given template are dropped"""
+    with ResultCache(tmp_path / "cache.sqlite", max_entries=10) as cache:
+        _put(cache, "a", template="blank")
+        _put(cache, "b", template="other")
+        _put(cache, "c", template=None)
+
+        assert cache.invalidate_template("classify", "blank") == 1
+        assert cache.invalidate_template("classify", None) == 1
+        assert cache.invalidate_template("transform", "other") == 0
+        assert len(cache) == 1
+        assert cache.stats.invalidations == 2
+
+
+def test_prune(tmp_path: Path) -> None:
+    """Entries made with outdated template definitions are dropped"""
+    with ResultCache(tmp_path / "cache.sqlite", max_entries=10) as cache:
+        _put(cache, "current", template="blank", digest="d1")
+        _put(cache, "edited", template="other", digest="old")
+        _put(cache, "deleted", template="gone", digest="d3")
+        _put(cache, "no-match-current", template=None, digest="v2")
+        _put(cache, "no-match-old", template=None, digest="v1")
+
+        pruned = cache.prune(
+            "classify", current_digests={"blank": "d1", "other": "new"}, no_match_digest="v2"
+        )
+
+        assert pruned == 3
+        assert cache.get("current") is not None
+        assert cache.get("no-match-current") is not None
+
+
+def test_invalid_max_entries(tmp_path: Path) -> None:
+    """A cap below one is rejected"""
+    with pytest.raises(ValueError):
+        ResultCache(tmp_path / "cache.sqlite", max_entries=0)
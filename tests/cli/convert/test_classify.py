@@ -0,0 +1,106 @@
+import json
+from pathlib import Path
+
+from click.testing import CliRunner
+
+from claude_code_example.anki.templates import Template, TemplateLibrary
+from claude_code_example.cli.__main__ import cli
+from tests.fakes.apkg import FSI_NOTES, build_apkg
+from tests.fakes.ollama import FakeOllama
+
+
+def test_classify_help(cli_runner: CliRunner, cli_env: None) -> None:
+    """Test help for classify"""
+    result = cli_runner.invoke(cli, ["convert", "classify", "--help"])
+    assert result.exit_code == 0
+    assert "convert classify [OPTIONS] APKG" in result.output
+
+
+def test_classify(cli_runner: CliRunner, cli_env: None, fsi_apkg: Path, tmp_path: Path) -> None:
+    """Each note is classified and printed in deck order"""
+    templates = tmp_path / "templates.json"
+    TemplateLibrary([Template(name="blank", description="")]).save(templates)
+    answer = json.dumps({"template": "blank", "confidence": 0.8})
+
+    env = {"LLM_CONCURRENCY": "2", "CACHE_PATH": str(tmp_path / "cache.sqlite")}
+
+    with FakeOllama(responder=lambda prompt: answer) as fake:
+        args = ["convert", "classify", str(fsi_apkg), "--templates", str(templates)]
+        result = cli_runner.invoke(cli, args, env={**env, "OLLAMA_URL": fake.url})
+        rerun = cli_runner.invoke(cli, args, env={**env, "OLLAMA_URL": fake.url})
+        uncached = cli_runner.invoke(
+            cli, [*args, "--no-cache"], env={**env, "OLLAMA_URL": fake.url}
+        )
+
+    assert result.exit_code == 0
+    assert result.stdout.splitlines() == ["1\tblank\t0.80", "2\tblank\t0.80", "3\tblank\t0.80"]
+    assert "classify: 3 notes" in result.stderr
+    assert "concurrency 2" in result.stderr
+    assert "0 resolved by fingerprint" in result.stderr
+    assert "0 duplicates (0% deduplicated)" in result.stderr
+    assert "cache hits 0 misses 3" in result.stderr
+    assert rerun.stdout == result.stdout
+    assert "cache hits 3 misses 0" in rerun.stderr
+    assert uncached.stdout == result.stdout
+    assert fake.requests == 6
+
+
+def test_classify_batched(
+    cli_runner: CliRunner, cli_env: None, fsi_apkg: Path, tmp_path: Path
+) -> None:
+    """With --batch-size, the whole deck is classified in one request"""
+    templates = tmp_path / "templates.json"
+    TemplateLibrary([Template(name="blank", description="")]).save(templates)
+    answer = json.dumps(
+        {"cards": [{"card": card, "template": "blank", "confidence": 0.8} for card in (1, 2, 3)]}
+    )
+
+    with FakeOllama(responder=lambda prompt: answer) as fake:
+        result = cli_runner.invoke(
+            cli,
+            ["convert", "classify", str(fsi_apkg), "--templates", str(templates), "--no-cache"],
+            env={"OLLAMA_URL": fake.url, "LLM_BATCH_SIZE": "3"},
+        )
+
+    assert result.exit_code == 0
+    assert result.stdout.splitlines() == ["1\tblank\t0.80", "2\tblank\t0.80", "3\tblank\t0.80"]
+    assert "batch size 3" in result.stderr
+    assert fake.requests == 1
+
+
+def test_classify_dedup(cli_runner: CliRunner, cli_env: None, tmp_path: Path) -> None:
+    """Notes that only differ in markup are classified once, unless --no-dedup"""
+    templates = tmp_path / "templates.json"
+    TemplateLibrary([Template(name="blank", description="")]).save(templates)
+    answer = json.dumps({"template": "blank", "confidence": 0.8})
+    marked_up = [tuple(f"<b>{value}</b>" for value in fields) for fields in FSI_NOTES]
+    apkg = build_apkg(tmp_path / "duplicates.apkg", [*FSI_NOTES, *marked_up])
+
+    with FakeOllama(responder=lambda prompt: answer) as fake:
+        args = ["convert", "classify", str(apkg), "--templates", str(templates), "--no-cache"]
+        result = cli_runner.invoke(cli, args, env={"OLLAMA_URL": fake.url})
+        deduplicated = fake.requests
+        undeduplicated = cli_runner.invoke(cli, [*args, "--no-dedup"], env={"OLLAMA_URL": fake.url})
+
+    assert result.exit_code == 0
+    assert len(result.stdout.splitlines()) == 6
+    assert "3 duplicates (50% deduplicated)" in result.stderr
+    assert deduplicated == 3
+    assert undeduplicated.stdout == result.stdout
+    assert "0 duplicates" in undeduplicated.stderr
+    assert fake.requests == 9
+
+
+def test_classify_exception_handling(
+    cli_runner: CliRunner, cli_env: None, fsi_apkg: Path, tmp_path: Path
+) -> None:
+    """An unreachable model is reported and exits with 1"""
+    with FakeOllama(status=500) as fake:
+        result = cli_runner.invoke(
+            cli,
+            ["convert", "classify", str(fsi_apkg), "--templates", str(tmp_path / "none.json")],
+            env={"OLLAMA_URL": fake.url, "CACHE_PATH": str(tmp_path / "cache.sqlite")},
+        )
+
+    assert result.exit_code == 1
+    assert "CLI Error" in result.output
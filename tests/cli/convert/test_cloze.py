@@ -0,0 +1,100 @@
+from pathlib import Path
+from unittest.mock import patch
+
+from click.testing import CliRunner
+
+from claude_code_example.anki.templates import TemplateLibrary
+from claude_code_example.cli.__main__ import cli
+from tests.fakes.apkg import build_apkg
+from tests.fakes.deck import FSI_TEMPLATES
+
+
+def test_cloze_help(cli_runner: CliRunner, cli_env: None) -> None:
+    """Test help for cloze"""
+    result = cli_runner.invoke(cli, ["convert", "cloze", "--help"])
+    assert result.exit_code == 0
+    assert "convert cloze [OPTIONS] APKG" in result.output
+
+
+def test_cloze(cli_runner: CliRunner, cli_env: None, tmp_path: Path) -> None:
+    """Fingerprinted notes are written as Cloze TSV, the rest are skipped"""
+    apkg = build_apkg(
+        tmp_path / "deck.apkg",
+        [
+            (
+                "<u>_____</u> <u>ist</u> dort.",
+                "D- Flughafen",
+                "<u>Der Flughafen</u> <u>ist</u> dort.",
+            ),
+            ("The station is there.", "", "Der Bahnhof ist dort."),
+            ("Er hat _____.", "Füller; ein-", "Er hat _einen_Füller_."),
+        ],
+    )
+    templates = tmp_path / "templates.json"
+    TemplateLibrary(FSI_TEMPLATES).save(templates)
+    output = tmp_path / "out.tsv"
+
+    result = cli_runner.invoke(
+        cli,
+        ["convert", "cloze", str(apkg), "--templates", str(templates), "-o", str(output)],
+    )
+
+    assert result.exit_code == 0
+    assert output.read_text(encoding="utf-8").splitlines() == [
+        "#separator:tab",
+        "#html:true",
+        "#tags column:3",
+        "{{c1::Der Flughafen::D- Flughafen}} ist dort.\t\tfsi",
+        "Er hat {{c1::einen Füller::Füller; ein-}}.\t\tfsi",
+    ]
+    assert "cloze: 2 of 3 notes rewritten" in result.stderr
+    assert "1 skipped" in result.stderr
+
+
+def test_cloze_stdout(cli_runner: CliRunner, tmp_path: Path, fsi_apkg: Path) -> None:
+    """Only the TSV goes to stdout, even with debug logging"""
+    templates = tmp_path / "templates.json"
+    TemplateLibrary(FSI_TEMPLATES).save(templates)
+
+    result = cli_runner.invoke(
+        cli,
+        ["convert", "cloze", str(fsi_apkg), "--templates", str(templates)],
+        env={"LOG_LEVEL": "DEBUG"},
+    )
+
+    assert result.exit_code == 0, result.output
+    assert result.stdout.startswith("#separator:tab\n")
+    assert "DEBUG" not in result.stdout
+
+
+def test_cloze_workers(
+    cli_runner: CliRunner, cli_env: None, tmp_path: Path, fsi_apkg: Path
+) -> None:
+    """Rewriting in worker processes gives the same output as in process"""
+    templates = tmp_path / "templates.json"
+    TemplateLibrary(FSI_TEMPLATES).save(templates)
+    outputs = []
+    for workers in ("1", "2"):
+        output = tmp_path / f"out-{workers}.tsv"
+        result = cli_runner.invoke(
+            cli,
+            ["convert", "cloze", str(fsi_apkg), "--templates", str(templates)]
+            + ["-o", str(output), "--batch-size", "1", "--workers", workers],
+        )
+        assert result.exit_code == 0, result.output
+        assert f"{workers} workers" in result.stderr
+        outputs.append(output.read_text(encoding="utf-8"))
+
+    assert outputs[0] == outputs[1]
+    assert outputs[0].count("{{c1::") == 3
+
+
+def test_cloze_exception_handling(cli_runner: CliRunner, cli_env: None, fsi_apkg: Path) -> None:
+    """Errors while rewriting are reported and exit with 1"""
+    with patch("claude_code_example.cli.convert.cloze.rewrite_batch") as mock_rewrite:
+        mock_rewrite.side_effect = Exception("Mocked exception")
+
+        result = cli_runner.invoke(cli, ["convert", "cloze", str(fsi_apkg)])
+
+    assert result.exit_code == 1
+    assert "CLI Error: Mocked exception" in result.output
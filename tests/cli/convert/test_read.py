@@ -0,0 +1,55 @@
+from pathlib import Path
+from unittest.mock import patch
+
+from click.testing import CliRunner
+
+from claude_code_example.cli.__main__ import cli
+from tests.fakes.apkg import build_apkg
+
+
+def test_convert_help(cli_runner: CliRunner, cli_env: None) -> None:
+    """Test help for the convert group"""
+    result = cli_runner.invoke(cli, ["convert", "--help"])
+    assert result.exit_code == 0
+    assert "convert [OPTIONS] COMMAND [ARGS]" in result.output
+
+
+def test_read(cli_runner: CliRunner, cli_env: None, fsi_apkg: Path) -> None:
+    """Notes are printed as TSV followed by a summary"""
+    result = cli_runner.invoke(cli, ["convert", "read", str(fsi_apkg), "--batch-size", "2"])
+    assert result.exit_code == 0
+    assert "\tD- Flughafen\t" in result.stdout
+    assert "read: 3 notes" in result.stderr
+    assert "notes/sec" in result.stderr
+    assert "peak RSS" in result.stderr
+
+
+def test_read_escaped(cli_runner: CliRunner, cli_env: None, tmp_path: Path) -> None:
+    """Line breaks and tabs in a field keep each note on one row of its own columns"""
+    apkg = build_apkg(tmp_path / "deck.apkg", [("line one\nline two", "a\tb", "c")])
+
+    result = cli_runner.invoke(cli, ["convert", "read", str(apkg)])
+
+    assert result.exit_code == 0
+    rows = result.stdout.splitlines()
+    assert len(rows) == 1
+    assert rows[0].split("\t")[3:] == ["line one<br>line two", "a&#9;b", "c"]
+
+
+def test_read_quiet(cli_runner: CliRunner, cli_env: None, fsi_apkg: Path) -> None:
+    """Only the summary is printed with --quiet"""
+    result = cli_runner.invoke(cli, ["convert", "read", str(fsi_apkg), "--quiet"])
+    assert result.exit_code == 0
+    assert result.stdout == ""
+    assert "read: 3 notes" in result.stderr
+
+
+def test_read_exception_handling(cli_runner: CliRunner, cli_env: None, fsi_apkg: Path) -> None:
+    """Errors while reading are reported and exit with 1"""
+    with patch("claude_code_example.cli.convert.read.iter_note_batches") as mock_iter:
+        mock_iter.side_effect = Exception("Mocked exception")
+
+        result = cli_runner.invoke(cli, ["convert", "read", str(fsi_apkg)])
+
+        assert result.exit_code == 1
+        assert "CLI Error: Mocked exception" in result.output
@@ -0,0 +1,152 @@
+import json
+import shutil
+from pathlib import Path
+from unittest.mock import patch
+
+from click.testing import CliRunner
+
+from claude_code_example.anki.templates import TemplateLibrary
+from claude_code_example.cli.__main__ import cli
+from claude_code_example.conversion.journal import deck_progress_dir
+from tests.fakes.deck import FSI_TEMPLATES
+from tests.fakes.ollama import FakeOllama
+
+
+def _env(tmp_path: Path, url: str) -> dict[str, str]:
+    return {
+        "OLLAMA_URL": url,
+        "CACHE_PATH": str(tmp_path / "cache.sqlite"),
+        "PROGRESS_DIR": str(tmp_path / "progress"),
+        "TEMPLATES_PATH": str(tmp_path / "templates.json"),
+        "JOURNAL_FSYNC_EVERY": "1",
+    }
+
+
+def test_run_help(cli_runner: CliRunner, cli_env: None) -> None:
+    """Test help for run"""
+    result = cli_runner.invoke(cli, ["convert", "run", "--help"])
+    assert result.exit_code == 0
+    assert "convert run [OPTIONS] APKG" in result.output
+
+
+def test_run_silent_and_resume(
+    cli_runner: CliRunner, cli_env: None, fsi_apkg: Path, tmp_path: Path
+) -> None:
+    """Silent mode converts what it can; a second run has nothing left to do"""
+    TemplateLibrary(FSI_TEMPLATES).save(tmp_path / "templates.json")
+
+    with FakeOllama() as fake:
+        result = cli_runner.invoke(
+            cli, ["convert", "run", str(fsi_apkg), "--silent"], env=_env(tmp_path, fake.url)
+        )
+        rerun = cli_runner.invoke(
+            cli, ["convert", "run", str(fsi_apkg), "--silent"], env=_env(tmp_path, fake.url)
+        )
+
+    assert result.exit_code == 0
+    assert "run: 3 notes" in result.stderr
+    assert "3 converted, 0 skipped, 0 duplicates (0% deduplicated)" in result.stderr
+    output = deck_progress_dir(tmp_path / "progress", fsi_apkg) / "cloze.tsv"
+    assert output.read_text(encoding="utf-8").count("{{c1::") == 3
+    assert rerun.exit_code == 0
+    assert "run: 0 notes" in rerun.stderr
+    assert "0 notes written" in rerun.stderr
+    assert output.read_text(encoding="utf-8").count("{{c1::") == 3
+    assert fake.requests == 0
+
+
+def test_run_same_deck_name(
+    cli_runner: CliRunner, cli_env: None, fsi_apkg: Path, tmp_path: Path
+) -> None:
+    """Decks with the same name in different directories keep separate progress"""
+    TemplateLibrary(FSI_TEMPLATES).save(tmp_path / "templates.json")
+    other = tmp_path / "other" / fsi_apkg.name
+    other.parent.mkdir()
+    shutil.copyfile(fsi_apkg, other)
+
+    with FakeOllama() as fake:
+        results = [
+            cli_runner.invoke(
+                cli, ["convert", "run", str(apkg), "--silent"], env=_env(tmp_path, fake.url)
+            )
+            for apkg in (fsi_apkg, other)
+        ]
+
+    assert [result.exit_code for result in results] == [0, 0]
+    assert all("run: 3 notes" in result.stderr for result in results)
+    assert len(list((tmp_path / "progress").iterdir())) == 2
+
+
+def test_run_shard_by_template(
+    cli_runner: CliRunner, cli_env: None, fsi_apkg: Path, tmp_path: Path
+) -> None:
+    """Converted notes are spread over one file per template"""
+    TemplateLibrary(FSI_TEMPLATES).save(tmp_path / "templates.json")
+    output = tmp_path / "out" / "cloze.tsv"
+
+    with FakeOllama() as fake:
+        result = cli_runner.invoke(
+            cli,
+            ["convert", "run", str(fsi_apkg), "--silent", "-o", str(output)]
+            + ["--shard-by", "template"],
+            env=_env(tmp_path, fake.url),
+        )
+
+    assert result.exit_code == 0, result.output
+    assert "3 notes written" in result.stderr
+    shards = {path.name: path.read_text(encoding="utf-8") for path in output.parent.iterdir()}
+    assert set(shards) <= {"cloze.article-hint.tsv", "cloze.blank-with-hint.tsv"}
+    assert sum(text.count("{{c1::") for text in shards.values()) == 3
+    assert all(text.startswith("#separator:tab\n") for text in shards.values())
+
+
+def test_run_interactive(
+    cli_runner: CliRunner, cli_env: None, fsi_apkg: Path, tmp_path: Path
+) -> None:
+    """Interactive mode asks about each note and stops when told to"""
+    TemplateLibrary(FSI_TEMPLATES[:1]).save(tmp_path / "templates.json")
+    answer = json.dumps({"template": None, "confidence": 0})
+
+    with FakeOllama(responder=lambda prompt: answer) as fake:
+        result = cli_runner.invoke(
+            cli,
+            ["convert", "run", str(fsi_apkg)],
+            env=_env(tmp_path, fake.url),
+            input="\n".join(
+                [
+                    # note 1 is unknown: explain it
+                    "e",
+                    "blank-with-hint",
+                    "Blank with a noun and adjective hint",
+                    "_{3,}",
+                    ";",
+                    "",
+                    "",
+                    "",
+                    "",
+                    # the new template matches: accept, then quit at note 2
+                    "a",
+                    "q",
+                ]
+            )
+            + "\n",
+        )
+
+    assert result.exit_code == 0, result.output
+    assert "No known structure matches this note" in result.stdout
+    assert "{{c1::einen neuen amerikanischen Füller" in result.stdout
+    assert "of 2 next notes ready" in result.stdout
+    assert "run: 1 notes" in result.stderr
+    assert "stopped early" in result.stderr
+    assert "blank-with-hint" in TemplateLibrary.load(tmp_path / "templates.json")
+
+
+def test_run_exception_handling(cli_runner: CliRunner, cli_env: None, fsi_apkg: Path) -> None:
+    """Errors during the run are reported and exit with 1"""
+    with patch("claude_code_example.cli.convert.run.ProgressJournal") as mock_journal:
+        mock_journal.side_effect = Exception("Mocked exception")
+
+        result = cli_runner.invoke(cli, ["convert", "run", str(fsi_apkg)])
+
+    assert result.exit_code == 1
+    assert "CLI Error: Mocked exception" in result.output
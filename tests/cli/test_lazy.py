@@ -0,0 +1,61 @@
+from unittest.mock import patch
+
+import click
+import pytest
+from click.testing import CliRunner
+
+from claude_code_example.cli.__main__ import cli
+from claude_code_example.cli.console import get_console
+from claude_code_example.cli.lazy import LazyCommand, LazyGroup
+
+
+def _lazy_groups(group: LazyGroup) -> list[LazyGroup]:
+    groups = [group]
+    for name in group.lazy_commands:
+        command = group.get_command(click.Context(group), name)
+        if isinstance(command, LazyGroup):
+            groups.extend(_lazy_groups(command))
+    return groups
+
+
+@pytest.mark.parametrize("group", _lazy_groups(cli), ids=lambda group: group.name)
+def test_registered_short_help(group: LazyGroup) -> None:
+    """What --help lists matches each command's own docstring"""
+    for name, lazy in group.lazy_commands.items():
+        assert lazy.load().get_short_help_str(limit=200) == lazy.short_help, name
+
+
+def test_help_does_not_load_commands(cli_runner: CliRunner) -> None:
+    """Listing the commands imports none of them"""
+    group = LazyGroup(
+        name="group",
+        lazy_commands={"broken": LazyCommand("does.not.exist:command", "Never imported")},
+    )
+
+    result = cli_runner.invoke(group, ["--help"])
+
+    assert result.exit_code == 0
+    assert "broken  Never imported" in result.output
+    assert not group.commands
+
+
+def test_load_rejects_non_commands() -> None:
+    """Import paths must point at click commands"""
+    with pytest.raises(TypeError):
+        LazyCommand("claude_code_example.cli.lazy:LazyCommand", "").load()
+
+
+def test_console_is_created_once() -> None:
+    """The console is built on first use and shared after that"""
+    from claude_code_example.cli.__main__ import console
+
+    assert console is get_console()
+
+
+def test_app_context_is_lazy(cli_runner: CliRunner) -> None:
+    """--help never builds the config or the logger"""
+    with patch("claude_code_example.app_context.setup_logger") as mock_setup:
+        for args in (["--help"], ["convert", "--help"]):
+            assert cli_runner.invoke(cli, args).exit_code == 0
+
+    mock_setup.assert_not_called()
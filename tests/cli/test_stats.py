@@ -0,0 +1,76 @@
+import subprocess
+import sys
+from pathlib import Path
+
+from click.testing import CliRunner
+
+from claude_code_example.cli.__main__ import cli
+from claude_code_example.metrics.report import MetricsReport
+
+
+def test_profile_and_stats(
+    cli_runner: CliRunner, cli_env: None, fsi_apkg: Path, tmp_path: Path
+) -> None:
+    """A profiled run leaves a report that stats renders"""
+    report = tmp_path / "profile.json"
+    result = cli_runner.invoke(
+        cli, ["--profile", str(report), "convert", "read", str(fsi_apkg), "--quiet"]
+    )
+    assert result.exit_code == 0
+    assert report.exists()
+    assert (tmp_path / "profile.json.prof").exists()
+    assert MetricsReport.load(report).command == "convert read"
+
+    shown = cli_runner.invoke(cli, ["stats", str(report), "--top", "5"])
+    assert shown.exit_code == 0
+    assert "convert" in shown.output
+    assert "cards" in shown.output
+    assert "Top 5 functions" in shown.output
+
+
+def test_stats_stages(cli_runner: CliRunner, cli_env: None, tmp_path: Path) -> None:
+    """Timed stages are listed slowest first, with their share of the run"""
+    report = tmp_path / "profile.json"
+    MetricsReport(
+        command="convert run",
+        elapsed=2.0,
+        cards=10,
+        stages={
+            "write": {"count": 10, "total_ms": 100.0, "mean_ms": 10.0},
+            "classify": {"count": 10, "total_ms": 1500.0, "mean_ms": 150.0},
+        },
+    ).save(report)
+
+    result = cli_runner.invoke(cli, ["stats", str(report)])
+
+    assert result.exit_code == 0
+    assert "Stages" in result.output
+    rows = [line for line in result.output.splitlines() if "classify" in line or "write" in line]
+    assert [row.split()[1] for row in rows] == ["classify", "write"]
+    assert "75%" in rows[0] and "1500.0" in rows[0] and "150.000" in rows[0]
+    assert "5%" in rows[1]
+
+
+def test_stats_missing_report(cli_runner: CliRunner, cli_env: None, tmp_path: Path) -> None:
+    """A report that does not exist is a usage error"""
+    result = cli_runner.invoke(cli, ["stats", str(tmp_path / "nope.json")])
+    assert result.exit_code != 0
+
+
+def test_stats_module_entry_point(
+    cli_runner: CliRunner, cli_env: None, fsi_apkg: Path, tmp_path: Path
+) -> None:
+    """Under python -m, commands never import the entry module a second time"""
+    report = tmp_path / "profile.json"
+    cli_runner.invoke(cli, ["--profile", str(report), "convert", "read", str(fsi_apkg), "-q"])
+
+    result = subprocess.run(
+        [sys.executable, "-X", "importtime", "-m", "claude_code_example.cli", "stats", str(report)],
+        capture_output=True,
+        text=True,
+        check=True,
+    )
+
+    assert "cards" in result.stdout
+    imported = [line.split("|")[-1].strip() for line in result.stderr.splitlines()]
+    assert "claude_code_example.cli.__main__" not in imported
@@ -1,7 +1,38 @@
+from pathlib import Path
+
+import pytest
+
 from claude_code_example.config.app_config import ClaudeCodeExampleConfig
+from claude_code_example.config.values import ConfigValues
 
 
 def test_settings() -> None:
     settings = ClaudeCodeExampleConfig()
     assert settings.app_name == "claude-code-example"
     assert settings.log_level in ["INFO", "DEBUG"]
+
+
+def test_settings_sources(tmp_path: Path, monkeypatch: pytest.MonkeyPatch) -> None:
+    """Settings are read from .env and the environment, the environment first"""
+    monkeypatch.chdir(tmp_path)
+    (tmp_path / ".env").write_text(
+        "log_level=DEBUG\nollama_model=llama3\nunknown=1\n", encoding="utf-8"
+    )
+    monkeypatch.setenv("OLLAMA_MODEL", "qwen")
+
+    settings = ClaudeCodeExampleConfig()
+
+    assert settings.log_level == "DEBUG"
+    assert settings.ollama_model == "qwen"
+    assert isinstance(settings, ConfigValues)
+
+
+def test_values_sources(tmp_path: Path, monkeypatch: pytest.MonkeyPatch) -> None:
+    """The plain values read neither .env nor the environment"""
+    monkeypatch.chdir(tmp_path)
+    (tmp_path / ".env").write_text("log_level=DEBUG\n", encoding="utf-8")
+    monkeypatch.setenv("OLLAMA_MODEL", "qwen")
+
+    values = ConfigValues()
+
+    assert (values.log_level, values.ollama_model) == ("INFO", "mistral")
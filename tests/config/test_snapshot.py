@@ -0,0 +1,112 @@
+import json
+import os
+import subprocess
+import sys
+from pathlib import Path
+from typing import Any, Generator
+from unittest.mock import patch
+
+import pytest
+from pydantic_settings import DotEnvSettingsSource, EnvSettingsSource
+
+from claude_code_example.config import snapshot
+from claude_code_example.config.snapshot import config_stamp, load_config
+from claude_code_example.config.values import ConfigValues
+
+ROOT = Path(__file__).parents[2]
+IMPORTED_BY_SNAPSHOT = """
+import sys
+from claude_code_example.config.snapshot import load_config
+print(load_config().app_name, "pydantic_settings" in sys.modules)
+"""
+
+
+@pytest.fixture(autouse=True)
+def project(tmp_path: Path, monkeypatch: pytest.MonkeyPatch) -> Generator[Path, None, None]:
+    """An empty project directory, with nothing loaded yet"""
+    monkeypatch.chdir(tmp_path)
+    for name in ConfigValues.model_fields:
+        monkeypatch.delenv(name.upper(), raising=False)
+    snapshot._loaded.clear()
+    yield tmp_path
+    snapshot._loaded.clear()
+
+
+def _reads() -> Any:
+    """Counts how often .env and the environment are read"""
+    return patch.object(snapshot, "_from_sources", wraps=snapshot._from_sources)
+
+
+def test_stamp_changes_with_inputs(project: Path) -> None:
+    """.env and the environment variables of settings are part of the stamp, nothing else"""
+    stamp = config_stamp(environ={})
+
+    assert config_stamp(environ={"UNRELATED": "1"}) == stamp
+    assert config_stamp(environ={"OLLAMA_MODEL": "llama3"}) != stamp
+    (project / ".env").write_text("ollama_model=llama3\n", encoding="utf-8")
+    assert config_stamp(environ={}) != stamp
+
+
+def test_load_config_once(project: Path) -> None:
+    """The config is validated once, and each caller gets its own copy"""
+    with _reads() as reads:
+        first = load_config()
+        second = load_config()
+
+    assert reads.call_count == 1
+    assert first == second
+    assert first is not second
+    assert json.loads((project / ".cache" / "config.json").read_text())["values"]["app_name"] == (
+        first.app_name
+    )
+
+
+def test_load_config_from_snapshot(project: Path) -> None:
+    """A later run builds its config from the snapshot, reading neither .env nor the environment"""
+    (project / ".env").write_text("llm_batch_size=8\n", encoding="utf-8")
+    first = load_config()
+    snapshot._loaded.clear()
+
+    with patch.object(
+        DotEnvSettingsSource, "__call__", side_effect=AssertionError(".env was read")
+    ), patch.object(EnvSettingsSource, "__call__", side_effect=AssertionError("environ was read")):
+        second = load_config()
+
+    assert second == first
+    assert second.llm_batch_size == 8
+    assert isinstance(second.progress_dir, Path)
+
+
+def test_load_config_from_snapshot_imports(project: Path) -> None:
+    """A config rebuilt from the snapshot does not import pydantic-settings"""
+    load_config()
+
+    result = subprocess.run(
+        [sys.executable, "-c", IMPORTED_BY_SNAPSHOT],
+        capture_output=True,
+        text=True,
+        check=True,
+        env={**os.environ, "PYTHONPATH": str(ROOT)},
+    )
+
+    assert result.stdout.split() == ["claude-code-example", "False"]
+
+
+def test_load_config_reloads_on_change(project: Path, monkeypatch: pytest.MonkeyPatch) -> None:
+    """Changing .env or a setting's environment variable loads the config again"""
+    assert load_config().ollama_model == "mistral"
+
+    monkeypatch.setenv("OLLAMA_MODEL", "llama3")
+    assert load_config().ollama_model == "llama3"
+
+    env_file = project / ".env"
+    env_file.write_text("min_confidence=0.5\n", encoding="utf-8")
+    os.utime(env_file, ns=(1, 1))
+    assert load_config().min_confidence == 0.5
+
+
+def test_load_config_without_snapshot(project: Path) -> None:
+    """No snapshot is written when asked not to"""
+    load_config(snapshot_path=None)
+
+    assert not (project / ".cache").exists()
@@ -1,7 +1,13 @@
 import random
+from functools import partial
+from pathlib import Path
+from typing import Generator
 
 import pytest
 
+from claude_code_example.config import snapshot
+from tests.fakes.apkg import FSI_NOTES, build_apkg
+
 # botocore likes us-east-1
 TEST_AWS_REGION = "us-east-1"
 TEST_S3_BUCKET = "test-bucket"
@@ -10,3 +16,20 @@ TEST_S3_BUCKET = "test-bucket"
 def pytest_collection_modifyitems(items: list[pytest.Item]) -> None:
     """Randomise the order of tests to avoid flakiness."""
     random.shuffle(items)
+
+
+@pytest.fixture(autouse=True)
+def config_snapshot(tmp_path: Path, monkeypatch: pytest.MonkeyPatch) -> Generator[Path, None, None]:
+    """The config snapshot commands take, kept in `tmp_path` rather than the project"""
+    path = tmp_path / ".cache" / "config.json"
+    # looked up by `AppContext` each time it loads the config
+    monkeypatch.setattr(snapshot, "load_config", partial(snapshot.load_config, path))
+    snapshot._loaded.clear()
+    yield path
+    snapshot._loaded.clear()
+
+
+@pytest.fixture
+def fsi_apkg(tmp_path: Path) -> Path:
+    """A small FSI style deck exported as `.apkg`"""
+    return build_apkg(tmp_path / "fsi.apkg", FSI_NOTES)
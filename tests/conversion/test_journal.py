@@ -0,0 +1,135 @@
+import json
+from pathlib import Path
+
+import pytest
+
+from claude_code_example.anki.tsv import HEADER, TsvWriter
+from claude_code_example.conversion.journal import Decision, ProgressJournal, deck_progress_dir
+
+
+def _journal(directory: Path, fsync_every: int = 2, compact_every: int = 100) -> ProgressJournal:
+    return ProgressJournal(directory, fsync_every=fsync_every, compact_every=compact_every)
+
+
+def test_decision_round_trip() -> None:
+    """Decisions survive serialisation"""
+    decision = Decision(3, "accept", "blank", ("Er hat {{c1::Zeit}}.", ""))
+    assert Decision.from_json(decision.to_json()) == decision
+
+
+def test_deck_progress_dir(tmp_path: Path, monkeypatch: pytest.MonkeyPatch) -> None:
+    """Each deck gets its own directory, however its path is spelled"""
+    monkeypatch.chdir(tmp_path)
+    root = tmp_path / "progress"
+
+    first = deck_progress_dir(root, Path("a/German.apkg"))
+
+    assert first.parent == root
+    assert first.name.startswith("German-")
+    assert deck_progress_dir(root, tmp_path / "a" / "German.apkg") == first
+    assert deck_progress_dir(root, Path("b/German.apkg")) != first
+
+
+def test_resume_point(tmp_path: Path) -> None:
+    """A reopened journal resumes after the last committed note"""
+    with _journal(tmp_path) as journal:
+        assert journal.last_note_id is None
+        journal.record(Decision(1, "skip"))
+        journal.record(Decision(2, "transform", "blank", ("x", "")))
+        journal.record(Decision(3, "skip"))
+
+    with _journal(tmp_path) as journal:
+        assert journal.last_note_id == 3
+        assert [decision.note_id for decision in journal.decisions()] == [1, 2, 3]
+
+
+def test_uncommitted_decisions_are_dropped(tmp_path: Path) -> None:
+    """Decisions recorded after the last commit are gone after a crash"""
+    journal = _journal(tmp_path, fsync_every=2)
+    journal.record(Decision(1, "skip"))
+    journal.record(Decision(2, "skip"))
+    journal.record(Decision(3, "skip"))
+    # simulate a crash: the buffered record reaches the file but is never committed
+    journal._file.flush()
+
+    with _journal(tmp_path) as resumed:
+        assert resumed.last_note_id == 2
+        assert [decision.note_id for decision in resumed.decisions()] == [1, 2]
+        resumed.record(Decision(3, "accept", "blank", ("y", "")))
+
+    with _journal(tmp_path) as resumed:
+        assert [decision.action for decision in resumed.decisions()] == ["skip", "skip", "accept"]
+
+
+def test_on_commit_hooks(tmp_path: Path) -> None:
+    """Hooks run on every commit that has something to commit"""
+    calls = []
+    with _journal(tmp_path, fsync_every=2) as journal:
+        journal.on_commit.append(lambda: calls.append(journal.last_note_id))
+        journal.record(Decision(1, "skip"))
+        journal.record(Decision(2, "skip"))
+        journal.commit()
+        journal.record(Decision(3, "skip"))
+
+    assert calls == [None, 2]
+
+
+def test_attached_output(tmp_path: Path) -> None:
+    """Attached output is rolled back to the last commit, like the journal"""
+    output = tmp_path / "cloze.tsv"
+    with TsvWriter(output) as writer:
+        # crash: note 3 makes it to the file but is never committed
+        crashed = _journal(tmp_path / "progress")
+        crashed.attach(writer)
+        for note_id in (1, 2, 3):
+            writer.write([f"note {note_id}", ""])
+            crashed.record(Decision(note_id, "transform", "blank", (f"note {note_id}", "")))
+
+    with TsvWriter(output) as writer, _journal(tmp_path / "progress") as journal:
+        journal.attach(writer)
+        assert journal.last_note_id == 2
+        writer.write(["note 3", ""])
+        journal.record(Decision(3, "transform", "blank", ("note 3", "")))
+
+    assert output.read_text(encoding="utf-8") == HEADER + "note 1\t\nnote 2\t\nnote 3\t\n"
+
+
+def test_compaction(tmp_path: Path) -> None:
+    """The journal is folded into a snapshot, keeping the latest decision per note"""
+    with _journal(tmp_path, fsync_every=1, compact_every=3) as journal:
+        journal.record(Decision(1, "skip"))
+        journal.record(Decision(2, "skip"))
+        journal.record(Decision(1, "accept", "blank", ("x", "")))
+        journal.record(Decision(3, "skip"))
+        journal.compact()
+        journal.record(Decision(4, "skip"))
+
+    assert (tmp_path / "journal.jsonl").read_text().count("\n") == 1
+    assert [path.name for path in tmp_path.glob("snapshot-*.jsonl")] == ["snapshot-2.jsonl"]
+    checkpoint = json.loads((tmp_path / "checkpoint.json").read_text())
+    assert checkpoint["snapshot_generation"] == 2
+
+    with _journal(tmp_path) as journal:
+        assert journal.last_note_id == 4
+        assert [(d.note_id, d.action) for d in journal.decisions()] == [
+            (1, "accept"),
+            (2, "skip"),
+            (3, "skip"),
+            (4, "skip"),
+        ]
+
+
+def test_crash_during_compaction(tmp_path: Path) -> None:
+    """A snapshot written without its checkpoint is ignored"""
+    with _journal(tmp_path, fsync_every=1) as journal:
+        journal.record(Decision(1, "skip"))
+    (tmp_path / "snapshot-1.jsonl").write_text(Decision(1, "skip").to_json() + "\n")
+
+    with _journal(tmp_path) as journal:
+        assert [decision.note_id for decision in journal.decisions()] == [1]
+
+
+def test_invalid_settings(tmp_path: Path) -> None:
+    """Batch sizes below one are rejected"""
+    with pytest.raises(ValueError):
+        _journal(tmp_path, fsync_every=0)
@@ -0,0 +1,81 @@
+import json
+import logging
+import time
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+from pathlib import Path
+from typing import Iterator
+
+import pytest
+
+from claude_code_example.anki.cloze import rewrite_batch
+from claude_code_example.anki.fingerprint import FingerprintIndex
+from claude_code_example.anki.templates import TemplateLibrary
+from claude_code_example.config.app_config import ClaudeCodeExampleConfig
+from claude_code_example.conversion.parallel import _init_worker, ordered_submit, rewrite_parallel
+from claude_code_example.logging.logging import flush_logs, setup_logger, worker_logs
+from tests.fakes.deck import FSI_TEMPLATES, fsi_notes
+
+
+def _slow_square(value: int) -> int:
+    # earlier items finish last
+    time.sleep(0.01 * value)
+    return value * value
+
+
+def _handlers(app_name: str) -> list[str]:
+    return [type(handler).__name__ for handler in logging.getLogger(app_name).handlers]
+
+
+def test_ordered_submit() -> None:
+    """Results come back in input order, with their items, a window at a time"""
+    consumed = []
+
+    def items() -> Iterator[int]:
+        for value in range(5):
+            consumed.append(value)
+            yield value
+
+    with ThreadPoolExecutor(max_workers=4) as executor:
+        results = ordered_submit(
+            executor, _slow_square, items(), max_in_flight=2, prepare=lambda value: 4 - value
+        )
+        assert next(results) == (0, 16)
+        assert consumed == [0, 1]
+        assert list(results) == [(1, 9), (2, 4), (3, 1), (4, 0)]
+
+        with pytest.raises(ValueError):
+            next(ordered_submit(executor, _slow_square, [1], max_in_flight=0, prepare=int))
+
+
+def test_rewrite_parallel() -> None:
+    """Worker processes produce exactly what a serial rewrite does"""
+    library = TemplateLibrary(FSI_TEMPLATES)
+    notes = fsi_notes(1_000)
+    batches = [notes[start : start + 100] for start in range(0, len(notes), 100)]
+
+    results = list(rewrite_parallel(batches, ClaudeCodeExampleConfig(), library, workers=2))
+
+    assert [batch for batch, _ in results] == batches
+    serial = rewrite_batch(notes, FingerprintIndex(library), library)
+    assert [text for _, texts in results for text in texts] == serial
+
+
+def test_rewrite_parallel_logs(tmp_path: Path) -> None:
+    """Workers log through the parent's sinks, without handlers of their own"""
+    json_path = tmp_path / "app.jsonl"
+    config = ClaudeCodeExampleConfig(
+        app_name="parallel-logs", log_level="DEBUG", log_json_path=json_path
+    )
+    logger = setup_logger(app_name=config.app_name, log_level="DEBUG", json_path=json_path)
+    library = TemplateLibrary(FSI_TEMPLATES)
+
+    list(rewrite_parallel([fsi_notes(10)], config, library, workers=1))
+    with worker_logs(config.app_name) as log_queue, ProcessPoolExecutor(
+        max_workers=1, initializer=_init_worker, initargs=(config, [], log_queue)
+    ) as executor:
+        handlers = executor.submit(_handlers, config.app_name).result()
+    flush_logs(logger)
+
+    assert handlers == ["QueueHandler"]
+    messages = [json.loads(line)["message"] for line in json_path.read_text().splitlines()]
+    assert messages == ["Worker ready with 2 fingerprints", "Worker ready with 0 fingerprints"]
@@ -0,0 +1,140 @@
+import asyncio
+from pathlib import Path
+
+import pytest
+
+from claude_code_example.anki.models import Note
+from claude_code_example.conversion.prefetch import Prefetcher
+from claude_code_example.conversion.proposer import Proposal
+from claude_code_example.conversion.run import ReviewAnswer, run_interactive
+from claude_code_example.llm.dedup import Deduplicator
+from tests.fakes.conversion import build_proposer, open_journal
+from tests.fakes.deck import STATION, fsi_notes
+from tests.fakes.ollama import FakeLLM
+
+
+def _unknown(note_id: int, place: str) -> Note:
+    return Note(
+        id=note_id,
+        note_type="FSI German Drills",
+        deck="",
+        field_names=("Prompt1", "Prompt2", "Answer"),
+        fields=("Wo ist _____?", f"the {place}", f"Wo ist der {place}?"),
+    )
+
+
+def test_prefetcher_depth() -> None:
+    """Depth must not be negative"""
+    with pytest.raises(ValueError):
+        Prefetcher(build_proposer(FakeLLM()), depth=-1)
+
+
+def test_prefetch_while_reviewing(tmp_path: Path) -> None:
+    """The next notes are proposed while the current one is reviewed"""
+    llm = FakeLLM(latency=0.01)
+    proposer = build_proposer(llm)
+    prefetcher = Prefetcher(proposer, depth=2)
+    notes = [_unknown(note_id, f"place{note_id}") for note_id in range(1, 6)]
+    ready: list[int] = []
+
+    async def review(proposal: Proposal) -> ReviewAnswer:
+        # think for as long as the proposals being prefetched take
+        prefetching = asyncio.all_tasks() - {asyncio.current_task()}
+        if prefetching:
+            await asyncio.wait(prefetching)
+        ready.append(prefetcher.ready)
+        return "skip"
+
+    with open_journal(tmp_path) as journal:
+        stats = asyncio.run(
+            run_interactive(notes, proposer, journal, review, prefetcher=prefetcher)
+        )
+
+    assert stats.seen == 5
+    assert ready == [2, 2, 2, 1, 0]
+    assert llm.calls == 5
+    assert proposer.on_template_changed == []
+
+
+def test_prefetch_template_changed(tmp_path: Path) -> None:
+    """Teaching a template proposes the queued notes it could change again"""
+    llm = FakeLLM(latency=0)
+    proposer = build_proposer(llm)
+    prefetcher = Prefetcher(proposer, depth=3)
+    known = fsi_notes(1, ambiguous_ratio=0)[0]
+    notes = [_unknown(1, "station"), _unknown(2, "hotel"), known, _unknown(3, "bank")]
+    answers: list[ReviewAnswer] = [STATION, "accept", "accept", "accept", "accept"]
+    seen: list[Proposal] = []
+
+    async def review(proposal: Proposal) -> ReviewAnswer:
+        # let the prefetched proposals finish first
+        await asyncio.sleep(0.01)
+        seen.append(proposal)
+        return answers.pop(0)
+
+    with open_journal(tmp_path) as journal:
+        stats = asyncio.run(
+            run_interactive(notes, proposer, journal, review, prefetcher=prefetcher)
+        )
+
+    assert [proposal.template for proposal in seen] == [
+        None,
+        "english-hint",
+        "english-hint",
+        seen[3].template,
+        "english-hint",
+    ]
+    assert seen[3].template in {"article-hint", "blank-with-hint"}
+    # the two unmatched notes, not the one a fingerprint had already matched
+    assert prefetcher.repeated == 2
+    assert stats.converted == 4
+
+
+def test_prefetch_duplicates(tmp_path: Path) -> None:
+    """Duplicates are not proposed ahead, and are proposed on their own once templates change"""
+    llm = FakeLLM(latency=0)
+    proposer = build_proposer(llm)
+    prefetcher = Prefetcher(proposer, depth=1, deduplicator=Deduplicator(index=proposer.index))
+    notes = [_unknown(1, "hotel"), _unknown(2, "hotel"), _unknown(3, "station")]
+    notes.append(_unknown(4, "station"))
+    answers: list[ReviewAnswer] = ["skip", STATION, "accept", "accept"]
+    seen: list[Proposal] = []
+
+    async def review(proposal: Proposal) -> ReviewAnswer:
+        await asyncio.sleep(0.01)
+        seen.append(proposal)
+        return answers.pop(0)
+
+    with open_journal(tmp_path) as journal:
+        stats = asyncio.run(
+            run_interactive(notes, proposer, journal, review, prefetcher=prefetcher)
+        )
+
+    # note 2 got note 1's answer; note 4 was proposed again from the fingerprint
+    assert [proposal.note.id for proposal in seen] == [1, 3, 3, 4]
+    assert seen[-1].duplicate_of is None and seen[-1].template == "english-hint"
+    assert llm.calls == 2
+    assert (stats.seen, stats.duplicates, stats.converted) == (4, 1, 2)
+
+
+def test_prefetch_quit(tmp_path: Path) -> None:
+    """Quitting cancels the proposals still queued"""
+    llm = FakeLLM(latency=1)
+    proposer = build_proposer(llm)
+    prefetcher = Prefetcher(proposer, depth=3)
+    notes = [*fsi_notes(1, ambiguous_ratio=0), *(_unknown(i, f"p{i}") for i in range(2, 6))]
+
+    async def review(proposal: Proposal) -> ReviewAnswer:
+        return "quit"
+
+    async def run() -> None:
+        with open_journal(tmp_path) as journal:
+            await run_interactive(notes, proposer, journal, review, prefetcher=prefetcher)
+        await asyncio.sleep(0)
+        # nothing is left running in the background
+        assert asyncio.all_tasks() == {asyncio.current_task()}
+
+    asyncio.run(run())
+
+    assert len(prefetcher) == 0
+    assert llm.calls == 3
@@ -0,0 +1,157 @@
+import asyncio
+import json
+from pathlib import Path
+
+from claude_code_example.anki.models import Note
+from claude_code_example.anki.templates import Template, TemplateLibrary
+from claude_code_example.conversion.prefetch import Prefetcher
+from claude_code_example.conversion.proposer import Proposal
+from claude_code_example.conversion.run import ReviewAnswer, run_interactive, run_silent
+from claude_code_example.llm.dedup import Deduplicator
+from tests.fakes.conversion import build_proposer, open_journal
+from tests.fakes.deck import FSI_CLOZE, FSI_TEMPLATES, STATION, fsi_notes
+from tests.fakes.ollama import FakeLLM
+
+UNKNOWN = Note(
+    id=100,
+    note_type="FSI German Drills",
+    deck="",
+    field_names=("Prompt1", "Prompt2", "Answer"),
+    fields=("Wo ist _____?", "the station", "Wo ist der Bahnhof?"),
+)
+
+
+def test_propose() -> None:
+    """Fingerprinted notes come with their Cloze text, unknown ones without"""
+    proposer = build_proposer(FakeLLM("{}"))
+    known = fsi_notes(1, ambiguous_ratio=0)[0]
+
+    proposal = asyncio.run(proposer.propose(known))
+    unknown = asyncio.run(proposer.propose(UNKNOWN))
+
+    assert proposal.template in {"article-hint", "blank-with-hint"}
+    assert proposal.text is not None and "{{c1::" in proposal.text
+    assert unknown == Proposal(note=UNKNOWN, template=None, confidence=0.0, text=None)
+
+
+def test_run_silent(tmp_path: Path) -> None:
+    """Confident proposals are converted, the rest skipped, all in deck order"""
+    llm = FakeLLM(json.dumps({"template": "article-hint", "confidence": 0.5}))
+    proposer = build_proposer(llm)
+    notes = fsi_notes(20, ambiguous_ratio=0.3)
+
+    with open_journal(tmp_path) as journal:
+        stats = asyncio.run(run_silent(notes, proposer, journal, concurrency=4, min_confidence=0.8))
+        decisions = list(journal.decisions())
+
+    assert [decision.note_id for decision in decisions] == [note.id for note in notes]
+    assert stats.seen == 20
+    assert stats.skipped == llm.calls > 0
+    assert stats.converted == sum(decision.action == "transform" for decision in decisions)
+    assert all(decision.row for decision in decisions if decision.action == "transform")
+
+
+def test_run_silent_duplicates(tmp_path: Path) -> None:
+    """Duplicates are rewritten from their own fields with their group's classification"""
+    station = Template(name="station", description="Where is a place", cloze=FSI_CLOZE)
+    llm = FakeLLM(json.dumps({"template": "station", "confidence": 0.9}))
+    proposer = build_proposer(llm, TemplateLibrary([station]))
+    duplicate = Note(
+        id=101,
+        note_type=UNKNOWN.note_type,
+        deck="",
+        field_names=UNKNOWN.field_names,
+        fields=("Wo ist <u>_____</u>?", "the&nbsp;station", "Wo ist der Bahnhof?"),
+    )
+
+    with open_journal(tmp_path) as journal:
+        stats = asyncio.run(
+            run_silent(
+                [UNKNOWN, duplicate],
+                proposer,
+                journal,
+                concurrency=2,
+                min_confidence=0.8,
+                deduplicator=Deduplicator(),
+            )
+        )
+        decisions = list(journal.decisions())
+
+    assert llm.calls == 1
+    assert [decision.note_id for decision in decisions] == [100, 101]
+    assert decisions[1].row == ("Wo ist {{c1::der Bahnhof::the station}}?", "", "")
+    assert (stats.converted, stats.duplicates) == (2, 1)
+
+
+def test_run_silent_spans(tmp_path: Path) -> None:
+    """Every stage of a silent run is timed"""
+    proposer = build_proposer(FakeLLM("{}"))
+
+    with open_journal(tmp_path) as journal:
+        notes = fsi_notes(5, ambiguous_ratio=0)
+        asyncio.run(run_silent(notes, proposer, journal, concurrency=2, min_confidence=0.8))
+
+    stages = proposer.spans.stages
+    assert [stages[stage].count for stage in ("classify", "transform")] == [5, 5]
+    # the read that finds the deck exhausted, and the final commit, are timed too
+    assert stages["read"].count == 6
+    assert stages["write"].count == 6
+
+
+def test_run_interactive(tmp_path: Path) -> None:
+    """Answers are recorded, taught templates are used straight away, quit stops early"""
+    templates = TemplateLibrary(FSI_TEMPLATES)
+    proposer = build_proposer(FakeLLM("{}"), templates)
+    changed: list[Template] = []
+    proposer.on_template_changed.append(changed.append)
+    notes = [*fsi_notes(2, ambiguous_ratio=0), UNKNOWN, *fsi_notes(2, ambiguous_ratio=0)]
+    answers: list[ReviewAnswer] = ["accept", "skip", STATION, "accept", "quit"]
+    seen: list[Proposal] = []
+
+    async def review(proposal: Proposal) -> ReviewAnswer:
+        seen.append(proposal)
+        return answers.pop(0)
+
+    with open_journal(tmp_path) as journal:
+        stats = asyncio.run(run_interactive(notes, proposer, journal, review))
+        decisions = list(journal.decisions())
+
+    assert (stats.seen, stats.converted, stats.skipped, stats.stopped) == (3, 2, 1, True)
+    assert [decision.action for decision in decisions] == ["accept", "skip", "accept"]
+    assert decisions[2].row == ("Wo ist {{c1::der Bahnhof::the station}}?", "", "")
+    assert seen[2].text is None and seen[3].template == "english-hint"
+    assert changed == [STATION]
+    assert "english-hint" in templates
+
+
+def test_run_interactive_duplicates(tmp_path: Path) -> None:
+    """A duplicate of a note already answered gets the same answer without being shown"""
+    station = Template(name="station", description="Where is a place", cloze=FSI_CLOZE)
+    templates = TemplateLibrary([station])
+    llm = FakeLLM(json.dumps({"template": "station", "confidence": 0.9}))
+    proposer = build_proposer(llm, templates)
+    prefetcher = Prefetcher(proposer, depth=1, deduplicator=Deduplicator(index=proposer.index))
+    duplicate = Note(
+        id=101,
+        note_type=UNKNOWN.note_type,
+        deck="",
+        field_names=UNKNOWN.field_names,
+        fields=("Wo ist <u>_____</u>?", "the&nbsp;station", "Wo ist der Bahnhof?"),
+    )
+    seen: list[Proposal] = []
+
+    async def review(proposal: Proposal) -> ReviewAnswer:
+        seen.append(proposal)
+        return "accept"
+
+    with open_journal(tmp_path) as journal:
+        stats = asyncio.run(
+            run_interactive([UNKNOWN, duplicate], proposer, journal, review, prefetcher=prefetcher)
+        )
+        decisions = list(journal.decisions())
+
+    assert [proposal.note.id for proposal in seen] == [100]
+    assert llm.calls == 1
+    assert [decision.action for decision in decisions] == ["accept", "accept"]
+    assert decisions[1].row == ("Wo ist {{c1::der Bahnhof::the station}}?", "", "")
+    assert (stats.seen, stats.converted, stats.duplicates, stats.dedup_ratio) == (2, 2, 1, 0.5)
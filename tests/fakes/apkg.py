@@ -0,0 +1,85 @@
+"""Builds minimal `.apkg` files with the legacy Anki schema for tests."""
+
+import json
+import sqlite3
+import tempfile
+import zipfile
+from pathlib import Path
+from typing import Iterable, Sequence
+
+FSI_NOTE_TYPE_ID = 1342697561419
+FSI_FIELD_NAMES = ("Prompt1", "Prompt2", "Answer")
+FSI_DECK_ID = 1
+FSI_DECK_NAME = "DEU FSI German Basic Course Drills"
+# the fields of a few notes from that deck, as they are exported
+FSI_NOTES = [
+    (
+        "Er hat _____.",
+        "Füller; ein- neu- amerikansich-",
+        "Er hat _einen_neuen_amerikanischen_Füller_.",
+    ),
+    ("<u>_____</u> <u>ist</u> dort.", "D- Flughafen", "<u>Der Flughafen</u> <u>ist</u> dort."),
+    ("Wo ist _____?", "D- Bahnhof", "Wo ist <u>der Bahnhof</u>?"),
+]
+
+SCHEMA = """
+CREATE TABLE col (id integer primary key, models text not null, decks text not null);
+CREATE TABLE notes (
+    id integer primary key, guid text not null, mid integer not null, mod integer not null,
+    usn integer not null, tags text not null, flds text not null, sfld integer not null,
+    csum integer not null, flags integer not null, data text not null
+);
+CREATE TABLE cards (
+    id integer primary key, nid integer not null, did integer not null, ord integer not null
+);
+CREATE INDEX ix_cards_nid ON cards (nid);
+"""
+
+
+def build_apkg(
+    path: Path,
+    notes: Iterable[Sequence[str]],
+    *,
+    field_names: Sequence[str] = FSI_FIELD_NAMES,
+    note_type: str = "FSI German Drills",
+    deck: str = FSI_DECK_NAME,
+    tags: str = " fsi ",
+    member: str = "collection.anki2",
+) -> Path:
+    """
+    Write an `.apkg` at `path` holding one note (and one card) per entry in `notes`.
+
+    Returns `path` for convenience.
+    """
+    models = {
+        str(FSI_NOTE_TYPE_ID): {
+            "name": note_type,
+            "flds": [{"name": name, "ord": ord_} for ord_, name in enumerate(field_names)],
+        }
+    }
+    decks = {str(FSI_DECK_ID): {"name": deck}}
+
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        collection_path = Path(tmp_dir) / member
+        connection = sqlite3.connect(collection_path)
+        connection.executescript(SCHEMA)
+        connection.execute(
+            "INSERT INTO col (id, models, decks) VALUES (1, ?, ?)",
+            (json.dumps(models), json.dumps(decks)),
+        )
+        connection.executemany(
+            "INSERT INTO notes VALUES (?, ?, ?, 0, 0, ?, ?, '', 0, 0, '')",
+            (
+                (note_id, f"guid{note_id}", FSI_NOTE_TYPE_ID, tags, "\x1f".join(fields))
+                for note_id, fields in enumerate(notes, start=1)
+            ),
+        )
+        connection.execute("INSERT INTO cards SELECT id, id, ?, 0 FROM notes", (FSI_DECK_ID,))
+        connection.commit()
+        connection.close()
+
+        with zipfile.ZipFile(path, "w", compression=zipfile.ZIP_DEFLATED) as archive:
+            archive.write(collection_path, member)
+            archive.writestr("media", "{}")
+
+    return path
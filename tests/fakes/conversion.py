@@ -0,0 +1,26 @@
+"""The proposer and journal conversion runs are tested with."""
+
+from pathlib import Path
+from typing import Optional
+
+from claude_code_example.anki.fingerprint import FingerprintIndex
+from claude_code_example.anki.templates import TemplateLibrary
+from claude_code_example.conversion.journal import ProgressJournal
+from claude_code_example.conversion.proposer import Proposer
+from claude_code_example.llm.classifier import Classifier, FingerprintFirst, TextGenerator
+from tests.fakes.deck import FSI_TEMPLATES
+
+
+def build_proposer(llm: TextGenerator, templates: Optional[TemplateLibrary] = None) -> Proposer:
+    """Fingerprints first, then `llm`, over `templates` or the FSI ones"""
+    templates = templates if templates is not None else TemplateLibrary(FSI_TEMPLATES)
+    index = FingerprintIndex(templates)
+    classify = FingerprintFirst(
+        index=index, fallback=Classifier(llm=llm, templates=templates).classify
+    ).classify
+    return Proposer(templates=templates, index=index, classify=classify)
+
+
+def open_journal(tmp_path: Path) -> ProgressJournal:
+    """A journal in `tmp_path` that syncs and compacts often enough to be exercised"""
+    return ProgressJournal(tmp_path, fsync_every=4, compact_every=1000)
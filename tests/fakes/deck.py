@@ -0,0 +1,136 @@
+"""Synthetic FSI style drill notes, for tests and benchmarks."""
+
+import random
+from pathlib import Path
+from typing import Iterator
+
+from claude_code_example.anki.models import Note
+from claude_code_example.anki.templates import Template
+from tests.fakes.apkg import FSI_DECK_NAME, FSI_FIELD_NAMES, build_apkg
+
+# the size of the FSI German Basic Course Drills deck
+FSI_DECK_SIZE = 3293
+
+# noun, gender
+NOUNS = [
+    ("Flughafen", "m"),
+    ("Bahnhof", "m"),
+    ("Füller", "m"),
+    ("Koffer", "m"),
+    ("Wagen", "m"),
+    ("Tisch", "m"),
+    ("Zeitung", "f"),
+    ("Tasche", "f"),
+    ("Uhr", "f"),
+    ("Lampe", "f"),
+    ("Post", "f"),
+    ("Kirche", "f"),
+    ("Hotel", "n"),
+    ("Buch", "n"),
+    ("Haus", "n"),
+    ("Restaurant", "n"),
+    ("Zimmer", "n"),
+    ("Kino", "n"),
+]
+ADJECTIVES = ["neu", "alt", "groß", "klein", "amerikanisch", "deutsch", "billig", "teuer"]
+SUBJECTS = ["Er", "Sie", "Herr Meyer", "Frau Wiegand", "Das Kind"]
+PLACES = ["dort", "hier", "drüben", "links", "rechts"]
+ENGLISH = ["The {noun} is {place}.", "Where is the {noun}?", "Is that a new {noun}?"]
+
+DEFINITE = {"m": "Der", "f": "Die", "n": "Das"}
+INDEFINITE_ACCUSATIVE = {"m": "einen", "f": "eine", "n": "ein"}
+ADJECTIVE_ENDING = {"m": "en", "f": "e", "n": "es"}
+
+FSI_CLOZE = {"prompt": "Prompt1", "hint": "Prompt2", "answer": "Answer"}
+FSI_TEMPLATES = [
+    Template(
+        name="article-hint",
+        description="Sentence with a _____ blank for a noun phrase, Prompt2 gives `D- Noun`",
+        fingerprint={"Prompt1": r"_{3,}", "Prompt2": r"^[DdEe]-\s"},
+        cloze=FSI_CLOZE,
+    ),
+    Template(
+        name="blank-with-hint",
+        description="Sentence with a _____ blank, Prompt2 gives `Noun; ein- adjective-`",
+        fingerprint={"Prompt1": r"_{3,}", "Prompt2": r";"},
+        cloze=FSI_CLOZE,
+    ),
+]
+# not in FSI_TEMPLATES: what a reviewer teaches for hints in English, e.g. "the station"
+STATION = Template(
+    name="english-hint",
+    description="Blank with an English hint",
+    fingerprint={"Prompt2": "^the "},
+    cloze=FSI_CLOZE,
+)
+
+
+def article_hint(rng: random.Random) -> tuple[str, str, str]:
+    noun, gender = rng.choice(NOUNS)
+    place = rng.choice(PLACES)
+    return (
+        f"<u>_____</u> <u>ist</u> {place}.",
+        f"D- {noun}",
+        f"<u>{DEFINITE[gender]} {noun}</u> <u>ist</u> {place}.",
+    )
+
+
+def blank_with_hint(rng: random.Random) -> tuple[str, str, str]:
+    noun, gender = rng.choice(NOUNS)
+    adjective = rng.choice(ADJECTIVES)
+    subject = rng.choice(SUBJECTS)
+    words = (INDEFINITE_ACCUSATIVE[gender], adjective + ADJECTIVE_ENDING[gender], noun)
+    return (
+        f"{subject} hat _____.",
+        f"{noun}; ein- {adjective}-",
+        f"{subject} hat _{'_'.join(words)}_.",
+    )
+
+
+def translation(rng: random.Random) -> tuple[str, str, str]:
+    """A note no fingerprint matches, which has to go to the LLM"""
+    noun, gender = rng.choice(NOUNS)
+    place = rng.choice(PLACES)
+    return (
+        rng.choice(ENGLISH).format(noun=noun.lower(), place=place),
+        "",
+        f"{DEFINITE[gender]} {noun} ist {place}.",
+    )
+
+
+def fsi_fields(
+    count: int, *, seed: int = 0, ambiguous_ratio: float = 0.1
+) -> Iterator[tuple[str, str, str]]:
+    """
+    Fields of `count` drill notes, mixing the two FSI templates with a
+    fraction of `ambiguous_ratio` notes that match neither.
+    """
+    rng = random.Random(seed)
+    for _ in range(count):
+        if rng.random() < ambiguous_ratio:
+            yield translation(rng)
+        else:
+            yield rng.choice((article_hint, blank_with_hint))(rng)
+
+
+def fsi_notes(count: int, *, seed: int = 0, ambiguous_ratio: float = 0.1) -> list[Note]:
+    """`count` synthetic FSI drill notes, see `fsi_fields`"""
+    return [
+        Note(
+            id=note_id,
+            note_type="FSI German Drills",
+            deck=FSI_DECK_NAME,
+            field_names=FSI_FIELD_NAMES,
+            fields=fields,
+        )
+        for note_id, fields in enumerate(
+            fsi_fields(count, seed=seed, ambiguous_ratio=ambiguous_ratio), start=1
+        )
+    ]
+
+
+def fsi_deck(
+    path: Path, count: int = FSI_DECK_SIZE, *, seed: int = 0, ambiguous_ratio: float = 0.1
+) -> Path:
+    """An `.apkg` of `count` synthetic FSI drill notes at `path`, see `fsi_fields`"""
+    return build_apkg(path, fsi_fields(count, seed=seed, ambiguous_ratio=ambiguous_ratio))
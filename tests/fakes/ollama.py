@@ -0,0 +1,156 @@
+"""A local stand-in for the Ollama HTTP API, so tests never need a real model."""
+
+import asyncio
+import json
+import re
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from types import TracebackType
+from typing import Callable, Optional
+
+NO_MATCH = json.dumps({"template": None, "confidence": 0.0})
+
+
+def matching(template: str, confidence: float = 0.9) -> Callable[[str], str]:
+    """A responder matching every card of a batch prompt, or the note of a single one"""
+
+    def respond(prompt: str) -> str:
+        cards = re.findall(r"^\[(\d+)\]$", prompt, flags=re.MULTILINE)
+        if not cards:
+            return json.dumps({"template": template, "confidence": confidence})
+        entries = [
+            {"card": int(card), "template": template, "confidence": confidence} for card in cards
+        ]
+        return json.dumps({"cards": entries})
+
+    return respond
+
+
+class FakeLLM:
+    """
+    A `TextGenerator` answering in process, for tests that need no HTTP.
+
+    Every prompt waits `latency` seconds, then gets `answer`, or whatever
+    `responder` returns for it when one is given. The prompts it was asked
+    are kept in order.
+    """
+
+    def __init__(
+        self,
+        answer: str = NO_MATCH,
+        *,
+        responder: Optional[Callable[[str], str]] = None,
+        latency: float = 0.0,
+    ) -> None:
+        self.responder = responder or (lambda prompt: answer)
+        self.latency = latency
+        self.prompts: list[str] = []
+
+    @property
+    def calls(self) -> int:
+        return len(self.prompts)
+
+    async def generate(self, prompt: str) -> str:
+        self.prompts.append(prompt)
+        # even without latency, other tasks run while the model "thinks"
+        await asyncio.sleep(self.latency)
+        return self.responder(prompt)
+
+
+class _Server(ThreadingHTTPServer):
+    daemon_threads = True
+    # the default backlog of 5 makes concurrent clients wait on SYN retries
+    request_queue_size = 128
+
+
+class FakeOllama:
+    """
+    Serves `/api/generate` on a random local port from a background thread.
+
+    Every request sleeps for `latency` seconds, to stand in for model
+    time, then answers with whatever `responder` returns for the prompt.
+    The server records how many requests it saw and the highest number it
+    was handling at once.
+
+    ```python
+    with FakeOllama(latency=0.05) as fake:
+        config.ollama_url = fake.url
+    ```
+    """
+
+    def __init__(
+        self,
+        *,
+        latency: float = 0.0,
+        responder: Callable[[str], str] = lambda prompt: NO_MATCH,
+        status: int = 200,
+    ) -> None:
+        self.latency = latency
+        self.responder = responder
+        self.status = status
+        self.prompts: list[str] = []
+        self.max_concurrent = 0
+        self._concurrent = 0
+        self._lock = threading.Lock()
+        self._server = _Server(("127.0.0.1", 0), self._handler_class())
+        self._thread = threading.Thread(
+            target=self._server.serve_forever, kwargs={"poll_interval": 0.01}, daemon=True
+        )
+
+    @property
+    def url(self) -> str:
+        host, port = self._server.server_address[:2]
+        return f"http://{host!s}:{port}"
+
+    @property
+    def requests(self) -> int:
+        return len(self.prompts)
+
+    def __enter__(self) -> "FakeOllama":
+        self._thread.start()
+        return self
+
+    def __exit__(
+        self,
+        exc_type: Optional[type[BaseException]],
+        exc: Optional[BaseException],
+        traceback: Optional[TracebackType],
+    ) -> None:
+        self._server.shutdown()
+        self._server.server_close()
+
+    def _handle(self, prompt: str) -> str:
+        with self._lock:
+            self.prompts.append(prompt)
+            self._concurrent += 1
+            self.max_concurrent = max(self.max_concurrent, self._concurrent)
+        try:
+            time.sleep(self.latency)
+            return self.responder(prompt)
+        finally:
+            with self._lock:
+                self._concurrent -= 1
+
+    def _handler_class(self) -> type[BaseHTTPRequestHandler]:
+        fake = self
+
+        class Handler(BaseHTTPRequestHandler):
+            protocol_version = "HTTP/1.1"
+            disable_nagle_algorithm = True
+
+            def do_POST(self) -> None:
+                length = int(self.headers.get("Content-Length", 0))
+                request = json.loads(self.rfile.read(length))
+                answer = fake._handle(request["prompt"])
+                body = json.dumps({"model": request["model"], "response": answer}).encode()
+                self.send_response(fake.status)
+                self.send_header("Content-Type", "application/json")
+                self.send_header("Content-Length", str(len(body)))
+                self.end_headers()
+                self.wfile.write(body)
+
+            def log_message(self, format: str, *args: object) -> None:
+                pass
+
+        return Handler
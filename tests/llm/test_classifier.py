@@ -0,0 +1,338 @@
+import asyncio
+import json
+import re
+import time
+from pathlib import Path
+from typing import Optional
+
+import pytest
+
+from claude_code_example.anki.fingerprint import FingerprintIndex
+from claude_code_example.anki.models import Note
+from claude_code_example.anki.templates import Template, TemplateLibrary
+from claude_code_example.cache.result_cache import ResultCache
+from claude_code_example.llm.classifier import (
+    BatchingClassifier,
+    CachedClassifier,
+    Classification,
+    Classifier,
+    FingerprintFirst,
+    build_batch_prompt,
+    build_prompt,
+    parse_answer,
+    parse_batch_answer,
+)
+from claude_code_example.llm.ollama import LLMError, OllamaClient
+from claude_code_example.llm.pipeline import ordered_map
+from tests.fakes.deck import FSI_TEMPLATES, fsi_notes
+from tests.fakes.ollama import FakeLLM, FakeOllama, matching
+
+TEMPLATES = TemplateLibrary([Template(name="blank", description="Sentence with a blank")])
+NOTE = Note(
+    id=7,
+    note_type="FSI German Drills",
+    deck="FSI",
+    field_names=("Prompt1", "Prompt2", "Answer"),
+    fields=("Er hat _____.", "Füller", "Er hat einen Füller."),
+)
+MATCH = json.dumps({"template": "blank", "confidence": 0.9})
+
+
+def test_build_prompt() -> None:
+    """The prompt lists the templates and the note fields"""
+    prompt = build_prompt(NOTE, TEMPLATES)
+    assert "- blank: Sentence with a blank" in prompt
+    assert "Prompt1: Er hat _____." in prompt
+
+
+@pytest.mark.parametrize(
+    "answer, expected",
+    [
+        (MATCH, Classification(note_id=7, template="blank", confidence=0.9)),
+        ('{"template": "blank", "confidence": 3}', Classification(7, "blank", 1.0)),
+        ('{"template": "unknown", "confidence": 1}', Classification(7, None, 0.0)),
+        ('{"template": null}', Classification(7, None, 0.0)),
+        ("not json", Classification(7, None, 0.0)),
+        ("[]", Classification(7, None, 0.0)),
+    ],
+)
+def test_parse_answer(answer: str, expected: Classification) -> None:
+    """Malformed answers and unknown templates count as no match"""
+    assert parse_answer(NOTE, answer, TEMPLATES) == expected
+
+
+def test_classifier_against_fake_server() -> None:
+    """The classifier sends one request per note and parses the answer"""
+
+    async def run(url: str) -> Classification:
+        async with OllamaClient(base_url=url, model="test") as client:
+            return await Classifier(llm=client, templates=TEMPLATES).classify(NOTE)
+
+    with FakeOllama(responder=lambda prompt: MATCH) as fake:
+        result = asyncio.run(run(fake.url))
+
+    assert result == Classification(note_id=7, template="blank", confidence=0.9)
+    assert fake.requests == 1
+
+
+def test_ollama_error() -> None:
+    """HTTP errors are raised as LLMError"""
+
+    async def run(url: str) -> str:
+        async with OllamaClient(base_url=url, model="test") as client:
+            return await client.generate("hi")
+
+    with FakeOllama(status=500) as fake, pytest.raises(LLMError):
+        asyncio.run(run(fake.url))
+
+
+def _timed_run(url: str, notes: list[Note], concurrency: int) -> tuple[float, list[int]]:
+    async def run() -> list[int]:
+        async with OllamaClient(base_url=url, model="test", max_connections=concurrency) as client:
+            classifier = Classifier(llm=client, templates=TEMPLATES)
+            return [
+                result.note_id
+                async for result in ordered_map(
+                    notes, classifier.classify, max_in_flight=concurrency
+                )
+            ]
+
+    started = time.perf_counter()
+    ids = asyncio.run(run())
+    return time.perf_counter() - started, ids
+
+
+def test_throughput_scales_with_concurrency() -> None:
+    """With a fixed per request latency, a wider window finishes proportionally sooner"""
+    notes = [
+        Note(id=i, note_type="", deck="", field_names=NOTE.field_names, fields=NOTE.fields)
+        for i in range(16)
+    ]
+
+    # long enough that model time, not HTTP overhead, dominates even on one busy CPU
+    with FakeOllama(latency=0.1) as fake:
+        sequential, sequential_ids = _timed_run(fake.url, notes, concurrency=1)
+        assert fake.max_concurrent == 1
+        concurrent, concurrent_ids = _timed_run(fake.url, notes, concurrency=8)
+        assert 1 < fake.max_concurrent <= 8
+
+    assert sequential_ids == concurrent_ids == list(range(16))
+    assert concurrent < sequential / 3
+
+
+def _cached(llm: FakeLLM, cache: ResultCache, templates: TemplateLibrary) -> CachedClassifier:
+    return CachedClassifier(
+        classifier=Classifier(llm=llm, templates=templates), cache=cache, model="test"
+    )
+
+
+def test_cached_classifier_reuses_answers(tmp_path: Path) -> None:
+    """A note seen before, even with different whitespace, is answered from the cache"""
+    llm = FakeLLM(MATCH)
+    spaced = Note(
+        id=8,
+        note_type=NOTE.note_type,
+        deck=NOTE.deck,
+        field_names=NOTE.field_names,
+        fields=("Er  hat\xa0_____.", "Füller", "Er hat einen Füller."),
+    )
+
+    with ResultCache(tmp_path / "cache.sqlite", max_entries=10) as cache:
+        classifier = _cached(llm, cache, TEMPLATES)
+        first = asyncio.run(classifier.classify(NOTE))
+        second = asyncio.run(classifier.classify(spaced))
+
+    assert first == Classification(note_id=7, template="blank", confidence=0.9)
+    assert second == Classification(note_id=8, template="blank", confidence=0.9)
+    assert llm.calls == 1
+
+
+def test_cached_classifier_keeps_decisions_when_template_added(tmp_path: Path) -> None:
+    """Adding a template only re-asks about the notes that matched nothing"""
+    matched = FakeLLM(MATCH)
+    unmatched_note = Note(
+        id=9, note_type="", deck="", field_names=("Front",), fields=("something else",)
+    )
+    templates = TemplateLibrary(list(TEMPLATES))
+
+    with ResultCache(tmp_path / "cache.sqlite", max_entries=10) as cache:
+        asyncio.run(_cached(matched, cache, templates).classify(NOTE))
+        asyncio.run(_cached(FakeLLM("{}"), cache, templates).classify(unmatched_note))
+
+        templates.add(Template(name="front-only", description="Just a front"))
+        llm = FakeLLM(MATCH)
+        classifier = _cached(llm, cache, templates)
+        asyncio.run(classifier.classify(NOTE))
+        asyncio.run(classifier.classify(unmatched_note))
+
+    assert llm.calls == 1
+
+
+def test_cached_classifier_undecided(tmp_path: Path) -> None:
+    """A match below min_confidence is asked again, once a better template may exist"""
+    weak = json.dumps({"template": "blank", "confidence": 0.4})
+
+    with ResultCache(tmp_path / "cache.sqlite", max_entries=10) as cache:
+        llm = FakeLLM(weak)
+        classifier = CachedClassifier(
+            classifier=Classifier(llm=llm, templates=TEMPLATES),
+            cache=cache,
+            model="test",
+            min_confidence=0.8,
+        )
+        first = asyncio.run(classifier.classify(NOTE))
+        second = asyncio.run(classifier.classify(NOTE))
+
+    assert first == second == Classification(note_id=7, template="blank", confidence=0.4)
+    assert llm.calls == 2
+    assert len(cache) == 0
+
+
+def test_cached_classifier_template_changed(tmp_path: Path) -> None:
+    """Changing a template during a run forgets the answers that named it"""
+    llm = FakeLLM(MATCH)
+
+    with ResultCache(tmp_path / "cache.sqlite", max_entries=10) as cache:
+        classifier = _cached(llm, cache, TEMPLATES)
+        asyncio.run(classifier.classify(NOTE))
+        classifier.template_changed(TEMPLATES.get("blank"))  # type: ignore[arg-type]
+        asyncio.run(classifier.classify(NOTE))
+
+    assert llm.calls == 2
+
+
+def test_fingerprint_first() -> None:
+    """Only notes the fingerprints cannot resolve are sent to the model"""
+    llm = FakeLLM("{}")
+    templates = TemplateLibrary(FSI_TEMPLATES)
+    fingerprints = FingerprintFirst(
+        index=FingerprintIndex(templates),
+        fallback=Classifier(llm=llm, templates=templates).classify,
+    )
+    notes = fsi_notes(50, ambiguous_ratio=0.2)
+
+    async def run() -> list[Classification]:
+        return [await fingerprints.classify(note) for note in notes]
+
+    results = asyncio.run(run())
+
+    assert fingerprints.resolved + fingerprints.deferred == 50
+    assert llm.calls == fingerprints.deferred > 0
+    assert all(
+        (result.template is not None) == bool(note.fields[1])
+        for note, result in zip(notes, results)
+    )
+
+
+def _notes(count: int) -> list[Note]:
+    return [
+        Note(id=i, note_type="", deck="", field_names=NOTE.field_names, fields=NOTE.fields)
+        for i in range(count)
+    ]
+
+
+def test_build_batch_prompt() -> None:
+    """Every card is numbered, with its fields"""
+    prompt = build_batch_prompt(_notes(2), TEMPLATES)
+    assert "- blank: Sentence with a blank" in prompt
+    assert "[1]\nPrompt1: Er hat _____." in prompt
+    assert "[2]\nPrompt1: Er hat _____." in prompt
+
+
+@pytest.mark.parametrize(
+    "answer, expected",
+    [
+        (
+            '{"cards": [{"card": 2, "template": "blank", "confidence": 0.5}, '
+            '{"card": 1, "template": "unknown", "confidence": 1}]}',
+            [Classification(0, None, 0.0), Classification(1, "blank", 0.5)],
+        ),
+        (
+            '{"cards": [{"template": "blank", "confidence": 0.5}, "garbled"]}',
+            [Classification(0, "blank", 0.5), None],
+        ),
+        ('{"cards": [{"card": 9, "template": "blank"}]}', [None, None]),
+        ('{"template": "blank"}', [None, None]),
+        ('{"cards": "blank"}', [None, None]),
+        ("not json", [None, None]),
+    ],
+)
+def test_parse_batch_answer(answer: str, expected: list[Optional[Classification]]) -> None:
+    """Cards left out or garbled are None, unknown templates no match"""
+    assert parse_batch_answer(_notes(2), answer, TEMPLATES) == expected
+
+
+def _batched_run(
+    url: str, notes: list[Note], batch_size: int, max_prompt_chars: int = 100_000
+) -> tuple[list[Classification], BatchingClassifier]:
+    async def run() -> tuple[list[Classification], BatchingClassifier]:
+        async with OllamaClient(base_url=url, model="test", max_connections=2) as client:
+            classifier = BatchingClassifier(
+                llm=client,
+                templates=TEMPLATES,
+                batch_size=batch_size,
+                max_prompt_chars=max_prompt_chars,
+            )
+            results = [
+                result
+                async for result in ordered_map(
+                    notes, classifier.classify, max_in_flight=2 * batch_size
+                )
+            ]
+            return results, classifier
+
+    return asyncio.run(run())
+
+
+def test_batching_round_trips() -> None:
+    """N notes cost about N/K requests, and come back in order"""
+    with FakeOllama(responder=matching("blank")) as fake:
+        results, classifier = _batched_run(fake.url, _notes(20), batch_size=5)
+
+    assert [result.note_id for result in results] == list(range(20))
+    assert all(result.template == "blank" for result in results)
+    assert fake.requests == classifier.batches == 4
+    assert classifier.fallbacks == 0
+
+
+def test_batching_partial_batch() -> None:
+    """A batch that never fills up is sent after lingering"""
+    with FakeOllama(responder=matching("blank")) as fake:
+        results, _ = _batched_run(fake.url, _notes(7), batch_size=5)
+
+    assert len(results) == 7
+    assert fake.requests == 2
+
+
+def test_batching_prompt_limit() -> None:
+    """Fewer notes are packed when the prompt would be too long"""
+    two_cards = len(build_batch_prompt(_notes(2), TEMPLATES))
+    with FakeOllama(responder=matching("blank")) as fake:
+        results, _ = _batched_run(fake.url, _notes(8), batch_size=8, max_prompt_chars=two_cards)
+
+    assert len(results) == 8
+    cards = [len(re.findall(r"^\[\d+\]$", prompt, re.MULTILINE)) for prompt in fake.prompts]
+    assert cards == [2, 2, 2, 2]
+
+
+def test_batching_falls_back_to_single_notes() -> None:
+    """Cards a malformed batch answer leaves out are asked about one at a time"""
+
+    def answer(prompt: str) -> str:
+        if "[1]" in prompt:
+            return json.dumps({"cards": [{"card": 1, "template": "blank", "confidence": 0.9}]})
+        return MATCH
+
+    with FakeOllama(responder=answer) as fake:
+        results, classifier = _batched_run(fake.url, _notes(4), batch_size=4)
+
+    assert all(result.template == "blank" for result in results)
+    assert classifier.batches == 1
+    assert classifier.fallbacks == 3
+    assert fake.requests == 4
+
+
+def test_batching_error() -> None:
+    """A failed batch request fails every note in it"""
+    with FakeOllama(status=500) as fake, pytest.raises(LLMError):
+        _batched_run(fake.url, _notes(3), batch_size=3)
@@ -0,0 +1,167 @@
+import asyncio
+import json
+
+import pytest
+
+from claude_code_example.anki.fingerprint import FingerprintIndex
+from claude_code_example.anki.models import Note
+from claude_code_example.anki.templates import Template, TemplateLibrary
+from claude_code_example.llm.classifier import Classification, Classifier
+from claude_code_example.llm.dedup import (
+    Deduplicator,
+    MinHashIndex,
+    classify_notes,
+    exact_key,
+    normalise,
+    signature,
+)
+from tests.fakes.deck import fsi_notes
+from tests.fakes.ollama import FakeLLM
+
+TEMPLATES = TemplateLibrary([Template(name="blank", description="Sentence with a blank")])
+BLANK = json.dumps({"template": "blank", "confidence": 0.9})
+FIELDS = (
+    "Herr Meyer hat _____ im Büro, aber Frau Wiegand hat keinen.",
+    "Füller; ein- neu-",
+    "Herr Meyer hat einen neuen Füller im Büro, aber Frau Wiegand hat keinen.",
+)
+
+
+def _note(note_id: int, *fields: str) -> Note:
+    return Note(
+        id=note_id,
+        note_type="FSI German Drills",
+        deck="FSI",
+        field_names=("Prompt1", "Prompt2", "Answer"),
+        fields=fields or FIELDS,
+    )
+
+
+@pytest.mark.parametrize(
+    "value, expected",
+    [
+        ("<u>Der Flughafen</u> <u>ist</u> dort.", "Der Flughafen ist dort."),
+        ("Der&nbsp;Flughafen  ist\n dort.", "Der Flughafen ist dort."),
+        ("Der Flughafen<br>ist<div>dort.</div>", "Der Flughafen ist dort."),
+        ("F&uuml;ll<b>er</b>", "Füller"),
+    ],
+)
+def test_normalise(value: str, expected: str) -> None:
+    """Markup, entities and whitespace don't count"""
+    assert normalise(value) == expected
+
+
+def test_exact_key() -> None:
+    """Notes that only differ in markup share a key, others don't"""
+    marked_up = _note(2, f"<b>{FIELDS[0]}</b>", FIELDS[1], FIELDS[2].replace(" ", "&nbsp;"))
+    assert exact_key(_note(1)) == exact_key(marked_up)
+    assert exact_key(_note(1)) != exact_key(_note(3, *FIELDS[:2], "Er hat einen Füller."))
+
+
+def test_minhash_index() -> None:
+    """Near duplicates are found, different notes are not"""
+    index = MinHashIndex(threshold=0.8)
+    index.add(1, signature(_note(1)))
+
+    near = _note(2, FIELDS[0], FIELDS[1], FIELDS[2].replace("im Büro", "im Buro"))
+    different = _note(3, "Wo ist _____?", "the station", "Wo ist der Bahnhof?")
+
+    assert index.query(signature(near)) == 1
+    assert index.query(signature(different)) is None
+    assert len(index) == 1
+
+
+def _classify_all(
+    notes: list[Note], classifier: Classifier, deduplicator: Deduplicator, max_in_flight: int
+) -> list[Classification]:
+    async def classify_all() -> list[Classification]:
+        results = classify_notes(
+            notes, classifier.classify, max_in_flight=max_in_flight, deduplicator=deduplicator
+        )
+        return [result async for _, result in results]
+
+    return asyncio.run(classify_all())
+
+
+def test_deduplicator() -> None:
+    """Each group is classified once and its classification copied to the rest"""
+    llm = FakeLLM(BLANK, latency=0.01)
+    deduplicator = Deduplicator()
+    notes = [
+        _note(1),
+        _note(2, *(f"<u>{value}</u>" for value in FIELDS)),
+        _note(3, FIELDS[0], FIELDS[1], FIELDS[2].replace("im Büro", "im Buro")),
+        _note(4, "Wo ist _____?", "the station", "Wo ist der Bahnhof?"),
+    ]
+
+    results = _classify_all(notes, Classifier(llm=llm, templates=TEMPLATES), deduplicator, 4)
+
+    assert len(llm.prompts) == 2
+    assert [result.duplicate_of for result in results] == [None, 1, 1, None]
+    assert [result.note_id for result in results] == [1, 2, 3, 4]
+    assert all(result.template == "blank" for result in results)
+    assert (deduplicator.exact, deduplicator.near, deduplicator.ratio) == (1, 1, 0.5)
+
+
+def test_duplicates_outside_window() -> None:
+    """Duplicates waiting for their group's note leave the window to other notes"""
+    in_flight = peak = 0
+
+    async def classify(note: Note) -> Classification:
+        nonlocal in_flight, peak
+        in_flight += 1
+        peak = max(peak, in_flight)
+        await asyncio.sleep(0.01)
+        in_flight -= 1
+        return Classification(note_id=note.id, template="blank", confidence=0.9)
+
+    notes = [_note(1), *(_note(note_id) for note_id in range(2, 6)), _note(6, "a", "b", "c")]
+
+    async def classify_all() -> list[Classification]:
+        results = classify_notes(notes, classify, max_in_flight=2, deduplicator=Deduplicator())
+        return [result async for _, result in results]
+
+    results = asyncio.run(classify_all())
+
+    assert [result.note_id for result in results] == [1, 2, 3, 4, 5, 6]
+    assert [result.duplicate_of for result in results] == [None, 1, 1, 1, 1, None]
+    # notes 1 and 6 were classified side by side, with four duplicates between them
+    assert peak == 2
+
+
+def test_deduplicator_fingerprinted() -> None:
+    """Notes a fingerprint resolves are not grouped"""
+    blank = Template(
+        name="blank", description="Sentence with a blank", fingerprint={"Prompt1": "_____"}
+    )
+    deduplicator = Deduplicator(index=FingerprintIndex(TemplateLibrary([blank])))
+
+    assert deduplicator.representative(_note(1)) is None
+    assert deduplicator.representative(_note(2)) is None
+    assert deduplicator.seen == 0
+
+
+def test_deduplicator_template_changed() -> None:
+    """Changing the templates starts every group afresh"""
+    deduplicator = Deduplicator()
+
+    assert deduplicator.representative(_note(1)) is None
+    assert deduplicator.representative(_note(2)) == 1
+    deduplicator.template_changed(Template(name="blank", description=""))
+
+    assert deduplicator.representative(_note(3)) is None
+    with pytest.raises(KeyError):
+        deduplicator.copy(_note(4), 1)
+
+
+def test_deduplicator_synthetic_deck() -> None:
+    """The notes fingerprints miss in a synthetic deck collapse into few groups"""
+    llm = FakeLLM(BLANK, latency=0.01)
+    deduplicator = Deduplicator()
+    notes = fsi_notes(300, ambiguous_ratio=1)
+
+    results = _classify_all(notes, Classifier(llm=llm, templates=TEMPLATES), deduplicator, 8)
+
+    assert len(results) == 300
+    assert len(llm.prompts) == 300 - deduplicator.duplicates
+    assert deduplicator.ratio > 0.5
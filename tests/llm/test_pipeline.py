@@ -0,0 +1,70 @@
+import asyncio
+import random
+from typing import Iterator
+
+import pytest
+
+from claude_code_example.llm.pipeline import ordered_map
+
+
+async def _collect(items: list[int], max_in_flight: int) -> tuple[list[int], int]:
+    in_flight = 0
+    peak = 0
+
+    async def slow_double(item: int) -> int:
+        nonlocal in_flight, peak
+        in_flight += 1
+        peak = max(peak, in_flight)
+        await asyncio.sleep(random.uniform(0, 0.005))
+        in_flight -= 1
+        return item * 2
+
+    results = ordered_map(items, slow_double, max_in_flight=max_in_flight)
+    return [result async for result in results], peak
+
+
+def test_ordered_map_keeps_input_order() -> None:
+    """Results come out in input order even when calls finish out of order"""
+    items = list(range(30))
+
+    results, peak = asyncio.run(_collect(items, max_in_flight=3))
+
+    assert results == [item * 2 for item in items]
+    assert peak <= 3
+
+
+def test_ordered_map_backpressure() -> None:
+    """Items are only pulled from the source when there is room in the window"""
+    pulled = 0
+
+    def source() -> Iterator[int]:
+        nonlocal pulled
+        for item in range(100):
+            pulled += 1
+            yield item
+
+    async def identity(item: int) -> int:
+        return item
+
+    async def first() -> int:
+        stream = ordered_map(source(), identity, max_in_flight=4)
+        result = await stream.__anext__()
+        await stream.aclose()  # type: ignore[attr-defined]
+        return result
+
+    assert asyncio.run(first()) == 0
+    assert pulled == 4
+
+
+def test_ordered_map_invalid_window() -> None:
+    """A window below one is rejected"""
+
+    async def identity(item: int) -> int:
+        return item
+
+    async def run() -> None:
+        async for _ in ordered_map([1], identity, max_in_flight=0):
+            pass
+
+    with pytest.raises(ValueError):
+        asyncio.run(run())
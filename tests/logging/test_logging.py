@@ -1,11 +1,13 @@
+import json
 import logging
 from io import StringIO
+from pathlib import Path
 from unittest.mock import Mock, patch
 
 import pytest
 from faker import Faker
 
-from claude_code_example.logging.logging import setup_logger
+from claude_code_example.logging.logging import flush_logs, setup_logger
 
 
 @pytest.fixture
@@ -26,57 +28,62 @@ def mock_logger_manager(mock_logger: logging.Logger) -> Mock:
     return manager
 
 
-@patch("sys.stdout", new_callable=StringIO)
-def test_setup_logger_debug_level(mock_stdout: StringIO, faker: Faker) -> None:
+@patch("sys.stderr", new_callable=StringIO)
+def test_setup_logger_debug_level(mock_stderr: StringIO, faker: Faker) -> None:
     """Log debug message"""
     logger = setup_logger(app_name=faker.word(), log_level="DEBUG")
     logger.debug("This is a debug message")
+    flush_logs(logger)
 
-    output = mock_stdout.getvalue().strip()
+    output = mock_stderr.getvalue().strip()
     assert "DEBUG" in output
     assert "This is a debug message" in output
 
 
-@patch("sys.stdout", new_callable=StringIO)
-def test_setup_logger_info_level(mock_stdout: StringIO, faker: Faker) -> None:
+@patch("sys.stderr", new_callable=StringIO)
+def test_setup_logger_info_level(mock_stderr: StringIO, faker: Faker) -> None:
     """Log info message"""
     logger = setup_logger(app_name=faker.word(), log_level="INFO")
     logger.info("This is an info message")
+    flush_logs(logger)
 
-    output = mock_stdout.getvalue().strip()
+    output = mock_stderr.getvalue().strip()
     assert "INFO" in output
     assert "This is an info message" in output
 
 
-@patch("sys.stdout", new_callable=StringIO)
-def test_setup_logger_warning_level(mock_stdout: StringIO, faker: Faker) -> None:
+@patch("sys.stderr", new_callable=StringIO)
+def test_setup_logger_warning_level(mock_stderr: StringIO, faker: Faker) -> None:
     """Log warning message"""
     logger = setup_logger(app_name=faker.word(), log_level="WARNING")
     logger.warning("This is a warning message")
+    flush_logs(logger)
 
-    output = mock_stdout.getvalue().strip()
+    output = mock_stderr.getvalue().strip()
     assert "WARNING" in output
     assert "This is a warning message" in output
 
 
-@patch("sys.stdout", new_callable=StringIO)
-def test_setup_logger_error_level(mock_stdout: StringIO, faker: Faker) -> None:
+@patch("sys.stderr", new_callable=StringIO)
+def test_setup_logger_error_level(mock_stderr: StringIO, faker: Faker) -> None:
     """Log error message"""
     logger = setup_logger(app_name=faker.word(), log_level="ERROR")
     logger.error("This is an error message")
+    flush_logs(logger)
 
-    output = mock_stdout.getvalue().strip()
+    output = mock_stderr.getvalue().strip()
     assert "ERROR" in output
     assert "This is an error message" in output
 
 
-@patch("sys.stdout", new_callable=StringIO)
-def test_setup_logger_critical_level(mock_stdout: StringIO, faker: Faker) -> None:
+@patch("sys.stderr", new_callable=StringIO)
+def test_setup_logger_critical_level(mock_stderr: StringIO, faker: Faker) -> None:
     """Log critical message"""
     logger = setup_logger(app_name=faker.word(), log_level="CRITICAL")
     logger.critical("This is a critical message")
+    flush_logs(logger)
 
-    output = mock_stdout.getvalue().strip()
+    output = mock_stderr.getvalue().strip()
     assert "CRITICAL" in output
     assert "This is a critical message" in output
 
@@ -107,3 +114,34 @@ def test_bind(faker: Faker) -> None:
 
     # Verify the handlers are not empty (should have console handler)
     assert len(mock_logger.handlers) > 0
+
+
+@patch("sys.stderr", new_callable=StringIO)
+def test_setup_logger_twice(mock_stderr: StringIO, faker: Faker) -> None:
+    """Setting up the same logger again does not duplicate log lines"""
+    app_name = faker.word()
+    setup_logger(app_name=app_name, log_level="INFO")
+    logger = setup_logger(app_name=app_name, log_level="INFO")
+    logger.info("Only once")
+    flush_logs(logger)
+
+    assert len(logger.handlers) == 1
+    assert mock_stderr.getvalue().count("Only once") == 1
+
+
+@patch("sys.stderr", new_callable=StringIO)
+def test_json_sink(mock_stderr: StringIO, faker: Faker, tmp_path: Path) -> None:
+    """Records are also written as JSON lines, with their extra fields"""
+    json_path = tmp_path / "logs" / "app.jsonl"
+    logger = setup_logger(app_name=faker.word(), log_level="INFO", json_path=json_path)
+    logger.info("Classified", extra={"note_id": 42})
+    logger.debug("Not at this level")
+    flush_logs(logger)
+
+    lines = json_path.read_text(encoding="utf-8").splitlines()
+    assert len(lines) == 1
+    entry = json.loads(lines[0])
+    assert entry["level"] == "INFO"
+    assert entry["message"] == "Classified"
+    assert entry["note_id"] == 42
+    assert "Classified" in mock_stderr.getvalue()
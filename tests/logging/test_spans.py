@@ -0,0 +1,51 @@
+import logging
+
+import pytest
+
+from claude_code_example.logging.spans import SpanRecorder
+
+
+def test_span_context_manager() -> None:
+    """Every span adds one duration to its stage"""
+    spans = SpanRecorder()
+    for _ in range(3):
+        with spans.span("classify"):
+            pass
+
+    assert spans.stages["classify"].count == 3
+    assert spans.stages["classify"].total >= 0
+
+
+def test_span_decorator() -> None:
+    """Decorated functions are timed on every call, errors included"""
+    spans = SpanRecorder()
+
+    @spans.span("transform")
+    def transform(fail: bool) -> str:
+        if fail:
+            raise ValueError("no")
+        return "done"
+
+    assert transform(False) == "done"
+    with pytest.raises(ValueError):
+        transform(True)
+
+    assert spans.stages["transform"].count == 2
+
+
+def test_log_summary(caplog: pytest.LogCaptureFixture) -> None:
+    """One line per stage, in the order stages happen"""
+    spans = SpanRecorder()
+    spans.add("write", 0.002)
+    spans.add("read", 0.001)
+    spans.add("read", 0.003)
+    logger = logging.getLogger("test_log_summary")
+
+    with caplog.at_level(logging.INFO, logger="test_log_summary"):
+        spans.log_summary(logger)
+
+    stages = [record.span for record in caplog.records]  # type: ignore[attr-defined]
+    assert stages == ["read", "write"]
+    assert caplog.records[0].count == 2  # type: ignore[attr-defined]
+    assert caplog.records[0].total_ms == 4.0  # type: ignore[attr-defined]
+    assert "read: 2 in 4.0ms" in caplog.records[0].getMessage()
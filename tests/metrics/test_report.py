@@ -0,0 +1,61 @@
+from pathlib import Path
+
+from claude_code_example.app_context import AppContext
+from claude_code_example.cache.result_cache import CacheStats
+from claude_code_example.logging.spans import SpanRecorder
+from claude_code_example.metrics.profiling import profile_path, start_profiling
+from claude_code_example.metrics.report import MetricsReport, RunCounters, percentile
+
+
+def test_percentile() -> None:
+    """Nearest rank percentiles, whatever the order of the values"""
+    values = [float(value) for value in range(100, 0, -1)]
+    assert percentile(values, 50) == 50.0
+    assert percentile(values, 95) == 95.0
+    assert percentile(values, 99) == 99.0
+    assert percentile([3.0], 99) == 3.0
+    assert percentile([], 50) == 0.0
+
+
+def test_collect() -> None:
+    """Counters, cache stats and spans end up in the report"""
+    spans = SpanRecorder()
+    for seconds in (0.1, 0.2, 0.3, 0.4):
+        spans.add("llm", seconds)
+    spans.add("read", 0.05)
+
+    report = MetricsReport.collect(
+        command="convert",
+        elapsed=2.0,
+        counters=RunCounters(cards=10, bytes_written=1024),
+        cache_stats=CacheStats(hits=3, misses=1),
+        spans=spans,
+    )
+
+    assert report.cards_per_sec == 5.0
+    assert report.cache_hit_rate == 0.75
+    assert report.llm_requests == 4
+    assert report.llm_latency_ms == {"p50": 200.0, "p95": 400.0, "p99": 400.0}
+    assert report.stages["read"] == {"count": 1, "total_ms": 50.0, "mean_ms": 50.0}
+    assert report.peak_rss_bytes > 0
+
+
+def test_save_and_load(tmp_path: Path) -> None:
+    """Reports survive a round trip through JSON"""
+    report = MetricsReport(command="convert", elapsed=1.5, cards=3, llm_latency_ms={"p50": 1.0})
+    report.save(tmp_path / "reports" / "run.json")
+
+    assert MetricsReport.load(tmp_path / "reports" / "run.json") == report
+
+
+def test_start_profiling(tmp_path: Path) -> None:
+    """Finishing saves the report and the cProfile stats next to it"""
+    app_context = AppContext()
+    finish = start_profiling(app_context, tmp_path / "run.json")
+    app_context.counters.cards += 7
+    finish("convert read")
+
+    report = MetricsReport.load(tmp_path / "run.json")
+    assert report.command == "convert read"
+    assert report.cards == 7
+    assert profile_path(tmp_path / "run.json").exists()